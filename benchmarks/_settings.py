@@ -0,0 +1,26 @@
+import os
+
+_DEFAULTS = {
+    "SECURITY__JWT_ISSUER": "rent-mark-bench",
+    "SECURITY__JWT_SECRET_KEY": "benchmark-secret-key-benchmark-secret-key",
+    "SECURITY__JWT_ACCESS_TOKEN_EXPIRE_SECS": "900",
+    "SECURITY__REFRESH_TOKEN_EXPIRE_SECS": "86400",
+    "SECURITY__PASSWORD_BCRYPT_ROUNDS": "4",
+    "SECURITY__ALLOWED_HOSTS": '["*"]',
+    "SECURITY__BACKEND_CORS_ORIGINS": "[]",
+    "DATABASE__HOSTNAME": "localhost",
+    "DATABASE__USERNAME": "bench",
+    "DATABASE__PASSWORD": "bench",
+    "DATABASE__PORT": "5432",
+    "DATABASE__DB": "bench",
+}
+
+
+def use_benchmark_settings() -> None:
+    """Fill in any settings missing from the environment so benchmarks run without a .env.
+
+    Must be called before anything imports ``src``; real values in the
+    environment still win.
+    """
+    for name, value in _DEFAULTS.items():
+        os.environ.setdefault(name, value)
@@ -0,0 +1,98 @@
+"""pytest-benchmark microbenchmarks for the auth hot path.
+
+Run with ``pytest benchmarks/bench_auth.py --benchmark-json=bench_auth.json``.
+Uses the in-memory user repository, so no database is needed.
+"""
+import asyncio
+
+import pytest
+
+from benchmarks._settings import use_benchmark_settings
+
+use_benchmark_settings()
+
+from fastapi.security import HTTPAuthorizationCredentials  # noqa: E402
+
+from src.config import get_settings  # noqa: E402
+from src.core.cache import TTLCache  # noqa: E402
+from src.users.auth.services.password_service import PasswordService  # noqa: E402
+from src.users.auth.services.token_service import TokenService  # noqa: E402
+from src.users.auth.services.token_verifier import TokenVerifier  # noqa: E402
+from src.users.memory_repository import InMemoryUserRepository  # noqa: E402
+from src.users.service import UserService  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="module")
+def repository(loop):
+    repository = InMemoryUserRepository()
+    loop.run_until_complete(
+        repository.create_user(
+            {
+                "email": "bench@example.com",
+                "password_hash": PasswordService.get_password_hash("password"),
+            }
+        )
+    )
+    return repository
+
+
+@pytest.fixture(scope="module")
+def principal(loop, repository):
+    return loop.run_until_complete(repository.get_auth_principal(1))
+
+
+def _uncached_verifier() -> TokenVerifier:
+    security = get_settings().security
+    return TokenVerifier(
+        security.jwt_secret_key.get_secret_value(),
+        security.jwt_issuer,
+        cache_max_size=0,
+    )
+
+
+def test_generate_token(benchmark, principal):
+    token_service = TokenService()
+    benchmark(token_service.generate_token, principal)
+
+
+def test_decode_uncached(benchmark, principal):
+    token_service = TokenService(_uncached_verifier())
+    token = token_service.generate_token(principal).access_token
+    benchmark(token_service.decode, token)
+
+
+def test_decode_cached(benchmark, principal):
+    token_service = TokenService()
+    token = token_service.generate_token(principal).access_token
+    benchmark(token_service.decode, token)
+
+
+def test_password_hash(benchmark):
+    benchmark(PasswordService.get_password_hash, "password")
+
+
+def test_password_verify(benchmark):
+    hashed = PasswordService.get_password_hash("password")
+    benchmark(PasswordService.password_matches_hash, "password", hashed)
+
+
+def test_password_verify_async(benchmark, loop):
+    hashed = PasswordService.get_password_hash("password")
+    benchmark(
+        lambda: loop.run_until_complete(PasswordService.verify_password("password", hashed))
+    )
+
+
+@pytest.mark.parametrize("user_cache_size", [0, 1000], ids=["no-cache", "cached"])
+def test_authenticate(benchmark, loop, repository, principal, user_cache_size):
+    service = UserService(repository, user_cache=TTLCache(user_cache_size, 30))
+    token = TokenService().generate_token(principal).access_token
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    benchmark(lambda: loop.run_until_complete(service.authenticate(credentials)))
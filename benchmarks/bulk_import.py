@@ -0,0 +1,64 @@
+"""Rows per second for the bulk user importer against the configured database.
+
+Run with ``python -m benchmarks.bulk_import --rows 10000``. Emails are
+randomised per run so repeated runs don't just measure conflicts.
+"""
+import argparse
+import asyncio
+import csv
+import tempfile
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from src.core.database.session import LazySession
+from src.users.importer import import_users, read_rows
+from src.users.repository import UserRepository
+
+
+def _write_rows(path: Path, rows: int) -> None:
+    run = uuid.uuid4().hex[:8]
+    with path.open("w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["email", "password", "full_name", "roles"])
+        for i in range(rows):
+            role = "seller" if i % 5 == 0 else "customer"
+            writer.writerow([f"bench-{run}-{i}@example.com", f"pw-{i}", f"User {i}", role])
+
+
+async def _run(path: Path, batch_size: int, workers: int | None, rounds: int):
+    session = LazySession()
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return await import_users(
+                UserRepository(session),
+                read_rows(path),
+                batch_size=batch_size,
+                executor=executor,
+                rounds=rounds,
+            )
+    finally:
+        await session.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--rounds", type=int, default=4, help="bcrypt cost for the run")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "users.csv"
+        _write_rows(path, args.rows)
+        report = asyncio.run(_run(path, args.batch_size, args.workers, args.rounds))
+
+    print(
+        f"rows={report.read} inserted={report.inserted} issues={len(report.issues)} "
+        f"elapsed={report.elapsed_secs:.2f}s rows/s={report.rows_per_sec:,.0f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
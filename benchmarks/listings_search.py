@@ -0,0 +1,247 @@
+"""Listing search latency on a seeded dataset, per query shape.
+
+Needs a Postgres database (the ``DATABASE__*`` settings)::
+
+    python -m benchmarks.listings_search --seed --rows 1000000 --output listings.json
+
+``--seed`` (re)creates the ``listings`` table and fills it with generated
+rows in one ``INSERT ... SELECT generate_series`` so a million rows take
+seconds; without it the existing table is reused. Each shape runs
+``--iterations`` times through ``ListingService`` and reports p50/p95/max.
+Deep pages are reached by walking the cursor once and then timing the page
+at that cursor, next to the OFFSET query it replaces.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from pathlib import Path
+
+from benchmarks._report import write_report
+from benchmarks._settings import use_benchmark_settings
+
+use_benchmark_settings()
+
+from sqlalchemy import select, text  # noqa: E402
+
+from src.core.database import BaseModel  # noqa: E402
+from src.core.database.session import LazySession, dispose_database, get_database  # noqa: E402
+from src.listings.models import Listing  # noqa: E402
+from src.listings.projections import ListingFilters  # noqa: E402
+from src.listings.repository import (  # noqa: E402
+    _SUMMARY_COLUMNS,
+    SORT_KEYS,
+    ListingRepository,
+    _conditions,
+)
+from src.listings.schemas import ListingSort  # noqa: E402
+from src.listings.service import ListingService  # noqa: E402
+from src.users.models import User  # noqa: E402,F401 - listings.landlord_id references users
+
+CITIES = [
+    "Paris", "Lyon", "Marseille", "Toulouse", "Lille", "Bordeaux", "Nantes",
+    "Strasbourg", "Montpellier", "Rennes", "Grenoble", "Nice", "Dijon", "Angers",
+    "Tours", "Reims", "Caen", "Rouen", "Limoges", "Poitiers", "Besancon", "Metz",
+    "Nancy", "Brest", "Amiens", "Clermont-Ferrand", "Orleans", "Perpignan",
+    "Pau", "La Rochelle",
+]
+
+FEATURES = [
+    "Proche métro", "Lumineux", "Cuisine équipée", "Balcon", "Colocation possible",
+    "Idéal étudiant", "Charges comprises", "Calme", "Proche université", "Parking",
+    "Ascenseur", "Rénové",
+]
+
+# Paris gets ~30% of the rows, the rest of the cities share the remainder
+# with a long tail, roughly like real student-housing supply. Titles and
+# descriptions are built from the row's type, furnishing, surface, Paris
+# arrondissement and two features, so text search has something to rank.
+SEED_SQL = """
+INSERT INTO listings (
+    landlord_id, title, city, description, rent_eur, charges_eur, type, status,
+    availability_date, created_at, updated_at
+)
+SELECT
+    :landlord_id,
+    (ARRAY['Studio', 'Chambre', 'Appartement'])[r.kind]
+        || CASE WHEN r.furnished THEN (ARRAY[' meublé', ' meublée', ' meublé'])[r.kind]
+                ELSE '' END
+        || ' ' || ((ARRAY[16, 9, 30])[r.kind] + floor(random() * 40)::int) || ' m²',
+    r.city,
+    CASE WHEN r.city = 'Paris'
+         THEN 'Paris ' || r.district || CASE WHEN r.district = 1 THEN 'er. ' ELSE 'e. ' END
+         ELSE '' END
+        || (CAST(:features AS text[]))[1 + floor(random() * :feature_count)::int] || '. '
+        || (CAST(:features AS text[]))[1 + floor(random() * :feature_count)::int] || '.',
+    300 + floor(random() * 2200)::int,
+    floor(random() * 150)::int,
+    (ARRAY['STUDIO', 'ROOM', 'FLAT'])[r.kind]::listing_type,
+    CASE WHEN random() < 0.85 THEN 'PUBLISHED'
+         WHEN random() < 0.5 THEN 'DRAFT'
+         ELSE 'CLOSED' END::listing_status,
+    current_date + floor(random() * 180)::int,
+    r.ts, r.ts
+FROM generate_series(1, :rows) AS g,
+     -- referencing g keeps the lateral subquery (and random()) per row
+     LATERAL (
+         SELECT
+             now() - (random() + g * 0) * interval '730 days' AS ts,
+             1 + floor(random() * 3)::int AS kind,
+             random() < 0.5 AS furnished,
+             1 + floor(random() * 20)::int AS district,
+             CASE WHEN random() < 0.3 THEN 'Paris'
+                  ELSE (CAST(:cities AS text[]))[1 + floor(power(random(), 2) * :city_count)::int]
+             END AS city
+     ) AS r
+"""
+
+
+async def seed(rows: int) -> None:
+    engine = get_database().primary
+    async with engine.begin() as conn:
+        await conn.run_sync(Listing.__table__.drop, checkfirst=True)
+        await conn.run_sync(BaseModel.metadata.create_all)
+        landlord_id = (
+            await conn.execute(
+                text(
+                    "INSERT INTO users (email, password_hash, is_active, roles) "
+                    "VALUES ('bench-landlord@example.com', 'x', true, ARRAY['SELLER']::user_role[]) "
+                    "ON CONFLICT (email) DO UPDATE SET email = excluded.email RETURNING id"
+                )
+            )
+        ).scalar_one()
+        started = time.perf_counter()
+        await conn.execute(
+            text(SEED_SQL),
+            {
+                "landlord_id": landlord_id,
+                "cities": CITIES,
+                "city_count": len(CITIES),
+                "features": FEATURES,
+                "feature_count": len(FEATURES),
+                "rows": rows,
+            },
+        )
+        print(f"seeded {rows:,} listings in {time.perf_counter() - started:.1f}s")
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("VACUUM ANALYZE listings"))
+
+
+async def _timed(fn, iterations: int) -> dict[str, float]:
+    await fn()  # warm the statement and plan caches
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    return {
+        "p50_ms": statistics.median(samples) * 1000,
+        "p95_ms": samples[max(0, int(len(samples) * 0.95) - 1)] * 1000,
+        "max_ms": samples[-1] * 1000,
+    }
+
+
+async def run(iterations: int, deep_page: int, page_size: int) -> dict[str, dict]:
+    session = LazySession()
+    repository = ListingRepository(session)
+    service = ListingService(repository)
+
+    shapes = {
+        "city_newest": (ListingFilters(city="Paris"), ListingSort.NEWEST),
+        "city_price_cap_newest": (ListingFilters(city="Lyon", rent_max=800), ListingSort.NEWEST),
+        "city_price_range_by_rent": (
+            ListingFilters(city="Paris", rent_min=600, rent_max=900),
+            ListingSort.RENT,
+        ),
+        "rare_city_newest": (ListingFilters(city="La Rochelle"), ListingSort.NEWEST),
+        "all_cities_newest": (ListingFilters(), ListingSort.NEWEST),
+        "all_cities_price_cap_newest": (ListingFilters(rent_max=500), ListingSort.NEWEST),
+    }
+
+    results = {}
+    for name, (filters, sort) in shapes.items():
+        results[name] = await _timed(
+            lambda: service.search(filters, sort, limit=page_size), iterations
+        )
+
+    # Deep pagination: walk to page ``deep_page`` once, then time just the
+    # page query at that position both ways (no totals).
+    filters, sort = shapes["city_newest"]
+    page = await service.search(filters, sort, limit=page_size)
+    for _ in range(deep_page - 2):
+        page = await service.search(filters, sort, limit=page_size, cursor=page.next_cursor)
+    last = page.items[-1]
+    after = (last.created_at, last.id)
+    results[f"city_newest_page_{deep_page}_keyset"] = await _timed(
+        lambda: repository.search_listings(filters, sort, page_size, after), iterations
+    )
+
+    offset_stmt = (
+        select(*_SUMMARY_COLUMNS)
+        .where(*_conditions(filters))
+        .order_by(*(column.desc() for column in SORT_KEYS[sort]))
+        .offset((deep_page - 1) * page_size)
+        .limit(page_size)
+    )
+
+    async def offset_page():
+        async with session.unit_of_work(read_only=True) as db:
+            (await db.execute(offset_stmt)).all()
+
+    results[f"city_newest_page_{deep_page}_offset"] = await _timed(offset_page, iterations)
+
+    results["total_estimate"] = await _timed(
+        lambda: repository.estimate_listings(filters), iterations
+    )
+    results["total_exact"] = await _timed(
+        lambda: repository.count_listings(filters), max(3, iterations // 10)
+    )
+    estimate = await repository.estimate_listings(filters)
+    exact = await repository.count_listings(filters)
+    results["total_estimate"]["estimate"] = estimate
+    results["total_estimate"]["exact"] = exact
+    results["total_estimate"]["error_pct"] = abs(estimate - exact) / max(exact, 1) * 100
+
+    await session.close()
+    return results
+
+
+async def main_async(args: argparse.Namespace) -> dict[str, dict]:
+    try:
+        if args.seed:
+            await seed(args.rows)
+        return await run(args.iterations, args.deep_page, args.page_size)
+    finally:
+        await dispose_database()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seed", action="store_true")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--deep-page", type=int, default=500)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--output", type=Path, default=Path("listings_search.json"))
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args))
+    write_report(args.output, vars(args) | {"output": str(args.output)}, results)
+
+    for name, stats in results.items():
+        print(
+            f"{name:<32} p50 {stats['p50_ms']:8.2f} ms  p95 {stats['p95_ms']:8.2f} ms  "
+            f"max {stats['max_ms']:8.2f} ms"
+        )
+    estimate = results["total_estimate"]
+    print(
+        f"total estimate {estimate['estimate']:,} vs exact {estimate['exact']:,} "
+        f"({estimate['error_pct']:.1f}% off)"
+    )
+    print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""Free-text listing search: relevance and latency, next to the ILIKE scan it replaces.
+
+Uses the dataset seeded by ``benchmarks.listings_search`` (``--seed`` here
+does the same)::
+
+    python -m benchmarks.listings_text_search --seed --rows 1000000 --output text.json
+
+Every query has a ground truth written against the generated columns (type,
+city, furnishing, arrondissement, features), so relevance is measured as
+precision@k of the first page: the share of returned listings that really
+are what the tenant typed. ``relevant`` is how many listings in the table
+match the ground truth, to read ``total`` against. The ILIKE baseline
+ANDs one ``ILIKE '%word%'`` per query word over title, city and
+description, sorted by newest.
+"""
+import argparse
+import asyncio
+from pathlib import Path
+
+from benchmarks._report import write_report
+from benchmarks._settings import use_benchmark_settings
+
+use_benchmark_settings()
+
+from sqlalchemy import and_, func, select  # noqa: E402
+
+from benchmarks.listings_search import _timed, seed  # noqa: E402
+from src.core.database.session import LazySession, dispose_database  # noqa: E402
+from src.listings.models import Listing, ListingStatus, ListingType  # noqa: E402
+from src.listings.projections import ListingFilters  # noqa: E402
+from src.listings.repository import ListingRepository  # noqa: E402
+from src.listings.schemas import ListingSort  # noqa: E402
+from src.listings.service import ListingService  # noqa: E402
+
+
+def _furnished():
+    return Listing.title.like("% meublé%")
+
+
+QUERIES = {
+    "studio_furnished_paris_18": (
+        "studio meublé Paris 18e",
+        and_(
+            Listing.type == ListingType.STUDIO,
+            Listing.city == "Paris",
+            _furnished(),
+            Listing.description.like("Paris 18e.%"),
+        ),
+    ),
+    "studio_furnished_paris_18_no_accents": (
+        "studio meuble paris 18eme",
+        and_(
+            Listing.type == ListingType.STUDIO,
+            Listing.city == "Paris",
+            _furnished(),
+            Listing.description.like("Paris 18e.%"),
+        ),
+    ),
+    "flats_furnished_lyon_plural": (
+        "appartements meublés Lyon",
+        and_(Listing.type == ListingType.FLAT, Listing.city == "Lyon", _furnished()),
+    ),
+    "room_balcony": (
+        "chambre balcon",
+        and_(Listing.type == ListingType.ROOM, Listing.description.like("%Balcon%")),
+    ),
+    "shared_near_university_toulouse": (
+        "colocation proche université Toulouse",
+        and_(
+            Listing.city == "Toulouse",
+            Listing.description.like("%Colocation possible%"),
+            Listing.description.like("%Proche université%"),
+        ),
+    ),
+    "typo_studio_bordeaux": (
+        "stuido meublé Bordeux",
+        and_(Listing.type == ListingType.STUDIO, Listing.city == "Bordeaux", _furnished()),
+    ),
+    "typo_flat_marseille": (
+        "apartement Marseile",
+        and_(Listing.type == ListingType.FLAT, Listing.city == "Marseille"),
+    ),
+}
+
+
+def _ilike_statement(query: str, limit: int):
+    document = Listing.title + " " + Listing.city + " " + func.coalesce(Listing.description, "")
+    return (
+        select(Listing.id)
+        .where(
+            Listing.status == ListingStatus.PUBLISHED,
+            *(document.ilike(f"%{word}%") for word in query.split()),
+        )
+        .order_by(Listing.created_at.desc(), Listing.id.desc())
+        .limit(limit)
+    )
+
+
+async def _precision(session: LazySession, ids: list[int], truth) -> float | None:
+    if not ids:
+        return None
+    async with session.unit_of_work(read_only=True) as db:
+        hits = (
+            await db.execute(
+                select(func.count()).select_from(Listing).where(Listing.id.in_(ids), truth)
+            )
+        ).scalar_one()
+    return hits / len(ids)
+
+
+async def run(iterations: int, page_size: int) -> dict[str, dict]:
+    session = LazySession()
+    service = ListingService(ListingRepository(session))
+
+    results = {}
+    for name, (query, truth) in QUERIES.items():
+        filters = ListingFilters(query=query)
+        page = await service.search(filters, limit=page_size)
+        ids = [item.id for item in page.items]
+        result = await _timed(lambda: service.search(filters, limit=page_size), iterations)
+
+        ilike = _ilike_statement(query, page_size)
+
+        async def ilike_page():
+            async with session.unit_of_work(read_only=True) as db:
+                return list((await db.execute(ilike)).scalars())
+
+        baseline = await _timed(ilike_page, max(3, iterations // 10))
+        async with session.unit_of_work(read_only=True) as db:
+            relevant = (
+                await db.execute(
+                    select(func.count())
+                    .select_from(Listing)
+                    .where(Listing.status == ListingStatus.PUBLISHED, truth)
+                )
+            ).scalar_one()
+
+        # The service falls back to trigram matching when the stemmed words
+        # find nothing; note which one answered.
+        exact_matches = await service.listing_repository.search_listings(
+            filters, ListingSort.RELEVANCE, 1
+        )
+        result.update(
+            query=query,
+            fuzzy=not exact_matches,
+            returned=len(ids),
+            total=page.total,
+            total_is_estimate=page.total_is_estimate,
+            relevant=relevant,
+            precision_at_k=await _precision(session, ids, truth),
+            ilike_p50_ms=baseline["p50_ms"],
+            ilike_p95_ms=baseline["p95_ms"],
+            ilike_precision_at_k=await _precision(session, await ilike_page(), truth),
+        )
+        results[name] = result
+
+    await session.close()
+    return results
+
+
+async def main_async(args: argparse.Namespace) -> dict[str, dict]:
+    try:
+        if args.seed:
+            await seed(args.rows)
+        return await run(args.iterations, args.page_size)
+    finally:
+        await dispose_database()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seed", action="store_true")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--output", type=Path, default=Path("listings_text_search.json"))
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args))
+    write_report(args.output, vars(args) | {"output": str(args.output)}, results)
+
+    for name, stats in results.items():
+        precision = stats["precision_at_k"]
+        ilike_precision = stats["ilike_precision_at_k"]
+        print(
+            f"{name:<38} p50 {stats['p50_ms']:7.2f} ms  p95 {stats['p95_ms']:7.2f} ms  "
+            f"P@k {'-' if precision is None else f'{precision:.2f}'}"
+            f"{' (fuzzy)' if stats['fuzzy'] else ''}  "
+            f"total {stats['total']:,} / relevant {stats['relevant']:,}  |  "
+            f"ILIKE p50 {stats['ilike_p50_ms']:8.2f} ms  "
+            f"P@k {'-' if ilike_precision is None else f'{ilike_precision:.2f}'}"
+        )
+    print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""ASGI-level load driver for the auth endpoints and ``/users/me``.
+
+Drives the real app in-process through httpx's ASGI transport with the
+in-memory user repository, then reports req/s and p50/p95/p99 per endpoint
+and writes them to a JSON file for comparison across commits::
+
+    python -m benchmarks.load_auth --users 200 --concurrency 32 --output load.json
+
+Admission control is replaced with an unlimited controller unless
+``--with-admission`` is given, since every request comes from one client IP.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from benchmarks._report import write_report
+from benchmarks._settings import use_benchmark_settings
+
+use_benchmark_settings()
+
+import httpx  # noqa: E402
+
+from src.core.admission import AdmissionController  # noqa: E402
+from src.main import app  # noqa: E402
+from src.users.auth.dependencies import (  # noqa: E402
+    get_login_admission,
+    get_registration_admission,
+)
+from src.users.dependencies import get_user_repository  # noqa: E402
+from src.users.memory_repository import InMemoryUserRepository  # noqa: E402
+
+PREFIX = "/api/v1/users"
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.statuses: dict[str, Counter] = defaultdict(Counter)
+        self.elapsed: dict[str, float] = {}
+
+    async def call(self, client: httpx.AsyncClient, name: str, method: str, url: str, **kwargs):
+        started = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        self.latencies[name].append(time.perf_counter() - started)
+        self.statuses[name][response.status_code] += 1
+        return response
+
+    def summary(self) -> dict[str, dict]:
+        result = {}
+        for name, samples in self.latencies.items():
+            ordered = sorted(samples)
+            quantiles = statistics.quantiles(ordered, n=100) if len(ordered) > 1 else ordered * 99
+            result[name] = {
+                "requests": len(ordered),
+                "req_per_sec": len(ordered) / self.elapsed[name],
+                "p50_ms": quantiles[49] * 1000,
+                "p95_ms": quantiles[94] * 1000,
+                "p99_ms": quantiles[98] * 1000,
+                "statuses": dict(self.statuses[name]),
+            }
+        return result
+
+
+async def _phase(recorder: Recorder, name: str, jobs, concurrency: int) -> list:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(job):
+        async with semaphore:
+            return await job()
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(run(job) for job in jobs))
+    recorder.elapsed[name] = time.perf_counter() - started
+    return results
+
+
+async def run_load(users: int, concurrency: int, me_rounds: int) -> dict[str, dict]:
+    recorder = Recorder()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        credentials = [
+            {"email": f"user{i}@example.com", "password": f"password-{i}"} for i in range(users)
+        ]
+
+        await _phase(
+            recorder,
+            "register",
+            [
+                lambda body=body: recorder.call(client, "register", "POST", f"{PREFIX}/auth/register", json=body)
+                for body in credentials
+            ],
+            concurrency,
+        )
+        logins = await _phase(
+            recorder,
+            "login",
+            [
+                lambda body=body: recorder.call(client, "login", "POST", f"{PREFIX}/auth/login", json=body)
+                for body in credentials
+            ],
+            concurrency,
+        )
+        pairs = [response.json() for response in logins if response.status_code == 200]
+
+        await _phase(
+            recorder,
+            "me",
+            [
+                lambda pair=pair: recorder.call(
+                    client,
+                    "me",
+                    "GET",
+                    f"{PREFIX}/me",
+                    headers={"Authorization": f"Bearer {pair['access_token']}"},
+                )
+                for pair in pairs
+                for _ in range(me_rounds)
+            ],
+            concurrency,
+        )
+        await _phase(
+            recorder,
+            "refresh",
+            [
+                lambda pair=pair: recorder.call(
+                    client,
+                    "refresh",
+                    "POST",
+                    f"{PREFIX}/auth/refresh",
+                    json={"refresh_token": pair["refresh_token"]},
+                )
+                for pair in pairs
+            ],
+            concurrency,
+        )
+    return recorder.summary()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--me-rounds", type=int, default=10)
+    parser.add_argument("--with-admission", action="store_true")
+    parser.add_argument("--output", type=Path, default=Path("load_auth.json"))
+    args = parser.parse_args()
+
+    repository = InMemoryUserRepository()
+    app.dependency_overrides[get_user_repository] = lambda: repository
+    if not args.with_admission:
+        unlimited = AdmissionController("bench", max_in_flight=1_000_000, max_queue=0, queue_timeout_secs=0)
+        app.dependency_overrides[get_login_admission] = lambda: unlimited
+        app.dependency_overrides[get_registration_admission] = lambda: unlimited
+
+    endpoints = asyncio.run(run_load(args.users, args.concurrency, args.me_rounds))
+
+    write_report(args.output, vars(args) | {"output": str(args.output)}, endpoints)
+
+    for name, stats in endpoints.items():
+        print(
+            f"{name:<9} {stats['requests']:>6} req  {stats['req_per_sec']:>9,.0f} req/s  "
+            f"p50 {stats['p50_ms']:7.2f} ms  p95 {stats['p95_ms']:7.2f} ms  "
+            f"p99 {stats['p99_ms']:7.2f} ms  {stats['statuses']}"
+        )
+    print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
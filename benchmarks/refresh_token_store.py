@@ -0,0 +1,75 @@
+"""Lookups per second and bytes per token for the spent refresh-token stores.
+
+Run with ``python -m benchmarks.refresh_token_store --tokens 1000000``.
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+import uuid
+
+from src.users.auth.token_store import (
+    BloomUsedTokenStore,
+    InMemoryUsedTokenStore,
+    UsedTokenStore,
+)
+
+
+async def _bench(name: str, make_store, jtis: list[str], exp: int) -> None:
+    tracemalloc.start()
+    store = make_store()
+    before, _ = tracemalloc.get_traced_memory()
+    for jti in jtis:
+        await store.mark_used(jti, exp)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del store
+
+    store: UsedTokenStore = make_store()
+    started = time.perf_counter()
+    for jti in jtis:
+        await store.mark_used(jti, exp)
+    insert_secs = time.perf_counter() - started
+
+    started = time.perf_counter()
+    reused = 0
+    for jti in jtis:
+        reused += await store.mark_used(jti, exp)
+    lookup_secs = time.perf_counter() - started
+
+    fresh = [uuid.uuid4().hex for _ in range(min(len(jtis), 100_000))]
+    false_positives = 0
+    for jti in fresh:
+        false_positives += await store.mark_used(jti, exp)
+
+    print(
+        f"{name:<8} insert {len(jtis) / insert_secs:>10,.0f}/s  "
+        f"lookup {len(jtis) / lookup_secs:>10,.0f}/s  "
+        f"{(after - before) / len(jtis):6.1f} B/token  "
+        f"reuse detected {reused / len(jtis):.2%}  "
+        f"false positives {false_positives}/{len(fresh)}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tokens", type=int, default=200_000)
+    parser.add_argument("--fp-rate", type=float, default=1e-6)
+    args = parser.parse_args()
+
+    jtis = [uuid.uuid4().hex for _ in range(args.tokens)]
+    exp = int(time.time()) + 3600
+    await _bench("exact", InMemoryUsedTokenStore, jtis, exp)
+    await _bench(
+        "bloom",
+        lambda: BloomUsedTokenStore(
+            bucket_secs=86400,
+            false_positive_rate=args.fp_rate,
+        ),
+        jtis,
+        exp,
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
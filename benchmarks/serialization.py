@@ -0,0 +1,86 @@
+"""Encode time and allocations per ``/users/me`` response body.
+
+Compares the old ``dict`` + ``jsonable_encoder`` + ``json.dumps`` path with
+the precompiled ``TypeAdapter`` path. Run with
+``python -m benchmarks.serialization``.
+"""
+import argparse
+import json
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from fastapi.encoders import jsonable_encoder
+
+from src.users.models import User, UserRole
+from src.users.serializers import dump_user_public
+
+
+def _user() -> User:
+    now = datetime.now(timezone.utc)
+    return User(
+        id=42,
+        email="tenant@example.com",
+        password_hash="$2b$12$" + "x" * 53,
+        full_name="Camille Martin",
+        is_active=True,
+        roles=[UserRole.CUSTOMER, UserRole.SELLER],
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def _baseline(user: User) -> bytes:
+    body = {
+        "id": user.id,
+        "email": user.email,
+        "full_name": user.full_name,
+        "is_active": user.is_active,
+        "roles": [r.value for r in user.roles],
+        "created_at": user.created_at,
+        "updated_at": user.updated_at,
+    }
+    return json.dumps(
+        jsonable_encoder(body), separators=(",", ":"), ensure_ascii=False
+    ).encode()
+
+
+def _measure(name: str, fn, user: User, iterations: int) -> None:
+    fn(user)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn(user)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    snapshot_before = tracemalloc.take_snapshot()
+    for _ in range(1000):
+        fn(user)
+    snapshot_after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocations = sum(
+        stat.count_diff for stat in snapshot_after.compare_to(snapshot_before, "filename")
+    )
+    tracemalloc.start()
+    fn(user)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"{name:<14} {elapsed / iterations * 1e6:8.2f} µs/response  "
+        f"peak {peak:6,d} B/response  retained blocks/1k {allocations}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=50_000)
+    args = parser.parse_args()
+
+    user = _user()
+    _measure("dict+json", _baseline, user, args.iterations)
+    _measure("TypeAdapter", dump_user_public, user, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
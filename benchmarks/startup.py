@@ -0,0 +1,114 @@
+"""Cold-start benchmark: import time, app construction and time to first request.
+
+Each run is a fresh interpreter, like a worker respawn::
+
+    python -m benchmarks.startup --runs 10 --output startup.json
+
+The first request goes through httpx's ASGI transport without running the
+lifespan, so no database is needed. ``--importtime`` also prints the
+slowest modules from ``python -X importtime`` for one extra run.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from benchmarks._report import write_report
+from benchmarks._settings import use_benchmark_settings
+
+PROBE = """
+import asyncio, json, time
+started = time.perf_counter()
+import src.main
+imported = time.perf_counter()
+app = src.main.create_app()
+created = time.perf_counter()
+
+import httpx
+
+async def first_request():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.get({path!r})
+        response.raise_for_status()
+
+asyncio.run(first_request())
+finished = time.perf_counter()
+print(json.dumps({{
+    "import_secs": imported - started,
+    "create_app_secs": created - imported,
+    "first_request_secs": finished - created,
+}}))
+"""
+
+
+def _probe(path: str) -> dict[str, float]:
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-c", PROBE.format(path=path)],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=os.environ,
+    )
+    timings = json.loads(completed.stdout.strip().splitlines()[-1])
+    timings["process_secs"] = time.perf_counter() - started
+    return timings
+
+
+def _slowest_imports(limit: int) -> list[tuple[int, str]]:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.main; src.main.create_app()"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=os.environ,
+    )
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line[12:]:
+            continue
+        _, cumulative, name = (part.strip() for part in line[12:].split("|"))
+        if cumulative.isdigit():
+            rows.append((int(cumulative), name))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--path", default="/.well-known/jwks.json")
+    parser.add_argument("--importtime", type=int, default=0, metavar="N")
+    parser.add_argument("--output", type=Path, default=Path("startup.json"))
+    args = parser.parse_args()
+
+    use_benchmark_settings()
+    runs = [_probe(args.path) for _ in range(args.runs)]
+    results = {
+        phase: {
+            "median_ms": statistics.median(run[phase] for run in runs) * 1000,
+            "min_ms": min(run[phase] for run in runs) * 1000,
+            "max_ms": max(run[phase] for run in runs) * 1000,
+        }
+        for phase in runs[0]
+    }
+    write_report(args.output, vars(args) | {"output": str(args.output)}, results)
+
+    for phase, stats in results.items():
+        print(
+            f"{phase:<20} median {stats['median_ms']:8.1f} ms  "
+            f"min {stats['min_ms']:8.1f} ms  max {stats['max_ms']:8.1f} ms"
+        )
+    if args.importtime:
+        print("\nslowest imports (cumulative):")
+        for micros, name in _slowest_imports(args.importtime):
+            print(f"{micros / 1000:8.1f} ms  {name}")
+    print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
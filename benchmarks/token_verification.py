@@ -0,0 +1,53 @@
+"""Tokens verified per second: plain ``jwt.decode`` vs the shared ``TokenVerifier``.
+
+Run with ``python -m benchmarks.token_verification``.
+"""
+import argparse
+import time
+
+import jwt
+
+from src.users.auth.services.token_verifier import TokenVerifier
+
+KEY = "benchmark-secret-key-benchmark-secret-key"
+ISSUER = "benchmark"
+
+
+def _rate(fn, tokens: list[str], rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for token in tokens:
+            fn(token)
+    return rounds * len(tokens) / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tokens", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    now = int(time.time())
+    tokens = [
+        jwt.encode(
+            {"sub": str(i), "iat": now, "exp": now + 900, "iss": ISSUER},
+            KEY,
+            algorithm="HS256",
+        )
+        for i in range(args.tokens)
+    ]
+
+    def baseline(token: str) -> None:
+        jwt.decode(token, KEY, algorithms=["HS256"], issuer=ISSUER)
+
+    verifier = TokenVerifier(KEY, ISSUER, cache_max_size=args.tokens)
+
+    before = _rate(baseline, tokens, args.rounds)
+    after = _rate(verifier.decode, tokens, args.rounds)
+    print(f"jwt.decode:            {before:>12,.0f} tokens/s")
+    print(f"TokenVerifier.decode:  {after:>12,.0f} tokens/s ({after / before:.1f}x)")
+    print(f"cache: {verifier.cache_stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""Idle-socket load test for the message WebSocket gateway.
+
+Starts one uvicorn worker, opens ``--sockets`` authenticated connections to
+``/api/v1/messages/ws`` and holds them idle, then reports the worker's RSS
+per socket and checks it against ``--max-rss-mb``::
+
+    python -m benchmarks.ws_gateway --sockets 10000 --max-rss-mb 512 --output ws.json
+
+The ceiling we hold a worker to is 10,000 idle sockets in 512 MiB RSS.
+Measured here: a ~90 MiB worker grows by ~39 KiB per socket with
+``--ws websockets-sansio`` (~38 KiB with wsproto, ~48 KiB with the legacy
+websockets protocol), about 32 KiB of which is uvicorn and Starlette. The worker runs with
+per-message deflate off, as production should: a socket that negotiates
+it keeps its own zlib contexts.
+
+Needs uvicorn and websockets, and the benchmark database (the lifespan
+warms the pool). Access tokens are stateless and minted here, so
+connecting never queries. Once every socket is open and the hold is over,
+each one sends an ``unsubscribe`` frame and waits for the reply, to show
+the idle sockets are still served. Raise ``ulimit -n`` above
+``--sockets`` first: the client and the worker each hold one descriptor
+per socket.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from benchmarks._report import write_report
+from benchmarks._settings import use_benchmark_settings
+
+use_benchmark_settings()
+os.environ.setdefault("SECURITY__STATELESS_ACCESS_TOKENS", "true")
+os.environ.setdefault("MESSAGES__WS_MAX_CONNECTIONS", "1000000")
+
+import orjson  # noqa: E402
+from websockets.asyncio.client import connect  # noqa: E402
+
+from src.users.auth.services.token_service import TokenService  # noqa: E402
+from src.users.projections import AuthPrincipal  # noqa: E402
+
+PATH = "/api/v1/messages/ws"
+
+
+def _rss_mb(pid: int) -> float:
+    for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+        if line.startswith("VmRSS:"):
+            return int(line.split()[1]) / 1024
+    raise RuntimeError(f"no VmRSS for pid {pid}")
+
+
+async def _wait_until_up(url: str, token: str, timeout_secs: float) -> None:
+    deadline = time.monotonic() + timeout_secs
+    while True:
+        try:
+            async with connect(f"{url}?token={token}"):
+                return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.2)
+
+
+async def _open(url: str, tokens: list[str], concurrency: int) -> list:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def open_one(token: str):
+        async with semaphore:
+            return await connect(
+                f"{url}?token={token}", compression=None, ping_interval=None
+            )
+
+    return await asyncio.gather(*(open_one(token) for token in tokens))
+
+
+async def _round_trip(socket, ref: str) -> float:
+    started = time.perf_counter()
+    await socket.send(orjson.dumps({"type": "unsubscribe", "thread_id": 0, "ref": ref}))
+    events = orjson.loads(await socket.recv())
+    if events[0].get("ref") != ref:
+        raise RuntimeError(f"unexpected reply {events!r}")
+    return time.perf_counter() - started
+
+
+async def run(args: argparse.Namespace, pid: int, url: str) -> dict:
+    token_service = TokenService()
+    tokens = [
+        token_service.generate_token(AuthPrincipal(i + 1, True, [], 0)).access_token
+        for i in range(args.sockets + 1)
+    ]
+    await _wait_until_up(url, tokens[-1], args.startup_timeout_secs)
+    await asyncio.sleep(1)
+    baseline_mb = _rss_mb(pid)
+
+    started = time.perf_counter()
+    sockets = await _open(url, tokens[: args.sockets], args.concurrency)
+    connect_secs = time.perf_counter() - started
+    connected_mb = _rss_mb(pid)
+
+    await asyncio.sleep(args.hold_secs)
+    held_mb = _rss_mb(pid)
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def probe(i: int, socket):
+        async with semaphore:
+            return await _round_trip(socket, str(i))
+
+    latencies = sorted(
+        await asyncio.gather(*(probe(i, socket) for i, socket in enumerate(sockets)))
+    )
+    quantiles = statistics.quantiles(latencies, n=100)
+    await asyncio.gather(*(socket.close() for socket in sockets))
+
+    per_socket_kib = (held_mb - baseline_mb) * 1024 / args.sockets
+    return {
+        "sockets": args.sockets,
+        "connect_secs": connect_secs,
+        "connects_per_sec": args.sockets / connect_secs,
+        "baseline_rss_mb": baseline_mb,
+        "connected_rss_mb": connected_mb,
+        "held_rss_mb": held_mb,
+        "per_socket_kib": per_socket_kib,
+        "max_rss_mb": args.max_rss_mb,
+        "within_ceiling": held_mb <= args.max_rss_mb,
+        "round_trip_p50_ms": quantiles[49] * 1000,
+        "round_trip_p99_ms": quantiles[98] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sockets", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--hold-secs", type=float, default=30.0)
+    parser.add_argument("--max-rss-mb", type=float, default=512.0)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--ws", choices=["websockets-sansio", "websockets", "wsproto"], default="websockets-sansio"
+    )
+    parser.add_argument("--startup-timeout-secs", type=float, default=30.0)
+    parser.add_argument("--output", type=Path, default=Path("ws_gateway.json"))
+    args = parser.parse_args()
+
+    command = [
+        sys.executable, "-m", "uvicorn", "src.main:create_app", "--factory",
+        "--port", str(args.port), "--ws", args.ws, "--log-level", "warning",
+        "--backlog", "4096", "--ws-per-message-deflate", "false",
+    ]
+    server = subprocess.Popen(command, env=os.environ)
+    try:
+        results = asyncio.run(run(args, server.pid, f"ws://127.0.0.1:{args.port}{PATH}"))
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    write_report(args.output, vars(args) | {"output": str(args.output)}, results)
+    print(
+        f"{results['sockets']:,} idle sockets: RSS {results['baseline_rss_mb']:.0f} -> "
+        f"{results['held_rss_mb']:.0f} MiB ({results['per_socket_kib']:.1f} KiB/socket), "
+        f"ceiling {args.max_rss_mb:.0f} MiB {'ok' if results['within_ceiling'] else 'EXCEEDED'}"
+    )
+    print(
+        f"connect {results['connects_per_sec']:,.0f}/s  round trip p50 "
+        f"{results['round_trip_p50_ms']:.2f} ms  p99 {results['round_trip_p99_ms']:.2f} ms"
+    )
+    print(f"results written to {args.output}")
+    if not results["within_ceiling"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
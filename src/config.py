@@ -1,17 +1,48 @@
 import os
 from functools import lru_cache
+from typing import Literal
 
 from pydantic import SecretStr, AnyHttpUrl, Field, computed_field
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from sqlalchemy import URL
+from sqlalchemy import URL, make_url
 
 
 class Security(BaseSettings):
     jwt_issuer: str
     jwt_secret_key: SecretStr
+    jwt_signing_keys: dict[str, SecretStr] = {}
+    jwt_active_kid: str | None = None
+    jwks_max_age_secs: int = 300
     jwt_access_token_expire_secs: int
     refresh_token_expire_secs: int
     password_bcrypt_rounds: int
+    password_rehash_on_login: bool = True
+    password_hash_executor: Literal["thread", "process"] = "thread"
+    password_hash_workers: int = 4
+    password_hash_max_pending: int = 64
+    auth_max_in_flight: int = 8
+    auth_max_queue: int = 32
+    auth_queue_timeout_secs: float = 0.5
+    auth_ip_rate_per_sec: float = 5.0
+    auth_ip_burst: int = 20
+    auth_email_rate_per_sec: float = 0.2
+    auth_email_burst: int = 5
+    auth_rate_limit_max_keys: int = 100_000
+    # Peers whose X-Forwarded-For is believed. The API is only reachable
+    # through Caddy on the compose network, so loopback and private ranges.
+    trusted_proxies: list[str] = [
+        "127.0.0.0/8",
+        "::1/128",
+        "10.0.0.0/8",
+        "172.16.0.0/12",
+        "192.168.0.0/16",
+    ]
+    stateless_access_tokens: bool = False
+    revocation_refresh_secs: float = 5.0
+    refresh_reuse_backend: Literal["memory", "bloom"] = "bloom"
+    refresh_reuse_bucket_secs: int = 3600
+    refresh_reuse_initial_capacity: int = 1024
+    refresh_reuse_false_positive_rate: float = 1e-6
     allowed_hosts: list[str]
     backend_cors_origins: list[AnyHttpUrl]
 
@@ -26,16 +57,125 @@ class Database(BaseSettings):
     password: SecretStr
     port: int
     db: str
+    pool_size: int = 5
+    pool_max_overflow: int = 10
+    pool_timeout_secs: float = 30.0
+    pool_recycle_secs: int = 1800
+    pool_pre_ping: bool = True
+    pool_warmup_connections: int = 2
+    statement_cache_size: int = 100
+    replica_urls: list[str] = []
+    read_your_writes_secs: float = 2.0
 
     model_config = SettingsConfigDict(
         env_file=".env", env_prefix="DATABASE__", extra="ignore"
     )
 
 
+class Cache(BaseSettings):
+    user_max_size: int = 10_000
+    user_ttl_secs: float = 30.0
+    token_max_size: int = 10_000
+    # Public listing search pages. Invalidation bumps a per-city version in
+    # the backend, which with the in-process backend only reaches the worker
+    # that made the change, so the TTL bounds staleness on the others.
+    listing_search_max_size: int = 10_000
+    listing_search_ttl_secs: float = 30.0
+    listing_search_max_age_secs: int = 15
+
+    model_config = SettingsConfigDict(
+        env_file=".env", env_prefix="CACHE__", extra="ignore"
+    )
+
+
+class Listings(BaseSettings):
+    default_page_size: int = 20
+    max_page_size: int = 100
+    exact_count_threshold: int = 1000
+    # pg_trgm word_similarity a query word needs to match in the typo-tolerant
+    # fallback; pg_trgm's own default (0.6) rejects most transpositions.
+    fuzzy_similarity_threshold: float = 0.4
+
+    model_config = SettingsConfigDict(
+        env_file=".env", env_prefix="LISTINGS__", extra="ignore"
+    )
+
+
+class Messages(BaseSettings):
+    # "postgres" (LISTEN/NOTIFY on notify_channel) reaches every worker.
+    # "loopback" only reaches polls in the same process, so with more than
+    # one worker the others' watermarks go stale: single-worker runs only.
+    fanout: Literal["loopback", "postgres"] = "postgres"
+    notify_channel: str = "message_threads"
+    page_size: int = 100
+    long_poll_max_secs: float = 25.0
+    # Long-poll cap while the fan-out is down and wakeups can't be trusted.
+    degraded_wait_secs: float = 5.0
+    watermark_max_threads: int = 100_000
+    watermark_ttl_secs: float = 300.0
+    participants_cache_size: int = 100_000
+    # WebSocket gateway, per worker. An idle socket costs about 40 KiB of
+    # worker RSS with uvicorn's websockets-sansio protocol and per-message
+    # deflate off (benchmarks/ws_gateway.py), so the default of 10,000
+    # sockets stays near 400 MiB, within the 512 MiB a worker is held to.
+    ws_max_connections: int = 10_000
+    ws_max_threads_per_connection: int = 200
+    # Events buffered for one socket; a client further behind than this is
+    # disconnected (1013) and resumes by subscribing with ``after``.
+    ws_send_queue_size: int = 256
+    ws_send_timeout_secs: float = 10.0
+    # Events pushed within this window go out as one frame.
+    ws_batch_window_secs: float = 0.01
+
+    model_config = SettingsConfigDict(
+        env_file=".env", env_prefix="MESSAGES__", extra="ignore"
+    )
+
+
+class Metrics(BaseSettings):
+    enabled: bool = True
+    request_id_header: str = "X-Request-ID"
+    # /metrics answers clients on these networks, judged by the address
+    # resolved through trusted_proxies so traffic relayed by Caddy doesn't
+    # pass as local, and any client sending ``Authorization: Bearer`` with
+    # bearer_token.
+    allowed_networks: list[str] = [
+        "127.0.0.0/8",
+        "::1/128",
+        "10.0.0.0/8",
+        "172.16.0.0/12",
+        "192.168.0.0/16",
+    ]
+    bearer_token: SecretStr | None = None
+
+    model_config = SettingsConfigDict(
+        env_file=".env", env_prefix="METRICS__", extra="ignore"
+    )
+
+
+class Profiling(BaseSettings):
+    enabled: bool = False
+    sample_interval_secs: float = 0.005
+    max_duration_secs: float = 60.0
+    buffer_secs: float = 120.0
+    slow_request_threshold_secs: float | None = None
+    slow_request_cooldown_secs: float = 10.0
+    slow_request_output_dir: str = "profiles"
+
+    model_config = SettingsConfigDict(
+        env_file=".env", env_prefix="PROFILING__", extra="ignore"
+    )
+
+
 class Settings(BaseSettings):
     debug: bool = False
     database: Database = Field(Database)
     security: Security = Field(Security)
+    cache: Cache = Field(default_factory=Cache)
+    listings: Listings = Field(default_factory=Listings)
+    messages: Messages = Field(default_factory=Messages)
+    metrics: Metrics = Field(default_factory=Metrics)
+    profiling: Profiling = Field(default_factory=Profiling)
 
     @computed_field
     @property
@@ -49,6 +189,11 @@ class Settings(BaseSettings):
             database=self.database.db,
         )
 
+    @computed_field
+    @property
+    def sqlalchemy_replica_uris(self) -> list[URL]:
+        return [make_url(url) for url in self.database.replica_urls]
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_nested_delimiter="__",
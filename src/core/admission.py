@@ -0,0 +1,205 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from ipaddress import ip_address, ip_network
+from typing import AsyncIterator
+
+from fastapi import HTTPException, status
+
+from src.core.metrics import gauge_field
+
+
+class TokenBucket:
+    __slots__ = ("rate", "capacity", "tokens", "updated_at")
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def wait_time(self, now: float | None = None) -> float:
+        """Seconds until a token is available, 0 if one is; takes nothing."""
+        now = time.monotonic() if now is None else now
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+        if self.tokens >= 1:
+            return 0.0
+        if self.rate <= 0:
+            return math.inf
+        return (1 - self.tokens) / self.rate
+
+    def try_acquire(self, now: float | None = None) -> float:
+        """Take one token; return 0 on success or the seconds until one is available."""
+        wait = self.wait_time(now)
+        if not wait:
+            self.tokens -= 1
+        return wait
+
+
+class KeyedTokenBuckets:
+    """Token buckets per key, keeping only the ``max_keys`` most recently used."""
+
+    def __init__(self, rate: float, capacity: float, max_keys: int) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+
+    def bucket(self, key: str) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(self.rate, self.capacity)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket
+
+    def try_acquire(self, key: str) -> float:
+        return self.bucket(key).try_acquire()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+@dataclass
+class AdmissionStats:
+    admitted: int = 0
+    queued: int = 0
+    shed_rate_limited: int = 0
+    shed_queue_full: int = 0
+    shed_timeout: int = 0
+    in_flight: int = gauge_field()
+    queue_depth: int = gauge_field()
+
+
+class AdmissionController:
+    """In-process admission control for one CPU-heavy endpoint.
+
+    Requests first pass their per-key token buckets (429 when empty), then
+    take one of ``max_in_flight`` slots. When all slots are busy up to
+    ``max_queue`` requests wait at most ``queue_timeout_secs`` for one;
+    everything else is shed with 503 and gets its tokens back, so overload
+    doesn't spend the clients' rate budgets.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_in_flight: int,
+        max_queue: int,
+        queue_timeout_secs: float,
+        buckets: dict[str, KeyedTokenBuckets] | None = None,
+    ) -> None:
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout_secs = queue_timeout_secs
+        self.buckets = buckets or {}
+        self.stats = AdmissionStats()
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+
+    @asynccontextmanager
+    async def admit(self, **keys: str | None) -> AsyncIterator[None]:
+        buckets = self._check_rate_limits(keys)
+        try:
+            await self._acquire_slot()
+        except HTTPException:
+            for bucket in buckets:
+                bucket.tokens = min(bucket.capacity, bucket.tokens + 1)
+            raise
+        self.stats.admitted += 1
+        self.stats.in_flight += 1
+        try:
+            yield
+        finally:
+            self.stats.in_flight -= 1
+            self._semaphore.release()
+
+    def _check_rate_limits(self, keys: dict[str, str | None]) -> list[TokenBucket]:
+        # All or nothing: a request shed by one bucket takes no token from
+        # the others, so a throttled email doesn't drain its IP's bucket.
+        buckets = [
+            self.buckets[bucket_name].bucket(key)
+            for bucket_name, key in keys.items()
+            if key is not None and bucket_name in self.buckets
+        ]
+        wait = max((bucket.wait_time() for bucket in buckets), default=0.0)
+        if wait:
+            self.stats.shed_rate_limited += 1
+            raise _rejection(status.HTTP_429_TOO_MANY_REQUESTS, "Too many requests", wait)
+        for bucket in buckets:
+            bucket.tokens -= 1
+        return buckets
+
+    async def _acquire_slot(self) -> None:
+        if not self._semaphore.locked():
+            await self._semaphore.acquire()
+            return
+
+        if self.stats.queue_depth >= self.max_queue:
+            self.stats.shed_queue_full += 1
+            raise _rejection(
+                status.HTTP_503_SERVICE_UNAVAILABLE,
+                "Server busy, retry later",
+                self.queue_timeout_secs,
+            )
+
+        self.stats.queued += 1
+        self.stats.queue_depth += 1
+        try:
+            await asyncio.wait_for(
+                self._semaphore.acquire(), timeout=self.queue_timeout_secs
+            )
+        except asyncio.TimeoutError:
+            self.stats.shed_timeout += 1
+            raise _rejection(
+                status.HTTP_503_SERVICE_UNAVAILABLE,
+                "Server busy, retry later",
+                self.queue_timeout_secs,
+            ) from None
+        finally:
+            self.stats.queue_depth -= 1
+
+
+class TrustedProxies:
+    """Finds the client address of a request that came through our proxies.
+
+    ``X-Forwarded-For`` is only read when the peer is itself a trusted
+    proxy, and then from the right: the client is the last hop that isn't
+    one of ours. Anything further left was written by the client.
+    """
+
+    def __init__(self, networks: list[str]) -> None:
+        self.networks = [ip_network(network) for network in networks]
+
+    def is_trusted(self, address: str) -> bool:
+        try:
+            parsed = ip_address(address)
+        except ValueError:
+            return False
+        return any(parsed in network for network in self.networks)
+
+    def client_ip(self, peer: str | None, forwarded_for: str | None) -> str | None:
+        if peer is None or not forwarded_for or not self.is_trusted(peer):
+            return peer
+        hops = [hop.strip() for hop in forwarded_for.split(",") if hop.strip()]
+        for hop in reversed(hops):
+            if not self.is_trusted(hop):
+                return hop
+        return hops[0] if hops else peer
+
+
+def _rejection(status_code: int, detail: str, retry_after: float) -> HTTPException:
+    retry_after = 60 if math.isinf(retry_after) else max(1, math.ceil(retry_after))
+    return HTTPException(
+        status_code=status_code,
+        detail=detail,
+        headers={"Retry-After": str(retry_after)},
+    )
@@ -0,0 +1,148 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Generic, Hashable, TypeVar
+
+from typing_extensions import override
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class TTLCache(Generic[K, V]):
+    """Bounded LRU cache whose entries also expire ``ttl_secs`` after insertion.
+
+    ``generation`` counts invalidations. A caller filling the cache from a
+    read that may race a write takes it before reading and passes it to
+    ``set()``, which then drops the value if anything was invalidated in
+    between, since the read may predate that write.
+    """
+
+    def __init__(self, max_size: int, ttl_secs: float) -> None:
+        self.max_size = max_size
+        self.ttl_secs = ttl_secs
+        self.stats = CacheStats()
+        self.generation = 0
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def set(
+        self, key: K, value: V, ttl_secs: float | None = None, generation: int | None = None
+    ) -> None:
+        if self.max_size <= 0:
+            return
+        if generation is not None and generation != self.generation:
+            return
+        ttl = self.ttl_secs if ttl_secs is None else ttl_secs
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        self.generation += 1
+        if self._entries.pop(key, None) is not None:
+            self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        self.generation += 1
+        self.stats.invalidations += len(self._entries)
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        entry = self._entries.get(key)  # type: ignore[call-overload]
+        return entry is not None and entry[0] > time.monotonic()
+
+
+class CacheBackend(ABC):
+    """Byte store behind caches that may later be shared between workers.
+
+    Async so a network store (Redis, memcached) can be dropped in;
+    ``InProcessCacheBackend`` is the per-worker implementation. Counters
+    never expire, values expire after ``ttl_secs``.
+    """
+
+    stats: CacheStats
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl_secs: float) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_counter(self, key: str) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def incr(self, key: str) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+
+class InProcessCacheBackend(CacheBackend):
+    def __init__(self, max_size: int, ttl_secs: float) -> None:
+        self._values: TTLCache[str, bytes] = TTLCache(max_size, ttl_secs)
+        self._counters: dict[str, int] = {}
+        self.stats = self._values.stats
+
+    @override
+    async def get(self, key: str) -> bytes | None:
+        return self._values.get(key)
+
+    @override
+    async def set(self, key: str, value: bytes, ttl_secs: float) -> None:
+        self._values.set(key, value, ttl_secs)
+
+    @override
+    async def get_counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    @override
+    async def incr(self, key: str) -> int:
+        value = self._counters[key] = self._counters.get(key, 0) + 1
+        return value
+
+    @override
+    def __len__(self) -> int:
+        return len(self._values)
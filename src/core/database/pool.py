@@ -0,0 +1,85 @@
+import asyncio
+import time
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.core.metrics import gauge_field
+
+
+@dataclass
+class PoolStats:
+    checkouts: int = 0
+    checkout_timeouts: int = 0
+    checkout_errors: int = 0
+    total_checkout_wait_secs: float = 0.0
+    max_checkout_wait_secs: float = gauge_field(0.0)
+    connects: int = 0
+    closes: int = 0
+    invalidations: int = 0
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long callers wait for a connection."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+        event.listen(self, "connect", self._on_connect)
+        event.listen(self, "close", self._on_close)
+        event.listen(self, "invalidate", self._on_invalidate)
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.stats.checkout_timeouts += 1
+            raise
+        except Exception:
+            # Connect failures and the like, not pool exhaustion.
+            self.stats.checkout_errors += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.stats.checkouts += 1
+            self.stats.total_checkout_wait_secs += waited
+            if waited > self.stats.max_checkout_wait_secs:
+                self.stats.max_checkout_wait_secs = waited
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        self.stats.connects += 1
+
+    def _on_close(self, dbapi_connection, connection_record) -> None:
+        self.stats.closes += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        self.stats.invalidations += 1
+
+
+def pool_status(engine: AsyncEngine) -> dict[str, float]:
+    pool = engine.sync_engine.pool
+    return {
+        "size": pool.size(),
+        "in_use": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": pool.overflow(),
+    }
+
+
+def pool_stats(engine: AsyncEngine) -> PoolStats | None:
+    return getattr(engine.sync_engine.pool, "stats", None)
+
+
+async def warm_up_pool(engine: AsyncEngine, connections: int) -> None:
+    """Open ``connections`` connections at once so they sit idle in the pool."""
+    if connections <= 0:
+        return
+    async with AsyncExitStack() as stack:
+        conns = await asyncio.gather(
+            *(stack.enter_async_context(engine.connect()) for _ in range(connections))
+        )
+        await asyncio.gather(*(conn.exec_driver_sql("SELECT 1") for conn in conns))
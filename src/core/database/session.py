@@ -1,20 +1,228 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+import itertools
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import AsyncIterator
+
+from sqlalchemy import URL, event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
 from src.config import get_settings
+from src.core import metrics
+from src.core.database.pool import InstrumentedQueuePool
 
-settings = get_settings()
 
-async_engine = create_async_engine(
-    settings.sqlalchemy_database_uri,
-    echo=settings.debug,
-)
-session_factory = async_sessionmaker(
-    async_engine,
-    expire_on_commit=False,
-    class_=AsyncSession,
-)
+def create_engine(url: URL) -> AsyncEngine:
+    settings = get_settings()
+    connect_args = {}
+    if url.drivername == "postgresql+asyncpg":
+        connect_args["prepared_statement_cache_size"] = (
+            settings.database.statement_cache_size
+        )
+    engine = create_async_engine(
+        url,
+        echo=settings.debug,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.database.pool_size,
+        max_overflow=settings.database.pool_max_overflow,
+        pool_timeout=settings.database.pool_timeout_secs,
+        pool_recycle=settings.database.pool_recycle_secs,
+        pool_pre_ping=settings.database.pool_pre_ping,
+        connect_args=connect_args,
+    )
+    if settings.metrics.enabled:
+        event.listen(engine.sync_engine, "before_cursor_execute", _query_started)
+        event.listen(engine.sync_engine, "after_cursor_execute", _query_finished)
+        event.listen(engine.sync_engine, "handle_error", _query_failed)
+    return engine
+
+
+def _query_started(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _query_finished(conn, cursor, statement, parameters, context, executemany) -> None:
+    metrics.record_db_query(time.perf_counter() - conn.info["query_started_at"].pop())
+
+
+def _query_failed(exception_context) -> None:
+    connection = exception_context.connection
+    started = connection.info.get("query_started_at") if connection is not None else None
+    if started:
+        metrics.record_db_query(time.perf_counter() - started.pop())
+
+
+def create_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        engine,
+        expire_on_commit=False,
+        class_=AsyncSession,
+    )
+
+
+class ReadFence:
+    """Until when the current writer's reads must go to the primary.
+
+    One per request (or task); mutable so that a write made in a child task
+    still pins the rest of its request. ``primary_until`` is wall-clock
+    time because ``ReadYourWritesMiddleware`` carries it to the client's
+    next requests, which may land on another worker.
+    """
+
+    __slots__ = ("primary_until",)
+
+    def __init__(self, primary_until: float = 0.0) -> None:
+        self.primary_until = primary_until
+
+
+_read_fence: ContextVar[ReadFence | None] = ContextVar("read_fence", default=None)
+
+
+def start_read_fence(primary_until: float = 0.0):
+    return _read_fence.set(ReadFence(primary_until))
+
+
+def current_read_fence() -> ReadFence | None:
+    return _read_fence.get()
+
+
+def end_read_fence(token) -> None:
+    _read_fence.reset(token)
+
+
+class ReplicaRouter:
+    """Picks the session factory for a unit of work.
+
+    Writes always go to the primary. Reads go round-robin to the replicas,
+    except for ``read_your_writes_secs`` after a write by the same caller
+    (the current ``ReadFence``), when they are pinned to the primary so the
+    writer sees its own changes. Other callers keep reading from replicas.
+    """
+
+    def __init__(
+        self,
+        primary: async_sessionmaker[AsyncSession],
+        replicas: list[async_sessionmaker[AsyncSession]] | None = None,
+        read_your_writes_secs: float = 0.0,
+    ) -> None:
+        self.primary = primary
+        self.replicas = replicas or []
+        self.read_your_writes_secs = read_your_writes_secs
+        self._replica_cycle = itertools.cycle(self.replicas)
+
+    def factory_for(self, read_only: bool) -> async_sessionmaker[AsyncSession]:
+        if not read_only or not self.replicas:
+            return self.primary
+        fence = _read_fence.get()
+        if fence is not None and time.time() < fence.primary_until:
+            return self.primary
+        return next(self._replica_cycle)
+
+    def record_write(self) -> None:
+        fence = _read_fence.get()
+        if fence is None:
+            # Outside a request: pin the rest of this task's context.
+            fence = ReadFence()
+            _read_fence.set(fence)
+        fence.primary_until = time.time() + self.read_your_writes_secs
+
+
+@dataclass
+class DatabaseEngines:
+    primary: AsyncEngine
+    replicas: list[AsyncEngine]
+    router: ReplicaRouter
+
+    @property
+    def all(self) -> list[AsyncEngine]:
+        return [self.primary, *self.replicas]
+
+    async def dispose(self) -> None:
+        for engine in self.all:
+            await engine.dispose()
+
+
+@lru_cache(maxsize=1)
+def get_database() -> DatabaseEngines:
+    """Engines for this process, created on first use rather than at import.
+
+    Creating an engine doesn't connect; the app's lifespan warms the pool at
+    startup and calls ``dispose_database()`` on shutdown.
+    """
+    settings = get_settings()
+    primary = create_engine(settings.sqlalchemy_database_uri)
+    replicas = [create_engine(url) for url in settings.sqlalchemy_replica_uris]
+    return DatabaseEngines(
+        primary,
+        replicas,
+        ReplicaRouter(
+            create_session_factory(primary),
+            [create_session_factory(engine) for engine in replicas],
+            settings.database.read_your_writes_secs,
+        ),
+    )
+
+
+def database_created() -> bool:
+    return get_database.cache_info().currsize > 0
+
+
+async def dispose_database() -> None:
+    if database_created():
+        await get_database().dispose()
+        get_database.cache_clear()
+
+
+class LazySession:
+    """Request-scoped handle that only touches the pool when a query runs.
+
+    Each ``unit_of_work()`` block gets its own ``AsyncSession`` (bound to a
+    replica when ``read_only`` allows it) and returns the connection to the
+    pool as soon as it exits rather than when the response is sent. Objects
+    loaded inside a unit of work come back detached with their loaded
+    attributes intact.
+    """
+
+    def __init__(self, router: ReplicaRouter | None = None) -> None:
+        self._router = router
+        self._open_sessions: set[AsyncSession] = set()
+
+    @asynccontextmanager
+    async def unit_of_work(
+        self, read_only: bool = False, primary: bool = False
+    ) -> AsyncIterator[AsyncSession]:
+        """``primary`` keeps a read off the replicas, for rows another
+        worker has just committed that a replica may not have yet."""
+        if self._router is None:
+            self._router = get_database().router
+        session = self._router.factory_for(read_only and not primary)()
+        self._open_sessions.add(session)
+        try:
+            yield session
+        except BaseException:
+            await session.rollback()
+            raise
+        finally:
+            self._open_sessions.discard(session)
+            await session.close()
+        if not read_only:
+            self._router.record_write()
+
+    async def close(self) -> None:
+        while self._open_sessions:
+            await self._open_sessions.pop().close()
 
 
-async def get_session() -> AsyncSession:
-    async with session_factory() as session:
-        yield session
+async def get_session() -> AsyncIterator[LazySession]:
+    lazy_session = LazySession()
+    try:
+        yield lazy_session
+    finally:
+        await lazy_session.close()
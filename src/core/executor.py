@@ -0,0 +1,97 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Literal, TypeVar
+
+from src.core.metrics import gauge_field
+
+T = TypeVar("T")
+
+
+class ExecutorSaturatedError(Exception):
+    """Raised when too many calls are already waiting for a worker."""
+
+
+@dataclass
+class ExecutorStats:
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    rejected: int = 0
+    running: int = gauge_field()
+    waiting: int = gauge_field()
+    max_waiting: int = gauge_field()
+    total_wait_secs: float = 0.0
+    total_run_secs: float = 0.0
+
+
+class BoundedExecutor:
+    """Runs blocking callables in a worker pool with a cap on concurrency.
+
+    At most ``max_workers`` calls run at once; up to ``max_pending`` more may
+    wait for a slot, anything beyond that fails fast with
+    ``ExecutorSaturatedError``.
+    """
+
+    def __init__(
+        self,
+        kind: Literal["thread", "process"] = "thread",
+        max_workers: int = 4,
+        max_pending: int = 64,
+        name: str = "worker",
+    ) -> None:
+        self.kind = kind
+        self.name = name
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.stats = ExecutorStats()
+        self._executor: Executor | None = None
+        self._semaphore = asyncio.Semaphore(max_workers)
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix=self.name
+                )
+        return self._executor
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        stats = self.stats
+        if stats.waiting >= self.max_pending:
+            stats.rejected += 1
+            raise ExecutorSaturatedError(f"{self.name} pool is saturated")
+
+        stats.submitted += 1
+        stats.waiting += 1
+        stats.max_waiting = max(stats.max_waiting, stats.waiting)
+        queued_at = time.perf_counter()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            stats.waiting -= 1
+        started_at = time.perf_counter()
+        stats.total_wait_secs += started_at - queued_at
+
+        stats.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._get_executor(), fn, *args)
+        except BaseException:
+            stats.failed += 1
+            raise
+        else:
+            stats.completed += 1
+            return result
+        finally:
+            stats.running -= 1
+            stats.total_run_secs += time.perf_counter() - started_at
+            self._semaphore.release()
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
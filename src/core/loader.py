@@ -0,0 +1,63 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, Iterable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class BatchLoader(Generic[K, V]):
+    """Coalesces lookups made in the same event-loop tick into one batch call.
+
+    ``batch_fn`` receives the distinct keys requested since the last dispatch
+    and returns a mapping of the ones it found; missing keys resolve to None.
+    Results are memoised for the loader's lifetime, so create one per request.
+    """
+
+    def __init__(self, batch_fn: Callable[[list[K]], Awaitable[dict[K, V]]]) -> None:
+        self._batch_fn = batch_fn
+        self._futures: dict[K, asyncio.Future[V | None]] = {}
+        self._pending: list[K] = []
+        self._tasks: set[asyncio.Task] = set()
+        self.batches = 0
+
+    def load(self, key: K) -> asyncio.Future[V | None]:
+        future = self._futures.get(key)
+        if future is not None:
+            return future
+
+        loop = asyncio.get_running_loop()
+        future = self._futures[key] = loop.create_future()
+        if not self._pending:
+            loop.call_soon(self._dispatch)
+        self._pending.append(key)
+        return future
+
+    async def load_many(self, keys: Iterable[K]) -> list[V | None]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def prime(self, key: K, value: V) -> None:
+        if key not in self._futures:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(value)
+            self._futures[key] = future
+
+    def _dispatch(self) -> None:
+        keys, self._pending = self._pending, []
+        self.batches += 1
+        task = asyncio.ensure_future(self._resolve(keys))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _resolve(self, keys: list[K]) -> None:
+        try:
+            found = await self._batch_fn(keys)
+        except BaseException as exc:
+            for key in keys:
+                future = self._futures.pop(key)
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for key in keys:
+            future = self._futures[key]
+            if not future.done():
+                future.set_result(found.get(key))
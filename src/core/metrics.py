@@ -0,0 +1,249 @@
+import math
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, Iterable, NamedTuple
+
+DEFAULT_LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+OVERFLOW_LABEL = "other"
+
+
+class Sample(NamedTuple):
+    name: str
+    help: str
+    labels: dict[str, str]
+    value: float
+    kind: str = "gauge"
+
+
+Collector = Callable[[], Iterable[Sample]]
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(
+        self, name: str, help: str, labelnames: tuple[str, ...], max_series: int
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.max_series = max_series
+        self._overflow_key = (OVERFLOW_LABEL,) * len(labelnames)
+
+    def _key(self, series: dict, labels: tuple[str, ...]) -> tuple[str, ...]:
+        # Past ``max_series`` distinct label sets, new ones are folded into a
+        # single "other" series so a bad label can't grow memory or scrape size.
+        if labels in series or len(series) < self.max_series:
+            return labels
+        return self._overflow_key
+
+    def _label_text(self, labels: tuple[str, ...], extra: str = "") -> str:
+        pairs = [
+            f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, labels)
+        ]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self, *args, buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS, **kwargs
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # per series: [count per bucket..., count in +Inf, sum]
+        self._series: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        key = self._key(self._series, labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self) -> Iterable[str]:
+        for labels, series in self._series.items():
+            cumulative = 0.0
+            for bound, count in zip((*self.buckets, math.inf), series):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                yield f"{self.name}_bucket{self._label_text(labels, le)} {_number(cumulative)}"
+            yield f"{self.name}_sum{self._label_text(labels)} {_number(series[-1])}"
+            yield f"{self.name}_count{self._label_text(labels)} {_number(cumulative)}"
+
+
+class MetricsRegistry:
+    """Process-local metrics rendered in the Prometheus text format.
+
+    Histograms are updated inline; collectors are called at
+    scrape time to turn existing stats objects into counters and gauges, so
+    components that already keep stats don't pay anything per operation.
+    """
+
+    def __init__(self, max_series: int = 1000) -> None:
+        self.max_series = max_series
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Collector] = []
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(
+            Histogram(name, help, labelnames, self.max_series, buckets=buckets)
+        )
+
+    def register_collector(self, collector: Collector) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+
+        collected: dict[str, list[Sample]] = {}
+        for collector in self._collectors:
+            for sample in collector():
+                collected.setdefault(sample.name, []).append(sample)
+        for name, samples in collected.items():
+            lines.append(f"# HELP {name} {samples[0].help}")
+            lines.append(f"# TYPE {name} {samples[0].kind}")
+            for sample in samples:
+                labels = ",".join(
+                    f'{key}="{_escape(value)}"' for key, value in sample.labels.items()
+                )
+                lines.append(
+                    f"{name}{{{labels}}} {_number(sample.value)}"
+                    if labels
+                    else f"{name} {_number(sample.value)}"
+                )
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+
+def gauge_field(default: float = 0) -> Any:
+    """A stats dataclass field holding a current level rather than a running count."""
+    return field(default=default, metadata={"gauge": True})
+
+
+def stats_samples(
+    prefix: str, help: str, stats: Any, labels: dict[str, str] | None = None
+) -> Iterable[Sample]:
+    """One sample per numeric field of a stats dataclass.
+
+    Fields only ever grow, so they are counters named
+    ``{prefix}_{field}_total``; those declared with ``gauge_field`` are
+    gauges named ``{prefix}_{field}``.
+    """
+    for stats_field in fields(stats):
+        value = getattr(stats, stats_field.name)
+        if not isinstance(value, (int, float)):
+            continue
+        name = f"{prefix}_{stats_field.name}"
+        if stats_field.metadata.get("gauge"):
+            yield Sample(name, help, labels or {}, value)
+        else:
+            yield Sample(f"{name}_total", help, labels or {}, value, "counter")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+@dataclass
+class RequestMetrics:
+    """What one request spent its time on; filled in while it is handled."""
+
+    request_id: str
+    started_at: float = field(default_factory=time.perf_counter)
+    db_queries: int = 0
+    db_secs: float = 0.0
+
+
+_current_request: ContextVar[RequestMetrics | None] = ContextVar(
+    "current_request_metrics", default=None
+)
+
+registry = MetricsRegistry()
+
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ("method", "route", "status"),
+)
+http_request_db_queries = registry.histogram(
+    "http_request_db_queries",
+    "Database queries issued per HTTP request.",
+    ("route",),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+http_request_db_duration = registry.histogram(
+    "http_request_db_duration_seconds",
+    "Total database time per HTTP request.",
+    ("route",),
+)
+db_query_duration = registry.histogram(
+    "db_query_duration_seconds", "Latency of individual database queries."
+)
+operation_duration = registry.histogram(
+    "operation_duration_seconds",
+    "Time spent in instrumented CPU-heavy operations such as bcrypt and JWT.",
+    ("operation",),
+)
+
+# Flipped by the metrics middleware at startup; while False the hooks below
+# return before doing any work.
+enabled = False
+
+
+def current_request() -> RequestMetrics | None:
+    return _current_request.get()
+
+
+def start_request(request_id: str):
+    return _current_request.set(RequestMetrics(request_id))
+
+
+def end_request(token) -> None:
+    _current_request.reset(token)
+
+
+def record_db_query(secs: float) -> None:
+    if not enabled:
+        return
+    db_query_duration.observe(secs)
+    request = _current_request.get()
+    if request is not None:
+        request.db_queries += 1
+        request.db_secs += secs
+
+
+def record_operation(operation: str, secs: float) -> None:
+    if enabled:
+        operation_duration.observe(secs, operation)
@@ -0,0 +1,219 @@
+import asyncio
+import logging
+import math
+import os
+import re
+import time
+import uuid
+from http.cookies import CookieError, SimpleCookie
+from pathlib import Path
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core import metrics
+from src.core.database.session import current_read_fence, end_read_fence, start_read_fence
+from src.core.profiling import SamplingProfiler
+
+logger = logging.getLogger(__name__)
+
+_KNOWN_METHODS = frozenset(
+    {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+)
+_VALID_REQUEST_ID = re.compile(r"[A-Za-z0-9._:-]{1,64}")
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """Records latency and DB usage per route and tags requests with an ID.
+
+    Routes are labelled by their path template (``/users/{id}``, never the
+    raw path) and status by class (``2xx``), so label cardinality is bounded
+    by the number of routes. A well-formed incoming request ID header is kept,
+    otherwise a new one is generated; either way it is echoed on the response.
+    """
+
+    def __init__(self, app: ASGIApp, request_id_header: str = "X-Request-ID") -> None:
+        self.app = app
+        self.request_id_header = request_id_header
+        self._request_id_key = request_id_header.lower().encode("latin-1")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = self._request_id(scope)
+        token = metrics.start_request(request_id)
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (self._request_id_key, request_id.encode("latin-1")),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request = metrics.current_request()
+            metrics.end_request(token)
+            self._observe(scope, status_code, request)
+
+    def _request_id(self, scope: Scope) -> str:
+        for name, value in scope["headers"]:
+            if name == self._request_id_key:
+                candidate = value.decode("latin-1")
+                if _VALID_REQUEST_ID.fullmatch(candidate):
+                    return candidate
+                break
+        return uuid.uuid4().hex
+
+    @staticmethod
+    def _observe(scope: Scope, status_code: int, request) -> None:
+        route = scope.get("route")
+        route_label = getattr(route, "path", None) or UNMATCHED_ROUTE
+        method = scope["method"] if scope["method"] in _KNOWN_METHODS else "OTHER"
+        elapsed = time.perf_counter() - request.started_at
+
+        metrics.http_request_duration.observe(
+            elapsed, method, route_label, f"{status_code // 100}xx"
+        )
+        metrics.http_request_db_queries.observe(request.db_queries, route_label)
+        metrics.http_request_db_duration.observe(request.db_secs, route_label)
+
+
+class ReadYourWritesMiddleware:
+    """Keeps a client's reads on the primary for a while after it writes.
+
+    Each request gets its own read fence, so a write only pins the reads of
+    the request that made it. When it did write, the response sets a short
+    cookie with the pin's end, and the client's next requests, on any
+    worker, start with that fence. The cookie can only send its own
+    client's reads to the primary, and never for longer than
+    ``read_your_writes_secs``.
+    """
+
+    def __init__(
+        self, app: ASGIApp, read_your_writes_secs: float, cookie_name: str = "primary_until"
+    ) -> None:
+        self.app = app
+        self.read_your_writes_secs = read_your_writes_secs
+        self.cookie_name = cookie_name
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        carried = self._carried_fence(scope)
+        token = start_read_fence(carried)
+        fence = current_read_fence()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and fence.primary_until > carried:
+                max_age = math.ceil(fence.primary_until - time.time())
+                cookie = (
+                    f"{self.cookie_name}={fence.primary_until:.3f}; Max-Age={max_age}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"set-cookie", cookie.encode("latin-1")),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            end_read_fence(token)
+
+    def _carried_fence(self, scope: Scope) -> float:
+        for name, value in scope["headers"]:
+            if name != b"cookie":
+                continue
+            try:
+                morsel = SimpleCookie(value.decode("latin-1")).get(self.cookie_name)
+                primary_until = float(morsel.value) if morsel is not None else 0.0
+            except (CookieError, ValueError):
+                return 0.0
+            if not math.isfinite(primary_until):
+                return 0.0
+            return min(primary_until, time.time() + self.read_your_writes_secs)
+        return 0.0
+
+
+class SlowRequestProfilerMiddleware:
+    """Writes a collapsed-stack profile for every request slower than a threshold.
+
+    The sampler runs continuously once the first request arrives; a slow
+    request dumps the samples taken while it was in flight. Other requests
+    interleaved on the same event loop show up in that window too. At most
+    one profile is written per ``cooldown_secs`` so a general slowdown
+    doesn't turn into a disk flood.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        profiler: SamplingProfiler,
+        threshold_secs: float,
+        output_dir: str,
+        cooldown_secs: float = 10.0,
+    ) -> None:
+        self.app = app
+        self.profiler = profiler
+        self.threshold_secs = threshold_secs
+        self.output_dir = Path(output_dir)
+        self.cooldown_secs = cooldown_secs
+        self._last_dump_at = -cooldown_secs
+        self._started = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if not self._started:
+            # Started here rather than in __init__ so the sampler targets the
+            # event loop thread.
+            self.profiler.start()
+            self._started = True
+
+        started = time.monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            finished = time.monotonic()
+            if (
+                finished - started >= self.threshold_secs
+                and finished - self._last_dump_at >= self.cooldown_secs
+            ):
+                self._last_dump_at = finished
+                await self._dump(scope, started, finished)
+
+    async def _dump(self, scope: Scope, started: float, finished: float) -> None:
+        request = metrics.current_request()
+        request_id = request.request_id if request is not None else uuid.uuid4().hex
+        elapsed_ms = int((finished - started) * 1000)
+        path = self.output_dir / (
+            f"{int(time.time())}-{os.getpid()}-{elapsed_ms}ms-{request_id}.collapsed"
+        )
+        try:
+            await asyncio.to_thread(
+                _write_profile, path, self.profiler.collapsed(started, finished)
+            )
+        except OSError:
+            logger.exception("Failed to write slow request profile to %s", path)
+            return
+        logger.warning(
+            "%s %s took %d ms, profile written to %s",
+            scope["method"], scope["path"], elapsed_ms, path,
+        )
+
+
+def _write_profile(path: Path, collapsed: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(collapsed)
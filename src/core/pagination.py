@@ -0,0 +1,43 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor can't be decoded."""
+
+
+@dataclass
+class KeysetPage(Generic[T]):
+    """One page of a keyset-paginated query.
+
+    ``next_cursor`` encodes the sort key of the last item; passing it back
+    resumes right after that item with an index range scan, so page N costs
+    the same as page 1 (unlike OFFSET, which reads and discards every row
+    before the page).
+    """
+
+    items: list[T]
+    next_cursor: str | None
+    total: int
+    total_is_estimate: bool
+
+
+def encode_cursor(values: list[Any]) -> str:
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> list[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, ValueError) as exc:
+        raise InvalidCursorError("Malformed cursor") from exc
+    if not isinstance(values, list):
+        raise InvalidCursorError("Malformed cursor")
+    return values
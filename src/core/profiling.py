@@ -0,0 +1,88 @@
+import sys
+import threading
+import time
+from collections import Counter, deque
+from types import CodeType, FrameType
+
+
+class SamplingProfiler:
+    """Statistical profiler that samples one thread's stack from a helper thread.
+
+    Every ``interval_secs`` the sampler grabs the target thread's current
+    frame via ``sys._current_frames()`` and appends the stack to a ring
+    buffer of ``max_samples`` entries, so the profiled code is never traced
+    or slowed down beyond the GIL hand-offs. Any window of the buffer can be
+    rendered as collapsed stacks (one ``frame;frame;frame count`` line per
+    distinct stack), the input format of flamegraph.pl and speedscope.
+
+    ``start``/``stop`` are reference counted so an on-demand capture and the
+    slow-request mode can share one sampler thread.
+    """
+
+    def __init__(self, interval_secs: float = 0.005, max_samples: int = 12_000) -> None:
+        self.interval_secs = interval_secs
+        self._samples: deque[tuple[float, tuple[str, ...]]] = deque(maxlen=max_samples)
+        self._labels: dict[CodeType, str] = {}
+        self._lock = threading.Lock()
+        self._users = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._target_thread_id: int | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self, thread_id: int | None = None) -> None:
+        """Start sampling ``thread_id`` (the calling thread by default)."""
+        with self._lock:
+            self._users += 1
+            if self._thread is not None:
+                return
+            self._target_thread_id = thread_id or threading.get_ident()
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="sampling-profiler", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        with self._lock:
+            self._users -= 1
+            if self._users > 0 or self._thread is None:
+                return
+            thread, self._thread = self._thread, None
+            self._stop.set()
+        thread.join()
+
+    def collapsed(self, since: float, until: float | None = None) -> str:
+        """Collapsed stacks for the samples taken between two ``time.monotonic()`` values."""
+        until = time.monotonic() if until is None else until
+        counts = Counter(
+            stack for taken_at, stack in list(self._samples) if since <= taken_at <= until
+        )
+        return "".join(
+            f"{';'.join(stack)} {count}\n" for stack, count in counts.most_common()
+        )
+
+    def _run(self) -> None:
+        target = self._target_thread_id
+        while not self._stop.wait(self.interval_secs):
+            frame = sys._current_frames().get(target)
+            if frame is not None:
+                self._samples.append((time.monotonic(), self._stack(frame)))
+            del frame
+
+    def _stack(self, frame: FrameType | None) -> tuple[str, ...]:
+        labels = []
+        while frame is not None:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                label = self._labels[code] = (
+                    f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})"
+                )
+            labels.append(label)
+            frame = frame.f_back
+        labels.reverse()
+        return tuple(labels)
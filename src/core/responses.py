@@ -0,0 +1,42 @@
+import re
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+
+_ENTITY_TAG = re.compile(r'(?:W/)?"[^"]*"')
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether ``If-None-Match`` names ``etag``, by RFC 9110 weak comparison.
+
+    The header is ``*`` or a comma-separated list of entity tags; ``W/``
+    prefixes are ignored on both sides.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        tag.removeprefix("W/") == opaque for tag in _ENTITY_TAG.findall(if_none_match)
+    )
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class ORJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class RawJSONResponse(Response):
+    """Response for a body that is already encoded JSON bytes."""
+
+    media_type = "application/json"
@@ -0,0 +1,103 @@
+import hashlib
+import json
+from functools import lru_cache
+from typing import NamedTuple
+
+from src.config import get_settings
+from src.core.cache import CacheBackend, InProcessCacheBackend
+from src.listings.projections import ListingFilters
+from src.listings.schemas import ListingSort
+from src.listings.text_search import fold
+
+_ALL_CITIES = "*"
+
+
+class CachedSearch(NamedTuple):
+    body: bytes
+    etag: str
+
+
+def etag_for(body: bytes) -> str:
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+# Entries are stored as the ETag followed by the body, so a hit doesn't
+# rehash the page.
+_ETAG_LENGTH = len(etag_for(b""))
+
+
+class ListingSearchCache:
+    """Encoded public search pages, keyed by the normalised query.
+
+    Every key embeds the current version of the city it searches (or of
+    "all cities"). ``invalidate_city()`` bumps both, so pages that could
+    include the changed listing stop being looked up and age out of the
+    LRU on their own; nothing has to be scanned or deleted.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl_secs: float) -> None:
+        self.backend = backend
+        self.ttl_secs = ttl_secs
+
+    async def key(
+        self,
+        filters: ListingFilters,
+        sort: ListingSort | None,
+        limit: int,
+        cursor: str | None,
+        exact_total: bool,
+    ) -> str:
+        scope = filters.city if filters.city is not None else _ALL_CITIES
+        version = await self.backend.get_counter(_version_key(scope))
+        query = " ".join(fold(filters.query).split()) if filters.query else None
+        return json.dumps(
+            [
+                scope,
+                version,
+                filters.rent_min,
+                filters.rent_max,
+                filters.type,
+                query,
+                sort,
+                limit,
+                cursor,
+                exact_total,
+            ],
+            separators=(",", ":"),
+        )
+
+    async def get(self, key: str) -> CachedSearch | None:
+        value = await self.backend.get(key)
+        if value is None:
+            return None
+        return CachedSearch(value[_ETAG_LENGTH:], value[:_ETAG_LENGTH].decode())
+
+    async def set(self, key: str, body: bytes) -> CachedSearch:
+        cached = CachedSearch(body, etag_for(body))
+        await self.backend.set(key, cached.etag.encode() + body, self.ttl_secs)
+        return cached
+
+    async def invalidate_city(self, city: str) -> None:
+        """Call whenever a listing in ``city`` enters or leaves public search
+        or changes what it shows: publish, close, takedown, room filled.
+        ``ListingService``'s write methods do.
+        """
+        await self.backend.incr(_version_key(city))
+        await self.backend.incr(_version_key(_ALL_CITIES))
+        self.backend.stats.invalidations += 1
+
+
+def _version_key(scope: str) -> str:
+    return f"listings:search-version:{scope}"
+
+
+@lru_cache(maxsize=1)
+def get_listing_search_cache() -> ListingSearchCache:
+    cache_settings = get_settings().cache
+    return ListingSearchCache(
+        InProcessCacheBackend(
+            max_size=cache_settings.listing_search_max_size,
+            ttl_secs=cache_settings.listing_search_ttl_secs,
+        ),
+        ttl_secs=cache_settings.listing_search_ttl_secs,
+    )
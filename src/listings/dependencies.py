@@ -0,0 +1,15 @@
+from fastapi import Depends
+
+from src.core.dependencies import SessionDep
+from src.listings.repository import ListingRepository
+from src.listings.service import ListingService
+
+
+async def get_listing_repository(session: SessionDep) -> ListingRepository:
+    return ListingRepository(session)
+
+
+async def get_listing_service(
+    listing_repository: ListingRepository = Depends(get_listing_repository),
+) -> ListingService:
+    return ListingService(listing_repository)
@@ -0,0 +1,134 @@
+from datetime import datetime, timezone
+from itertools import count
+from typing import Any
+
+from typing_extensions import override
+
+from src.config import get_settings
+from src.listings.models import Listing, ListingStatus
+from src.listings.projections import ListingFilters, ListingSummary
+from src.listings.repository import AbstractListingRepository
+from src.listings.schemas import ListingSort
+from src.listings.text_search import ListingSearchIndex
+
+
+class InMemoryListingRepository(AbstractListingRepository):
+    """Dict-backed repository with an in-process search index, for tests and
+    local runs without Postgres.
+
+    The index is updated on every create/update/delete, like the generated
+    search columns are in Postgres. Estimates are exact counts.
+    """
+
+    def __init__(self) -> None:
+        self._listings: dict[int, Listing] = {}
+        self._ids = count(1)
+        self.search_index = ListingSearchIndex()
+        self._fuzzy_threshold = get_settings().listings.fuzzy_similarity_threshold
+
+    @override
+    async def get_listing(self, listing_id: int) -> Listing | None:
+        return self._listings.get(listing_id)
+
+    @override
+    async def create_listing(self, listing_data: dict[str, Any]) -> Listing:
+        now = datetime.now(timezone.utc)
+        listing = Listing(
+            **{"charges_eur": 0, "status": ListingStatus.DRAFT, **listing_data},
+            id=next(self._ids),
+            created_at=now,
+            updated_at=now,
+        )
+        self._listings[listing.id] = listing
+        self._index(listing)
+        return listing
+
+    @override
+    async def update_listing(
+        self, listing_id: int, listing_data: dict[str, Any]
+    ) -> Listing | None:
+        listing = self._listings.get(listing_id)
+        if listing is None:
+            return None
+        for field, value in listing_data.items():
+            setattr(listing, field, value)
+        listing.updated_at = datetime.now(timezone.utc)
+        self._index(listing)
+        return listing
+
+    @override
+    async def delete_listing(self, listing_id: int) -> Listing | None:
+        listing = self._listings.pop(listing_id, None)
+        self.search_index.remove(listing_id)
+        return listing
+
+    @override
+    async def search_listings(
+        self,
+        filters: ListingFilters,
+        sort: ListingSort,
+        limit: int,
+        after: tuple[Any, ...] | None = None,
+    ) -> list[ListingSummary]:
+        ranks = self._ranks(filters)
+        matches = [
+            ListingSummary(
+                listing.id,
+                listing.title,
+                listing.city,
+                listing.rent_eur,
+                listing.charges_eur,
+                listing.type,
+                listing.availability_date,
+                listing.created_at,
+                ranks[listing.id] if sort is ListingSort.RELEVANCE else None,
+            )
+            for listing in self._matching(filters, ranks)
+        ]
+
+        def key(summary: ListingSummary) -> tuple[Any, ...]:
+            if sort is ListingSort.RELEVANCE:
+                return summary.rank, summary.id
+            if sort is ListingSort.RENT:
+                return summary.rent_eur, summary.created_at, summary.id
+            return summary.created_at, summary.id
+
+        ascending = sort is ListingSort.RENT
+        if after is not None:
+            matches = [m for m in matches if (key(m) > after if ascending else key(m) < after)]
+        matches.sort(key=key, reverse=not ascending)
+        return matches[:limit]
+
+    @override
+    async def count_listings(self, filters: ListingFilters) -> int:
+        return sum(1 for _ in self._matching(filters, self._ranks(filters)))
+
+    @override
+    async def estimate_listings(self, filters: ListingFilters) -> int:
+        return await self.count_listings(filters)
+
+    def _index(self, listing: Listing) -> None:
+        self.search_index.index(listing.id, listing.title, listing.city, listing.description)
+
+    def _ranks(self, filters: ListingFilters) -> dict[int, float] | None:
+        if filters.query is None:
+            return None
+        if filters.fuzzy:
+            return self.search_index.match_fuzzy(filters.query, self._fuzzy_threshold)
+        return self.search_index.match(filters.query)
+
+    def _matching(self, filters: ListingFilters, ranks: dict[int, float] | None):
+        candidates = (
+            self._listings.values()
+            if ranks is None
+            else (self._listings[i] for i in ranks)
+        )
+        for listing in candidates:
+            if (
+                listing.status == filters.status
+                and (filters.city is None or listing.city == filters.city)
+                and (filters.rent_min is None or listing.rent_eur >= filters.rent_min)
+                and (filters.rent_max is None or listing.rent_eur <= filters.rent_max)
+                and (filters.type is None or listing.type == filters.type)
+            ):
+                yield listing
@@ -0,0 +1,130 @@
+import enum
+from datetime import date
+
+from sqlalchemy import (
+    DDL,
+    Computed,
+    Date,
+    Enum as SAEnum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    event,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.core.database import BaseModel
+from src.listings.text_search import FOLDED_CHARACTERS, fold
+
+# Text search configuration for the full-text document; the TRD fixes the
+# locale to French.
+SEARCH_CONFIG = "french"
+SEARCH_DOCUMENT_INDEX = "ix_listings_search_document"
+SEARCH_TEXT_INDEX = "ix_listings_search_text"
+
+
+class ListingType(str, enum.Enum):
+    STUDIO = "studio"
+    ROOM = "room"
+    FLAT = "flat"
+
+
+class ListingStatus(str, enum.Enum):
+    DRAFT = "draft"
+    PUBLISHED = "published"
+    CLOSED = "closed"
+
+
+class Listing(BaseModel):
+    __tablename__ = "listings"
+    __table_args__ = (
+        # One index per search shape, each ending in the keyset sort key so
+        # the page is read straight off the index in order:
+        # city + price range sorted by rent ...
+        Index(
+            "ix_listings_status_city_rent",
+            "status", "city", "rent_eur", "created_at", "id",
+        ),
+        # ... city (+ price cap) sorted by newest, rent carried for filtering ...
+        Index(
+            "ix_listings_status_city_created",
+            "status", "city", "created_at", "id",
+            postgresql_include=["rent_eur"],
+        ),
+        # ... and all cities sorted by newest.
+        Index(
+            "ix_listings_status_created",
+            "status", "created_at", "id",
+            postgresql_include=["rent_eur"],
+        ),
+        # Free-text search: the stemmed document, and trigrams of the folded
+        # title and city for the typo-tolerant fallback.
+        Index(SEARCH_DOCUMENT_INDEX, "search_document", postgresql_using="gin"),
+        Index(
+            SEARCH_TEXT_INDEX,
+            "search_text",
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ),
+    )
+
+    landlord_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
+    title: Mapped[str] = mapped_column(String, nullable=False)
+    city: Mapped[str] = mapped_column(String, nullable=False)
+    address: Mapped[str | None] = mapped_column(String, nullable=True)
+    description: Mapped[str | None] = mapped_column(Text, nullable=True)
+    rent_eur: Mapped[int] = mapped_column(Integer, nullable=False)
+    charges_eur: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    type: Mapped[ListingType] = mapped_column(
+        SAEnum(ListingType, name="listing_type"), nullable=False
+    )
+    status: Mapped[ListingStatus] = mapped_column(
+        SAEnum(ListingStatus, name="listing_status"),
+        default=ListingStatus.DRAFT,
+        server_default=ListingStatus.DRAFT.name,
+        nullable=False,
+    )
+    availability_date: Mapped[date | None] = mapped_column(Date, nullable=True)
+
+    # Generated columns, so Postgres keeps them current on every insert and
+    # update of the listing; deferred since they are only ever filtered on.
+    search_document: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', listings_fold(title)), 'A')"
+            f" || setweight(to_tsvector('{SEARCH_CONFIG}', listings_fold(city)), 'B')"
+            f" || setweight(to_tsvector('{SEARCH_CONFIG}',"
+            " listings_fold(coalesce(description, ''))), 'C')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+    search_text: Mapped[str] = mapped_column(
+        Text,
+        Computed("listings_fold(title || ' ' || city)", persisted=True),
+        deferred=True,
+    )
+
+    def __repr__(self) -> str:
+        return f"Listing(id={self.id}, title={self.title})"
+
+
+# ``unaccent`` isn't immutable, so it can't be used in a generated column;
+# this folds like ``text_search.fold`` with plain ``translate`` and
+# ``regexp_replace``. Changing it means regenerating the columns above.
+# Existing databases get these from ``search_schema.ensure_search_schema``.
+create_fold_function = DDL(
+    "CREATE OR REPLACE FUNCTION listings_fold(value text) RETURNS text"
+    " LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE AS $$"
+    " SELECT regexp_replace("
+    f"replace(replace(lower(translate(value, '{FOLDED_CHARACTERS}',"
+    f" '{fold(FOLDED_CHARACTERS)}')), 'œ', 'oe'), 'æ', 'ae'),"
+    " '(\\d+)(eme|ere|er)\\M', '\\1e', 'g') $$"
+)
+for ddl in (DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"), create_fold_function):
+    event.listen(Listing.__table__, "before_create", ddl.execute_if(dialect="postgresql"))
@@ -0,0 +1,27 @@
+from datetime import date, datetime
+from typing import NamedTuple
+
+from src.listings.models import ListingStatus, ListingType
+
+
+class ListingFilters(NamedTuple):
+    city: str | None = None
+    rent_min: int | None = None
+    rent_max: int | None = None
+    type: ListingType | None = None
+    status: ListingStatus = ListingStatus.PUBLISHED
+    # Free text; ``fuzzy`` matches it by trigram similarity instead of stems.
+    query: str | None = None
+    fuzzy: bool = False
+
+
+class ListingSummary(NamedTuple):
+    id: int
+    title: str
+    city: str
+    rent_eur: int
+    charges_eur: int
+    type: ListingType
+    availability_date: date | None
+    created_at: datetime
+    rank: float | None = None
@@ -0,0 +1,266 @@
+import json
+import operator
+from abc import ABC, abstractmethod
+from functools import reduce
+from typing import Any
+
+from sqlalchemy import (
+    Float,
+    and_,
+    delete,
+    false,
+    func,
+    insert,
+    literal_column,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing_extensions import override
+
+from src.config import get_settings
+from src.core.database.session import LazySession
+from src.listings.models import SEARCH_CONFIG, Listing
+from src.listings.projections import ListingFilters, ListingSummary
+from src.listings.schemas import ListingSort
+from src.listings.search_schema import get_search_support
+from src.listings.text_search import query_words
+
+_SUMMARY_COLUMNS = (
+    Listing.id,
+    Listing.title,
+    Listing.city,
+    Listing.rent_eur,
+    Listing.charges_eur,
+    Listing.type,
+    Listing.availability_date,
+    Listing.created_at,
+)
+
+# Keyset sort keys; each is the tail of one of the search indexes on Listing,
+# with ``id`` as the tie-breaker so the order is total.
+SORT_KEYS = {
+    ListingSort.NEWEST: (Listing.created_at, Listing.id),
+    ListingSort.RENT: (Listing.rent_eur, Listing.created_at, Listing.id),
+}
+_DESCENDING = {ListingSort.NEWEST, ListingSort.RELEVANCE}
+
+
+def _tsquery(query: str):
+    return func.websearch_to_tsquery(
+        literal_column(f"'{SEARCH_CONFIG}'"), func.listings_fold(query)
+    )
+
+
+def _text_match(filters: ListingFilters):
+    if not filters.fuzzy:
+        # Both sides are folded and stemmed the same way, so "meuble" finds
+        # "meublée" and "Meublés".
+        return Listing.search_document.op("@@")(_tsquery(filters.query))
+    words = query_words(filters.query)
+    if not words:
+        return false()
+    # ``<%`` is pg_trgm's word_similarity test, answered by the trigram index;
+    # the threshold is set per transaction by ``_prepare``.
+    return and_(
+        *(func.listings_fold(word).op("<%")(Listing.search_text) for word in words)
+    )
+
+
+def _rank(filters: ListingFilters):
+    if not filters.fuzzy:
+        return func.ts_rank(Listing.search_document, _tsquery(filters.query), type_=Float)
+    return reduce(
+        operator.add,
+        (
+            func.word_similarity(func.listings_fold(word), Listing.search_text, type_=Float)
+            for word in query_words(filters.query) or [""]
+        ),
+    )
+
+
+def sort_columns(filters: ListingFilters, sort: ListingSort) -> tuple:
+    if sort is ListingSort.RELEVANCE:
+        return _rank(filters), Listing.id
+    return SORT_KEYS[sort]
+
+
+def _unanswerable(filters: ListingFilters) -> bool:
+    # The typo-tolerant fallback needs pg_trgm; without it, it finds nothing.
+    return filters.fuzzy and filters.query is not None and not get_search_support().trigrams
+
+
+def _conditions(filters: ListingFilters) -> list:
+    conditions = [Listing.status == filters.status]
+    if filters.city is not None:
+        conditions.append(Listing.city == filters.city)
+    if filters.rent_min is not None:
+        conditions.append(Listing.rent_eur >= filters.rent_min)
+    if filters.rent_max is not None:
+        conditions.append(Listing.rent_eur <= filters.rent_max)
+    if filters.type is not None:
+        conditions.append(Listing.type == filters.type)
+    if filters.query is not None:
+        conditions.append(_text_match(filters))
+    return conditions
+
+
+class AbstractListingRepository(ABC):
+    @abstractmethod
+    async def get_listing(self, listing_id: int) -> Listing | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def create_listing(self, listing_data: dict[str, Any]) -> Listing:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def update_listing(
+        self, listing_id: int, listing_data: dict[str, Any]
+    ) -> Listing | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_listing(self, listing_id: int) -> Listing | None:
+        """Delete and return the listing, or None if there was none."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def search_listings(
+        self,
+        filters: ListingFilters,
+        sort: ListingSort,
+        limit: int,
+        after: tuple[Any, ...] | None = None,
+    ) -> list[ListingSummary]:
+        """Up to ``limit`` listings in ``sort`` order, strictly after the sort key ``after``.
+
+        ``ListingSort.RELEVANCE`` needs ``filters.query`` and fills in ``rank``.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def count_listings(self, filters: ListingFilters) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def estimate_listings(self, filters: ListingFilters) -> int:
+        """Planner estimate of the matching rows; no table scan."""
+        raise NotImplementedError
+
+
+class ListingRepository(AbstractListingRepository):
+    def __init__(self, session: LazySession):
+        self.session = session
+        self._fuzzy_threshold = get_settings().listings.fuzzy_similarity_threshold
+
+    @override
+    async def get_listing(self, listing_id: int) -> Listing | None:
+        async with self.session.unit_of_work(read_only=True) as session:
+            return await session.get(Listing, listing_id)
+
+    @override
+    async def create_listing(self, listing_data: dict[str, Any]) -> Listing:
+        async with self.session.unit_of_work() as session:
+            listing = (
+                await session.scalars(insert(Listing).values(**listing_data).returning(Listing))
+            ).one()
+            await session.commit()
+        return listing
+
+    @override
+    async def update_listing(
+        self, listing_id: int, listing_data: dict[str, Any]
+    ) -> Listing | None:
+        async with self.session.unit_of_work() as session:
+            result = await session.execute(
+                update(Listing)
+                .where(Listing.id == listing_id)
+                .values(**listing_data, updated_at=func.now())
+                .returning(Listing)
+            )
+            listing = result.scalar_one_or_none()
+            await session.commit()
+        return listing
+
+    @override
+    async def delete_listing(self, listing_id: int) -> Listing | None:
+        async with self.session.unit_of_work() as session:
+            result = await session.execute(
+                delete(Listing).where(Listing.id == listing_id).returning(Listing)
+            )
+            listing = result.scalar_one_or_none()
+            await session.commit()
+        return listing
+
+    @override
+    async def search_listings(
+        self,
+        filters: ListingFilters,
+        sort: ListingSort,
+        limit: int,
+        after: tuple[Any, ...] | None = None,
+    ) -> list[ListingSummary]:
+        if _unanswerable(filters):
+            return []
+        key_columns = sort_columns(filters, sort)
+        descending = sort in _DESCENDING
+        columns = list(_SUMMARY_COLUMNS)
+        if sort is ListingSort.RELEVANCE:
+            columns.append(key_columns[0].label("rank"))
+        stmt = select(*columns).where(*_conditions(filters))
+        if after is not None:
+            # Row comparison, so Postgres turns it into an index range
+            # condition instead of filtering row by row.
+            key = tuple_(*key_columns)
+            stmt = stmt.where(key < tuple_(*after) if descending else key > tuple_(*after))
+        stmt = stmt.order_by(
+            *(column.desc() if descending else column.asc() for column in key_columns)
+        ).limit(limit)
+
+        async with self.session.unit_of_work(read_only=True) as session:
+            await self._prepare(session, filters)
+            result = await session.execute(stmt)
+            return [ListingSummary(*row) for row in result]
+
+    @override
+    async def count_listings(self, filters: ListingFilters) -> int:
+        if _unanswerable(filters):
+            return 0
+        stmt = select(func.count()).select_from(Listing).where(*_conditions(filters))
+        async with self.session.unit_of_work(read_only=True) as session:
+            await self._prepare(session, filters)
+            return (await session.execute(stmt)).scalar_one()
+
+    @override
+    async def estimate_listings(self, filters: ListingFilters) -> int:
+        if _unanswerable(filters):
+            return 0
+        stmt = select(Listing.id).where(*_conditions(filters))
+        async with self.session.unit_of_work(read_only=True) as session:
+            # EXPLAIN can't take bind parameters, so the filters are rendered
+            # as literals by the dialect (which quotes and escapes them). The
+            # result goes straight to the driver: text() would read a ``:word``
+            # inside one of those literals as a bind parameter.
+            sql = stmt.compile(
+                dialect=session.bind.dialect, compile_kwargs={"literal_binds": True}
+            )
+            connection = await session.connection()
+            result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")
+            plan = result.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    async def _prepare(self, session: AsyncSession, filters: ListingFilters) -> None:
+        if filters.query is not None and filters.fuzzy:
+            await session.execute(
+                select(
+                    func.set_config(
+                        "pg_trgm.word_similarity_threshold",
+                        str(self._fuzzy_threshold),
+                        True,
+                    )
+                )
+            )
@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+
+from src.config import get_settings
+from src.core.responses import RawJSONResponse, etag_matches
+from src.listings.cache import ListingSearchCache, get_listing_search_cache
+from src.listings.dependencies import get_listing_service
+from src.listings.models import ListingType
+from src.listings.projections import ListingFilters
+from src.listings.schemas import ListingSearchResponse, ListingSort
+from src.listings.serializers import dump_search_page
+from src.listings.service import ListingService
+
+listings_router = APIRouter(prefix="/listings", tags=["Listings"])
+
+
+@listings_router.get("", response_model=ListingSearchResponse)
+async def search_listings(
+    request: Request,
+    q: str | None = Query(None, max_length=200),
+    city: str | None = None,
+    price_min: int | None = Query(None, ge=0),
+    price_max: int | None = Query(None, ge=0),
+    type: ListingType | None = None,
+    sort: ListingSort | None = None,
+    limit: int | None = Query(None, ge=1),
+    cursor: str | None = None,
+    exact_total: bool = False,
+    listing_service: ListingService = Depends(get_listing_service),
+    search_cache: ListingSearchCache = Depends(get_listing_search_cache),
+):
+    filters = ListingFilters(
+        city=city, rent_min=price_min, rent_max=price_max, type=type, query=q
+    )
+    limit = listing_service.page_size(limit)
+    key = await search_cache.key(filters, sort, limit, cursor, exact_total)
+    cached = await search_cache.get(key)
+    if cached is None:
+        page = await listing_service.search(
+            filters, sort=sort, limit=limit, cursor=cursor, exact_total=exact_total
+        )
+        cached = await search_cache.set(key, dump_search_page(page))
+
+    max_age = get_settings().cache.listing_search_max_age_secs
+    headers = {"ETag": cached.etag, "Cache-Control": f"public, max-age={max_age}"}
+    if etag_matches(request.headers.get("if-none-match"), cached.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return RawJSONResponse(cached.body, headers=headers)
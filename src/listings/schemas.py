@@ -0,0 +1,30 @@
+import enum
+from datetime import date, datetime
+
+from pydantic import BaseModel
+
+from src.listings.models import ListingType
+
+
+class ListingSort(str, enum.Enum):
+    NEWEST = "newest"
+    RENT = "rent"
+    RELEVANCE = "relevance"
+
+
+class ListingPublic(BaseModel):
+    id: int
+    title: str
+    city: str
+    rent_eur: int
+    charges_eur: int
+    type: ListingType
+    availability_date: date | None = None
+    created_at: datetime
+
+
+class ListingSearchResponse(BaseModel):
+    results: list[ListingPublic]
+    total: int
+    total_is_estimate: bool
+    next_cursor: str | None = None
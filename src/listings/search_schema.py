@@ -0,0 +1,99 @@
+"""Database objects listing search needs beyond the plain table.
+
+``create_all`` makes them through the ``before_create`` hooks on
+``Listing``, but only along with a new table. ``ensure_search_schema`` runs
+at startup and adds whatever an existing database lacks: ``pg_trgm``, the
+``listings_fold`` function, the generated search columns (adding one
+rewrites the table, once) and their indexes. Each object is looked up in
+the catalog first, so once they all exist startup issues no DDL and the
+app's role needs no DDL rights.
+
+Without ``pg_trgm`` (not installed on the server, or not ours to create)
+the typo-tolerant fallback is switched off and finds nothing rather than
+failing on ``word_similarity``.
+"""
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.schema import CreateColumn, CreateIndex
+
+from src.listings.models import (
+    SEARCH_DOCUMENT_INDEX,
+    SEARCH_TEXT_INDEX,
+    Listing,
+    create_fold_function,
+)
+
+logger = logging.getLogger(__name__)
+
+_SEARCH_COLUMNS = ("search_document", "search_text")
+
+
+@dataclass
+class SearchSupport:
+    # Whether pg_trgm is installed; until startup has checked, assume so.
+    trigrams: bool = True
+
+
+@lru_cache(maxsize=1)
+def get_search_support() -> SearchSupport:
+    return SearchSupport()
+
+
+async def ensure_search_schema(engine: AsyncEngine) -> None:
+    async with engine.begin() as conn:
+        # Workers start together; one creates, the others then find it all.
+        await conn.execute(
+            text("SELECT pg_advisory_xact_lock(hashtext('listings_search_schema'))")
+        )
+        trigrams = await _ensure_pg_trgm(conn)
+        get_search_support().trigrams = trigrams
+
+        if await _scalar(conn, "SELECT to_regprocedure('listings_fold(text)')") is None:
+            await conn.execute(create_fold_function)
+        if await _scalar(conn, "SELECT to_regclass('listings')") is None:
+            return
+
+        existing = set(
+            await conn.scalars(
+                text(
+                    "SELECT column_name FROM information_schema.columns"
+                    " WHERE table_schema = current_schema() AND table_name = 'listings'"
+                )
+            )
+        )
+        for name in _SEARCH_COLUMNS:
+            if name not in existing:
+                logger.warning("Adding listings.%s; this rewrites the table", name)
+                column = CreateColumn(Listing.__table__.c[name]).compile(dialect=conn.dialect)
+                await conn.exec_driver_sql(f"ALTER TABLE listings ADD COLUMN {column}")
+
+        for index in Listing.__table__.indexes:
+            if index.name not in (SEARCH_DOCUMENT_INDEX, SEARCH_TEXT_INDEX):
+                continue
+            if index.name == SEARCH_TEXT_INDEX and not trigrams:
+                continue
+            if await _scalar(conn, f"SELECT to_regclass('{index.name}')") is None:
+                await conn.execute(CreateIndex(index))
+
+
+async def _ensure_pg_trgm(conn: AsyncConnection) -> bool:
+    if await _scalar(conn, "SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'"):
+        return True
+    try:
+        async with conn.begin_nested():
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    except DBAPIError as exc:
+        logger.warning(
+            "pg_trgm is unavailable, typo-tolerant listing search is off: %s", exc.orig
+        )
+        return False
+    return True
+
+
+async def _scalar(conn: AsyncConnection, sql: str):
+    return (await conn.execute(text(sql))).scalar()
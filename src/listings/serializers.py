@@ -0,0 +1,26 @@
+from pydantic import TypeAdapter
+
+from src.core.pagination import KeysetPage
+from src.listings.projections import ListingSummary
+from src.listings.schemas import ListingPublic, ListingSearchResponse
+
+search_response_adapter = TypeAdapter(ListingSearchResponse)
+
+_LISTING_PUBLIC_FIELDS = tuple(ListingPublic.model_fields)
+
+
+def dump_search_page(page: KeysetPage[ListingSummary]) -> bytes:
+    # Rows come straight from our database, so construct without validation.
+    return search_response_adapter.dump_json(
+        ListingSearchResponse.model_construct(
+            results=[
+                ListingPublic.model_construct(
+                    **{field: getattr(item, field) for field in _LISTING_PUBLIC_FIELDS}
+                )
+                for item in page.items
+            ],
+            total=page.total,
+            total_is_estimate=page.total_is_estimate,
+            next_cursor=page.next_cursor,
+        )
+    )
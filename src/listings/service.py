@@ -0,0 +1,157 @@
+from datetime import datetime
+from typing import Any
+
+from fastapi import HTTPException, status
+
+from src.config import get_settings
+from src.core.pagination import (
+    InvalidCursorError,
+    KeysetPage,
+    decode_cursor,
+    encode_cursor,
+)
+from src.listings.cache import ListingSearchCache, get_listing_search_cache
+from src.listings.models import Listing, ListingStatus
+from src.listings.projections import ListingFilters, ListingSummary
+from src.listings.repository import AbstractListingRepository
+from src.listings.schemas import ListingSort
+from src.listings.text_search import query_words
+
+
+def _sort_key(listing: ListingSummary, sort: ListingSort) -> list[Any]:
+    if sort is ListingSort.RELEVANCE:
+        return [listing.rank, listing.id]
+    if sort is ListingSort.RENT:
+        return [listing.rent_eur, listing.created_at.isoformat(), listing.id]
+    return [listing.created_at.isoformat(), listing.id]
+
+
+def _parse_sort_key(values: list[Any], sort: ListingSort) -> tuple[Any, ...]:
+    try:
+        if sort is ListingSort.RELEVANCE:
+            rank, listing_id = values
+            return float(rank), int(listing_id)
+        if sort is ListingSort.RENT:
+            rent, created_at, listing_id = values
+            return int(rent), datetime.fromisoformat(created_at), int(listing_id)
+        created_at, listing_id = values
+        return datetime.fromisoformat(created_at), int(listing_id)
+    except (TypeError, ValueError) as exc:
+        raise InvalidCursorError("Malformed cursor") from exc
+
+
+class ListingService:
+    def __init__(
+        self,
+        listing_repository: AbstractListingRepository,
+        search_cache: ListingSearchCache | None = None,
+    ) -> None:
+        self.listing_repository = listing_repository
+        self._search_cache = search_cache or get_listing_search_cache()
+        self._settings = get_settings().listings
+
+    async def create_listing(self, listing_data: dict[str, Any]) -> Listing:
+        listing = await self.listing_repository.create_listing(listing_data)
+        await self._invalidate_search(listing.city, listing.status)
+        return listing
+
+    async def update_listing(self, listing_id: int, listing_data: dict[str, Any]) -> Listing:
+        before = await self.listing_repository.get_listing(listing_id)
+        if before is None:
+            raise _listing_not_found()
+        # Read now: an in-memory repository updates the same object.
+        city, listing_status = before.city, before.status
+        listing = await self.listing_repository.update_listing(listing_id, listing_data)
+        if listing is None:
+            raise _listing_not_found()
+        await self._invalidate_search(city, listing_status)
+        if listing.city != city or listing.status != listing_status:
+            await self._invalidate_search(listing.city, listing.status)
+        return listing
+
+    async def delete_listing(self, listing_id: int) -> None:
+        listing = await self.listing_repository.delete_listing(listing_id)
+        if listing is None:
+            raise _listing_not_found()
+        await self._invalidate_search(listing.city, listing.status)
+
+    async def search(
+        self,
+        filters: ListingFilters,
+        sort: ListingSort | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+        exact_total: bool = False,
+    ) -> KeysetPage[ListingSummary]:
+        """Search listings; with ``filters.query`` the default sort is relevance.
+
+        A free-text query is matched on stemmed words first. If that finds
+        nothing, it is retried by trigram similarity so typos still match;
+        cursors remember which of the two the first page used.
+        """
+        if filters.query is not None and not filters.query.strip():
+            filters = filters._replace(query=None)
+        if sort is None:
+            sort = ListingSort.RELEVANCE if filters.query else ListingSort.NEWEST
+        elif sort is ListingSort.RELEVANCE and filters.query is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Sorting by relevance needs a search query",
+            )
+        limit = self.page_size(limit)
+        try:
+            fuzzy, after = self._decode_cursor(cursor, sort) if cursor else (False, None)
+        except InvalidCursorError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+            ) from None
+        if filters.query is not None:
+            filters = filters._replace(fuzzy=fuzzy)
+
+        # One extra row tells us whether there is a next page.
+        items = await self.listing_repository.search_listings(filters, sort, limit + 1, after)
+        if not items and after is None and filters.query and query_words(filters.query):
+            filters = filters._replace(fuzzy=True)
+            items = await self.listing_repository.search_listings(
+                filters, sort, limit + 1, after
+            )
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = encode_cursor(
+                [sort.value, filters.fuzzy, *_sort_key(items[-1], sort)]
+            )
+
+        if after is None and next_cursor is None:
+            # The whole result fits on the first page, so its size is the total.
+            return KeysetPage(items, None, len(items), total_is_estimate=False)
+        total, is_estimate = await self._total(filters, exact_total)
+        return KeysetPage(items, next_cursor, total, is_estimate)
+
+    async def _invalidate_search(self, city: str, listing_status: ListingStatus) -> None:
+        # Cached pages only ever hold published listings.
+        if listing_status is ListingStatus.PUBLISHED:
+            await self._search_cache.invalidate_city(city)
+
+    def page_size(self, limit: int | None) -> int:
+        return min(limit or self._settings.default_page_size, self._settings.max_page_size)
+
+    async def _total(self, filters: ListingFilters, exact: bool) -> tuple[int, bool]:
+        if not exact:
+            estimate = await self.listing_repository.estimate_listings(filters)
+            if estimate > self._settings.exact_count_threshold:
+                return estimate, True
+        # Small results are cheap to count exactly, and estimates are least
+        # accurate there.
+        return await self.listing_repository.count_listings(filters), False
+
+    @staticmethod
+    def _decode_cursor(cursor: str, sort: ListingSort) -> tuple[bool, tuple[Any, ...]]:
+        values = decode_cursor(cursor)
+        if len(values) < 2 or values[0] != sort.value:
+            raise InvalidCursorError("Cursor does not match the requested sort")
+        return bool(values[1]), _parse_sort_key(values[2:], sort)
+
+
+def _listing_not_found() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Listing not found")
@@ -0,0 +1,196 @@
+"""French text normalisation and the in-process listing search index.
+
+Postgres does the real work in production (see ``Listing.search_document``
+and ``Listing.search_text``); ``ListingSearchIndex`` reproduces the same
+matching rules in memory so services can be exercised without a database:
+
+* full-text: every query word must match a stemmed, accent-folded word of
+  the title (weight 1.0), city (0.4) or description (0.2), and ``-word``
+  excludes; the rank is the summed weight, like ``ts_rank``;
+* fuzzy: every query word must have a trigram ``word_similarity`` of at
+  least the threshold with a word of the title or city (``pg_trgm``'s
+  ``<%``), and the rank is the summed similarity.
+"""
+import re
+import unicodedata
+from collections import defaultdict
+
+# Accented characters the SQL fold function (``listings_fold``) translates;
+# Python folds any character through NFKD, which agrees on all of these.
+FOLDED_CHARACTERS = "àâäáãåçéèêëíìîïñóòôöõúùûüýÿÀÂÄÁÃÅÇÉÈÊËÍÌÎÏÑÓÒÔÖÕÚÙÛÜÝ²"
+
+STOP_WORDS = frozenset(
+    """
+    a au aux avec ce ces d dans de des du en et l la le les leur m ma mais
+    mes mon n ne ni nos notre ou par pas pour qu que qui s sa sans se ses
+    son sur t ta tes ton un une vos votre y
+    """.split()
+)
+
+_WORD = re.compile(r"\w+")
+# "18ème", "18eme" and "18e" are the same arrondissement.
+_ORDINAL = re.compile(r"(\d+)(?:eme|ere|er)\b")
+# Light French stemming: plurals, feminine and participle endings and the
+# commonest noun suffixes; enough for "meublée"/"meublés" or
+# "appartements" to meet "meublé"/"appartement".
+_SUFFIXES = ("ements", "ement", "ations", "ation", "euses", "euse", "ees", "ee", "es", "e", "s", "x")
+
+TITLE_WEIGHT = 1.0
+CITY_WEIGHT = 0.4
+DESCRIPTION_WEIGHT = 0.2
+
+
+def fold(text: str) -> str:
+    """Lowercase and strip accents ("Meublée" -> "meublee", "18ème" -> "18e")."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    folded = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _ORDINAL.sub(r"\1e", folded.replace("œ", "oe").replace("æ", "ae"))
+
+
+def query_words(text: str) -> list[str]:
+    """Folded words of ``text`` without stop words, in order."""
+    return [word for word in _WORD.findall(fold(text)) if word not in STOP_WORDS]
+
+
+def stem(word: str) -> str:
+    """Strip one common French ending from a folded word.
+
+    This is not Snowball, which Postgres's ``french`` config runs over the
+    same folded words. The two agree on plurals and on most nouns and
+    adjectives ("appartements", "chambres", "lumineuses", "renovation"),
+    but differ in two ways:
+
+    * Snowball also strips derivational endings this keeps, so it conflates
+      more: "etudiant"/"etudi", "terrasse"/"terr", "traversant"/"travers",
+      "lumineux"/"lumin".
+    * Snowball recognises the feminine participle by its "ée", which
+      folding has removed, so in Postgres "meublee" stems to "meuble" and
+      misses "meublé" and "meublés" ("meubl"); this conflates all three.
+
+    tests/test_text_search.py records both stems for shared fixtures, so a
+    change on either side shows up there.
+    """
+    if word[:1].isdigit():
+        return word
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[: -len(suffix)]
+    return word
+
+
+def trigrams(word: str) -> set[str]:
+    """pg_trgm's trigrams of one word: padded with two spaces in front, one behind."""
+    padded = f"  {word} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class ListingSearchIndex:
+    """Inverted index over listing text, updated one listing at a time."""
+
+    def __init__(self) -> None:
+        # stem -> {listing id: summed field weight}
+        self._postings: dict[str, dict[int, float]] = defaultdict(dict)
+        # title/city word -> listing ids, and trigram -> title/city words
+        self._fuzzy_postings: dict[str, set[int]] = defaultdict(set)
+        self._trigrams: dict[str, set[str]] = defaultdict(set)
+        self._documents: dict[int, tuple[set[str], set[str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def index(self, listing_id: int, title: str, city: str, description: str | None) -> None:
+        self.remove(listing_id)
+        weights: dict[str, float] = defaultdict(float)
+        for text, weight in (
+            (title, TITLE_WEIGHT),
+            (city, CITY_WEIGHT),
+            (description or "", DESCRIPTION_WEIGHT),
+        ):
+            for word in query_words(text):
+                weights[stem(word)] += weight
+        for term, weight in weights.items():
+            self._postings[term][listing_id] = weight
+
+        fuzzy_words = set(_WORD.findall(fold(f"{title} {city}")))
+        for word in fuzzy_words:
+            self._fuzzy_postings[word].add(listing_id)
+            for trigram in trigrams(word):
+                self._trigrams[trigram].add(word)
+        self._documents[listing_id] = (set(weights), fuzzy_words)
+
+    def remove(self, listing_id: int) -> None:
+        document = self._documents.pop(listing_id, None)
+        if document is None:
+            return
+        terms, fuzzy_words = document
+        for term in terms:
+            postings = self._postings[term]
+            postings.pop(listing_id, None)
+            if not postings:
+                del self._postings[term]
+        for word in fuzzy_words:
+            postings = self._fuzzy_postings[word]
+            postings.discard(listing_id)
+            if not postings:
+                del self._fuzzy_postings[word]
+                for trigram in trigrams(word):
+                    self._trigrams[trigram].discard(word)
+                    if not self._trigrams[trigram]:
+                        del self._trigrams[trigram]
+
+    def match(self, query: str) -> dict[int, float]:
+        """Full-text matches for ``query`` with their rank."""
+        required, excluded = [], set()
+        for token in query.split():
+            negated = token.startswith("-")
+            for word in query_words(token):
+                if negated:
+                    excluded.add(stem(word))
+                else:
+                    required.append(stem(word))
+        if not required:
+            return {}
+
+        required.sort(key=lambda term: len(self._postings.get(term, ())))
+        ranks = dict(self._postings.get(required[0], {}))
+        for term in required[1:]:
+            postings = self._postings.get(term, {})
+            ranks = {i: rank + postings[i] for i, rank in ranks.items() if i in postings}
+        for term in excluded:
+            for listing_id in self._postings.get(term, ()):
+                ranks.pop(listing_id, None)
+        return ranks
+
+    def match_fuzzy(self, query: str, threshold: float) -> dict[int, float]:
+        """Listings whose title or city has a close word for every query word."""
+        words = query_words(query)
+        if not words:
+            return {}
+        ranks: dict[int, float] | None = None
+        for word in words:
+            similarities = self._word_similarities(word, threshold)
+            if ranks is None:
+                ranks = similarities
+            else:
+                ranks = {i: ranks[i] + s for i, s in similarities.items() if i in ranks}
+            if not ranks:
+                return {}
+        return ranks
+
+    def _word_similarities(self, word: str, threshold: float) -> dict[int, float]:
+        wanted = trigrams(word)
+        shared: dict[str, int] = defaultdict(int)
+        for trigram in wanted:
+            for candidate in self._trigrams.get(trigram, ()):
+                shared[candidate] += 1
+
+        best: dict[int, float] = {}
+        for candidate, count in shared.items():
+            similarity = count / len(wanted)
+            if similarity < threshold:
+                continue
+            for listing_id in self._fuzzy_postings[candidate]:
+                if similarity > best.get(listing_id, 0.0):
+                    best[listing_id] = similarity
+        return best
+
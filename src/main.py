@@ -1,6 +1,107 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
-from src.router import router
 
-app = FastAPI()
+from src.config import get_settings
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    from src.core.database.pool import warm_up_pool
+    from src.core.database.session import LazySession, dispose_database, get_database
+    from src.listings.search_schema import ensure_search_schema
+    from src.messages.fanout import get_message_fanout
+    from src.users.auth.revocation import get_revocation_list, refresh_periodically
+    from src.users.repository import UserRepository
+
+    settings = get_settings()
+    database = get_database()
+    await warm_up_pool(database.primary, settings.database.pool_warmup_connections)
+    await ensure_search_schema(database.primary)
+
+    revocation_refresher = None
+    if settings.security.stateless_access_tokens:
+        revocation_refresher = asyncio.create_task(
+            refresh_periodically(
+                get_revocation_list(),
+                lambda: UserRepository(LazySession()),
+                settings.security.revocation_refresh_secs,
+            )
+        )
+
+    message_fanout = get_message_fanout()
+    await message_fanout.start()
+
+    yield
+
+    await message_fanout.stop()
+    if revocation_refresher is not None:
+        revocation_refresher.cancel()
+        with suppress(asyncio.CancelledError):
+            await revocation_refresher
+    await dispose_database()
+
+
+def create_app() -> FastAPI:
+    """Build the application.
+
+    Routers and their dependencies are imported here rather than at module
+    level, and engines are only created when the lifespan starts (or a query
+    first runs), so building an app never needs a database.
+    """
+    from src.core import metrics
+    from src.core.middleware import (
+        MetricsMiddleware,
+        ReadYourWritesMiddleware,
+        SlowRequestProfilerMiddleware,
+    )
+    from src.core.responses import ORJSONResponse
+    from src.router import router
+    from src.users.auth.router import jwks_router
+
+    settings = get_settings()
+    app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+
+    app.include_router(router)
+    app.include_router(jwks_router)
+
+    if settings.database.replica_urls:
+        app.add_middleware(
+            ReadYourWritesMiddleware,
+            read_your_writes_secs=settings.database.read_your_writes_secs,
+        )
+
+    if settings.profiling.enabled:
+        from src.profiling import get_profiler, profiling_router
+
+        app.include_router(profiling_router)
+        if settings.profiling.slow_request_threshold_secs is not None:
+            app.add_middleware(
+                SlowRequestProfilerMiddleware,
+                profiler=get_profiler(),
+                threshold_secs=settings.profiling.slow_request_threshold_secs,
+                output_dir=settings.profiling.slow_request_output_dir,
+                cooldown_secs=settings.profiling.slow_request_cooldown_secs,
+            )
+
+    if settings.metrics.enabled:
+        from src.metrics import metrics_router
+
+        metrics.enabled = True
+        app.add_middleware(
+            MetricsMiddleware, request_id_header=settings.metrics.request_id_header
+        )
+        app.include_router(metrics_router)
+
+    return app
+
 
-app.include_router(router)
+def __getattr__(name: str):
+    # Keeps ``uvicorn src.main:app`` working; the app is only built on first
+    # access, so importing this module (or using ``--factory
+    # src.main:create_app``) stays cheap.
+    if name == "app":
+        app = globals()["app"] = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,16 @@
+from functools import lru_cache
+
+from src.config import get_settings
+from src.core.cache import TTLCache
+from src.messages.projections import ThreadParticipants
+
+ParticipantsCache = TTLCache[int, ThreadParticipants]
+
+
+@lru_cache(maxsize=1)
+def get_participants_cache() -> ParticipantsCache:
+    # A thread's participants never change, so entries only leave by LRU.
+    return TTLCache(
+        max_size=get_settings().messages.participants_cache_size,
+        ttl_secs=float("inf"),
+    )
@@ -0,0 +1,15 @@
+from fastapi import Depends
+
+from src.core.dependencies import SessionDep
+from src.messages.repository import MessageRepository
+from src.messages.service import MessageService
+
+
+async def get_message_repository(session: SessionDep) -> MessageRepository:
+    return MessageRepository(session)
+
+
+async def get_message_service(
+    message_repository: MessageRepository = Depends(get_message_repository),
+) -> MessageService:
+    return MessageService(message_repository)
@@ -0,0 +1,140 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from contextlib import suppress
+from functools import lru_cache
+from typing import Protocol
+
+from src.config import get_settings
+from src.messages.notifier import get_thread_notifier
+
+logger = logging.getLogger(__name__)
+
+
+class FanoutSubscriber(Protocol):
+    def publish(self, thread_id: int, message_id: int) -> None: ...
+
+    def set_live(self, live: bool) -> None: ...
+
+
+class MessageFanout(ABC):
+    """Delivers "thread T has message M" to the subscribers of every worker.
+
+    ``notify_channel`` is the Postgres channel the inserting transaction
+    announces each message on (see ``MessageRepository.create_message``),
+    or None when messages only need announcing in-process.
+    """
+
+    notify_channel: str | None = None
+
+    def __init__(self) -> None:
+        self._subscribers: list[FanoutSubscriber] = []
+
+    def subscribe(self, subscriber: FanoutSubscriber) -> None:
+        self._subscribers.append(subscriber)
+
+    def _deliver(self, thread_id: int, message_id: int) -> None:
+        for subscriber in self._subscribers:
+            subscriber.publish(thread_id, message_id)
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    @abstractmethod
+    async def publish(self, thread_id: int, message_id: int) -> None:
+        """Announce a message to this worker; only call once it is committed."""
+        raise NotImplementedError
+
+
+class LoopbackFanout(MessageFanout):
+    """Delivers in-process only: a single worker, tests and local runs."""
+
+    async def publish(self, thread_id: int, message_id: int) -> None:
+        self._deliver(thread_id, message_id)
+
+
+class PostgresFanout(MessageFanout):
+    """Fans out through Postgres ``LISTEN``/``NOTIFY`` on ``notify_channel``.
+
+    Each worker keeps one dedicated listening connection outside the pool.
+    The ``NOTIFY`` is sent by the transaction inserting the message, so it
+    can't be lost between the commit and a separate announcement, and other
+    workers never hear of a message they can't read yet. The publishing
+    worker wakes its own polls right away and doesn't wait for its
+    notification to come back. While the listener is reconnecting,
+    notifications are lost, so the notifiers are marked not live and polls
+    fall back to querying until it is back.
+    """
+
+    def __init__(self, dsn: str, channel: str, reconnect_secs: float = 1.0) -> None:
+        super().__init__()
+        self.dsn = dsn
+        self.notify_channel = channel
+        self.reconnect_secs = reconnect_secs
+        self._listener: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        # Not live until the first LISTEN is in place.
+        self._set_live(False)
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._listener
+
+    async def publish(self, thread_id: int, message_id: int) -> None:
+        # Other workers hear of it from the NOTIFY committed with the message.
+        self._deliver(thread_id, message_id)
+
+    def _on_notification(self, connection, pid: int, channel: str, payload: str) -> None:
+        try:
+            thread_id, message_id = map(int, payload.split(":"))
+        except ValueError:
+            logger.warning("Ignoring malformed message notification %r", payload)
+            return
+        self._deliver(thread_id, message_id)
+
+    async def _listen(self) -> None:
+        import asyncpg
+
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _: lost.set())
+                await connection.add_listener(self.notify_channel, self._on_notification)
+                self._set_live(True)
+                await lost.wait()
+                logger.warning("Message notification listener disconnected")
+            except Exception:
+                logger.exception("Message notification listener failed")
+            finally:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            self._set_live(False)
+            await asyncio.sleep(self.reconnect_secs)
+
+    def _set_live(self, live: bool) -> None:
+        for subscriber in self._subscribers:
+            subscriber.set_live(live)
+
+
+@lru_cache(maxsize=1)
+def get_message_fanout() -> MessageFanout:
+    settings = get_settings()
+    fanout: MessageFanout
+    if settings.messages.fanout == "postgres":
+        dsn = settings.sqlalchemy_database_uri.set(drivername="postgresql")
+        fanout = PostgresFanout(
+            dsn.render_as_string(hide_password=False), settings.messages.notify_channel
+        )
+    else:
+        fanout = LoopbackFanout()
+    fanout.subscribe(get_thread_notifier())
+    return fanout
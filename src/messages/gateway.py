@@ -0,0 +1,373 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable
+
+import orjson
+from fastapi import HTTPException, WebSocket, status
+from pydantic import ValidationError
+
+from src.config import get_settings
+from src.core.metrics import gauge_field
+from src.core.database.session import LazySession
+from src.messages.fanout import get_message_fanout
+from src.messages.projections import MessageRow
+from src.messages.repository import AbstractMessageRepository, MessageRepository
+from src.messages.schemas import (
+    SendFrame,
+    SubscribeFrame,
+    UnsubscribeFrame,
+    client_frame_adapter,
+)
+from src.messages.service import MessageService
+from src.users.projections import AuthPrincipal
+
+logger = logging.getLogger(__name__)
+
+WS_TRY_AGAIN_LATER = 1013
+
+
+@dataclass
+class GatewayStats:
+    connections: int = gauge_field()
+    subscriptions: int = gauge_field()
+    rejected: int = 0
+    frames_sent: int = 0
+    events_sent: int = 0
+    slow_consumers: int = 0
+    expired: int = 0
+    fetches: int = 0
+    primary_fetches: int = 0
+
+
+class GatewayConnection:
+    """One authenticated socket: its principal, thread cursors and send buffer.
+
+    The principal is resolved once at connect and kept until the socket
+    closes, at the latest when the access token expires. Outgoing events go
+    to a bounded buffer; a flush task exists only while there is something
+    to send, so an idle socket costs no task beyond the one reading it.
+    """
+
+    __slots__ = (
+        "websocket",
+        "principal",
+        "cursors",
+        "closed",
+        "_aborted",
+        "_hub",
+        "_pending",
+        "_flusher",
+        "_expiry",
+    )
+
+    def __init__(self, websocket: WebSocket, principal: AuthPrincipal, hub: "ConnectionHub"):
+        self.websocket = websocket
+        self.principal = principal
+        # Thread id -> id of the newest message pushed on this socket.
+        self.cursors: dict[int, int] = {}
+        self.closed = False
+        self._aborted = False
+        self._hub = hub
+        self._pending: list[dict[str, Any]] = []
+        self._flusher: asyncio.Task | None = None
+        self._expiry: asyncio.TimerHandle | None = None
+
+    def expire_at(self, expires_at: float) -> None:
+        delay = max(0.0, expires_at - time.time())
+        self._expiry = asyncio.get_running_loop().call_later(delay, self._expired)
+
+    def push(self, event: dict[str, Any]) -> None:
+        if self.closed:
+            return
+        if len(self._pending) >= self._hub.send_queue_size:
+            self._hub.stats.slow_consumers += 1
+            self.abort(WS_TRY_AGAIN_LATER, "Send queue full")
+            return
+        self._pending.append(event)
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush())
+
+    def abort(self, code: int, reason: str) -> None:
+        """Close from the server side without waiting on the client."""
+        if self.closed:
+            return
+        self.closed = self._aborted = True
+        self._pending.clear()
+        if self._expiry is not None:
+            self._expiry.cancel()
+        if self._flusher is not None:
+            self._flusher.cancel()
+        self._flusher = asyncio.create_task(self._close(code, reason))
+
+    def release(self) -> None:
+        self.closed = True
+        if self._expiry is not None:
+            self._expiry.cancel()
+        # After abort() the task is sending the close frame; let it finish.
+        if self._flusher is not None and not self._aborted:
+            self._flusher.cancel()
+
+    async def _flush(self) -> None:
+        hub = self._hub
+        try:
+            while self._pending:
+                if hub.batch_window_secs > 0:
+                    await asyncio.sleep(hub.batch_window_secs)
+                events, self._pending = self._pending, []
+                await asyncio.wait_for(
+                    self.websocket.send_text(orjson.dumps(events).decode()),
+                    hub.send_timeout_secs,
+                )
+                hub.stats.frames_sent += 1
+                hub.stats.events_sent += len(events)
+        except asyncio.TimeoutError:
+            hub.stats.slow_consumers += 1
+            self._flusher = None
+            self.abort(WS_TRY_AGAIN_LATER, "Send timed out")
+            return
+        except Exception:
+            # The client went away; the reader notices and releases us.
+            self.closed = True
+        self._flusher = None
+
+    async def _close(self, code: int, reason: str) -> None:
+        try:
+            await self.websocket.close(code, reason)
+        except Exception:
+            pass
+
+    def _expired(self) -> None:
+        self._expiry = None
+        self._hub.stats.expired += 1
+        self.abort(status.WS_1008_POLICY_VIOLATION, "Token expired")
+
+
+class ConnectionHub:
+    """Per-worker registry of sockets by thread, fed by the message fan-out.
+
+    A published message triggers one query per thread, shared by every
+    socket subscribed to it here, starting from the oldest cursor among
+    them; each socket then gets only what is past its own cursor. Fetches
+    for a thread never overlap: a publish during a fetch runs it once more.
+    Fetches read from a replica; when one comes back short of the newest
+    published id, the replica is lagging and the page is read again from
+    the primary, where the notified message was committed.
+    """
+
+    def __init__(
+        self,
+        repository_factory: Callable[[], AbstractMessageRepository],
+        max_connections: int,
+        max_threads_per_connection: int,
+        send_queue_size: int,
+        send_timeout_secs: float,
+        batch_window_secs: float,
+        page_size: int,
+    ) -> None:
+        self._repository_factory = repository_factory
+        self.max_connections = max_connections
+        self.max_threads_per_connection = max_threads_per_connection
+        self.send_queue_size = send_queue_size
+        self.send_timeout_secs = send_timeout_secs
+        self.batch_window_secs = batch_window_secs
+        self.page_size = page_size
+        self.stats = GatewayStats()
+        self._connections: set[GatewayConnection] = set()
+        self._threads: dict[int, set[GatewayConnection]] = {}
+        self._fetching: dict[int, asyncio.Task] = {}
+        self._refetch: set[int] = set()
+        # Thread id -> newest published id not yet fetched.
+        self._published: dict[int, int] = {}
+
+    def register(self, connection: GatewayConnection) -> bool:
+        if len(self._connections) >= self.max_connections:
+            self.stats.rejected += 1
+            return False
+        self._connections.add(connection)
+        self.stats.connections = len(self._connections)
+        return True
+
+    def unregister(self, connection: GatewayConnection) -> None:
+        connection.release()
+        self._connections.discard(connection)
+        for thread_id in connection.cursors:
+            self._discard(thread_id, connection)
+        connection.cursors.clear()
+        self.stats.connections = len(self._connections)
+
+    def subscribe(self, connection: GatewayConnection, thread_id: int, after_id: int) -> None:
+        if thread_id not in connection.cursors:
+            self._threads.setdefault(thread_id, set()).add(connection)
+            self.stats.subscriptions += 1
+        connection.cursors[thread_id] = after_id
+        # Catches up past ``after_id``, including anything published while
+        # the subscription was being checked.
+        self._schedule(thread_id)
+
+    def unsubscribe(self, connection: GatewayConnection, thread_id: int) -> None:
+        if connection.cursors.pop(thread_id, None) is not None:
+            self._discard(thread_id, connection)
+
+    def publish(self, thread_id: int, message_id: int) -> None:
+        connections = self._threads.get(thread_id)
+        if connections and any(c.cursors[thread_id] < message_id for c in connections):
+            if message_id > self._published.get(thread_id, 0):
+                self._published[thread_id] = message_id
+            self._schedule(thread_id)
+
+    def set_live(self, live: bool) -> None:
+        if live:
+            # Notifications may have been missed while the feed was down.
+            for thread_id in list(self._threads):
+                self._schedule(thread_id)
+
+    def _discard(self, thread_id: int, connection: GatewayConnection) -> None:
+        connections = self._threads.get(thread_id)
+        if connections is None:
+            return
+        connections.discard(connection)
+        self.stats.subscriptions -= 1
+        if not connections:
+            del self._threads[thread_id]
+            self._published.pop(thread_id, None)
+
+    def _schedule(self, thread_id: int) -> None:
+        if thread_id in self._fetching:
+            self._refetch.add(thread_id)
+        else:
+            self._fetching[thread_id] = asyncio.create_task(self._fetch(thread_id))
+
+    async def _fetch(self, thread_id: int) -> None:
+        repository = self._repository_factory()
+        try:
+            while connections := self._threads.get(thread_id):
+                self._refetch.discard(thread_id)
+                after_id = min(c.cursors[thread_id] for c in connections)
+                messages = await repository.get_messages(
+                    thread_id, after_id, None, self.page_size
+                )
+                self.stats.fetches += 1
+                published = self._published.get(thread_id, 0)
+                last_id = messages[-1].id if messages else after_id
+                if len(messages) < self.page_size and last_id < published:
+                    messages = await repository.get_messages(
+                        thread_id, after_id, None, self.page_size, primary=True
+                    )
+                    self.stats.primary_fetches += 1
+                    last_id = messages[-1].id if messages else after_id
+                if last_id >= self._published.get(thread_id, 0):
+                    self._published.pop(thread_id, None)
+                self._deliver(thread_id, messages)
+                if len(messages) < self.page_size and thread_id not in self._refetch:
+                    break
+        except Exception:
+            # Cursors haven't moved, so the next publish picks these up.
+            logger.exception("Failed to push messages of thread %s", thread_id)
+        finally:
+            del self._fetching[thread_id]
+
+    def _deliver(self, thread_id: int, messages: list[MessageRow]) -> None:
+        if not messages:
+            return
+        for connection in self._threads.get(thread_id, ()):
+            cursor = connection.cursors[thread_id]
+            new = [message for message in messages if message.id > cursor]
+            if not new:
+                continue
+            connection.cursors[thread_id] = new[-1].id
+            connection.push(
+                {
+                    "type": "messages",
+                    "thread_id": thread_id,
+                    "messages": [message._asdict() for message in new],
+                    "last_message_id": new[-1].id,
+                }
+            )
+
+
+async def serve_connection(
+    connection: GatewayConnection, hub: ConnectionHub, message_service: MessageService
+) -> None:
+    """Read client frames until the socket closes.
+
+    Frames are JSON objects: ``subscribe`` (``thread_id``, optional
+    ``after``), ``unsubscribe`` and ``send`` (``thread_id``, ``content``),
+    each with an optional ``ref`` echoed in the reply. The server sends
+    JSON arrays of events: ``messages``, ``subscribed``, ``unsubscribed``,
+    ``sent`` and ``error``.
+    """
+    websocket = connection.websocket
+    user_id = connection.principal.id
+    while not connection.closed:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+        try:
+            frame = client_frame_adapter.validate_json(
+                message.get("text") or message.get("bytes") or b""
+            )
+        except ValidationError as error:
+            connection.push(
+                {
+                    "type": "error",
+                    "status": status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    "detail": error.errors(
+                        include_url=False, include_context=False, include_input=False
+                    ),
+                }
+            )
+            continue
+
+        try:
+            if isinstance(frame, SubscribeFrame):
+                if (
+                    frame.thread_id not in connection.cursors
+                    and len(connection.cursors) >= hub.max_threads_per_connection
+                ):
+                    raise HTTPException(
+                        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                        detail="Too many threads on this connection",
+                    )
+                after_id = await message_service.subscribe(user_id, frame.thread_id, frame.after)
+                hub.subscribe(connection, frame.thread_id, after_id)
+                connection.push(
+                    {"type": "subscribed", "ref": frame.ref, "thread_id": frame.thread_id}
+                )
+            elif isinstance(frame, UnsubscribeFrame):
+                hub.unsubscribe(connection, frame.thread_id)
+                connection.push(
+                    {"type": "unsubscribed", "ref": frame.ref, "thread_id": frame.thread_id}
+                )
+            elif isinstance(frame, SendFrame):
+                sent = await message_service.send_message(
+                    user_id, frame.thread_id, frame.content
+                )
+                connection.push({"type": "sent", "ref": frame.ref, "id": sent.id})
+        except HTTPException as error:
+            connection.push(
+                {
+                    "type": "error",
+                    "ref": frame.ref,
+                    "status": error.status_code,
+                    "detail": error.detail,
+                }
+            )
+
+
+@lru_cache(maxsize=1)
+def get_connection_hub() -> ConnectionHub:
+    messages = get_settings().messages
+    hub = ConnectionHub(
+        lambda: MessageRepository(LazySession()),
+        max_connections=messages.ws_max_connections,
+        max_threads_per_connection=messages.ws_max_threads_per_connection,
+        send_queue_size=messages.ws_send_queue_size,
+        send_timeout_secs=messages.ws_send_timeout_secs,
+        batch_window_secs=messages.ws_batch_window_secs,
+        page_size=messages.page_size,
+    )
+    get_message_fanout().subscribe(hub)
+    return hub
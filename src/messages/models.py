@@ -0,0 +1,35 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, Text, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.core.database import BaseModel
+
+
+class MessageThread(BaseModel):
+    __tablename__ = "message_threads"
+    __table_args__ = (UniqueConstraint("listing_id", "tenant_id"),)
+
+    listing_id: Mapped[int] = mapped_column(ForeignKey("listings.id"), nullable=False)
+    tenant_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
+    landlord_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
+
+    def __repr__(self) -> str:
+        return f"MessageThread(id={self.id}, listing_id={self.listing_id})"
+
+
+class Message(BaseModel):
+    __tablename__ = "messages"
+    __table_args__ = (
+        # Polls read "messages of this thread after id N", and the watermark
+        # seed reads the newest id of a thread; both are ranges of this index.
+        Index("ix_messages_thread_id_id", "thread_id", "id"),
+    )
+
+    thread_id: Mapped[int] = mapped_column(ForeignKey("message_threads.id"), nullable=False)
+    sender_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+    read_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"Message(id={self.id}, thread_id={self.thread_id})"
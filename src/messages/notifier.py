@@ -0,0 +1,93 @@
+import asyncio
+from dataclasses import dataclass
+from functools import lru_cache
+
+from src.config import get_settings
+from src.core.cache import CacheStats, TTLCache
+from src.core.metrics import gauge_field
+
+
+@dataclass
+class NotifierStats:
+    parked: int = gauge_field()
+    wakeups: int = 0
+    timeouts: int = 0
+    published: int = 0
+
+
+class ThreadNotifier:
+    """Per-worker "newest message id" watermark per thread, and the long
+    polls parked on it.
+
+    The fan-out backend calls ``publish()`` for every committed message,
+    in every worker. A poll whose ``after`` is at or past the watermark
+    has nothing new, so it can be answered or parked without touching the
+    database; ``wait()`` holds no connection, just a future. Watermarks
+    expire after ``ttl_secs`` as a backstop, and while the fan-out is down
+    (``live`` is False) none are kept, so every poll queries.
+    """
+
+    def __init__(self, max_threads: int, ttl_secs: float) -> None:
+        self._watermarks: TTLCache[int, int] = TTLCache(max_threads, ttl_secs)
+        self._waiters: dict[int, set[asyncio.Future[None]]] = {}
+        self.stats = NotifierStats()
+        self.live = True
+
+    @property
+    def watermark_stats(self) -> CacheStats:
+        return self._watermarks.stats
+
+    @property
+    def watermark_count(self) -> int:
+        return len(self._watermarks)
+
+    def watermark(self, thread_id: int) -> int | None:
+        return self._watermarks.get(thread_id)
+
+    def observe(self, thread_id: int, message_id: int) -> None:
+        """Record a message id seen in the database (no wakeups)."""
+        if self.live and message_id > (self._watermarks.get(thread_id) or 0):
+            self._watermarks.set(thread_id, message_id)
+
+    def publish(self, thread_id: int, message_id: int) -> None:
+        self.stats.published += 1
+        self.observe(thread_id, message_id)
+        for waiter in self._waiters.pop(thread_id, ()):
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def set_live(self, live: bool) -> None:
+        """Called by the fan-out as it loses or regains its feed; notifications
+        may have been missed either way, so every watermark is dropped.
+        """
+        self.live = live
+        self._watermarks.clear()
+
+    async def wait(self, thread_id: int, after_id: int, timeout_secs: float) -> bool:
+        """Park until a message newer than ``after_id`` is published; False on timeout."""
+        watermark = self._watermarks.get(thread_id)
+        if watermark is not None and watermark > after_id:
+            return True
+
+        waiter = asyncio.get_running_loop().create_future()
+        waiters = self._waiters.setdefault(thread_id, set())
+        waiters.add(waiter)
+        self.stats.parked += 1
+        try:
+            await asyncio.wait_for(waiter, timeout_secs)
+        except asyncio.TimeoutError:
+            self.stats.timeouts += 1
+            return False
+        finally:
+            self.stats.parked -= 1
+            waiters.discard(waiter)
+            if not waiters and self._waiters.get(thread_id) is waiters:
+                del self._waiters[thread_id]
+        self.stats.wakeups += 1
+        return True
+
+
+@lru_cache(maxsize=1)
+def get_thread_notifier() -> ThreadNotifier:
+    messages = get_settings().messages
+    return ThreadNotifier(messages.watermark_max_threads, messages.watermark_ttl_secs)
@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import NamedTuple
+
+
+class ThreadParticipants(NamedTuple):
+    id: int
+    tenant_id: int
+    landlord_id: int
+
+
+class MessageRow(NamedTuple):
+    id: int
+    sender_id: int
+    content: str
+    created_at: datetime
+
+
+class ThreadUpdate(NamedTuple):
+    thread: ThreadParticipants
+    messages: list[MessageRow]
+    last_message_id: int | None
@@ -0,0 +1,152 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from typing_extensions import override
+
+from src.core.database.session import LazySession
+from src.listings.models import Listing
+from src.messages.models import Message, MessageThread
+from src.messages.projections import MessageRow, ThreadParticipants
+
+_PARTICIPANTS_BY_ID = select(
+    MessageThread.id, MessageThread.tenant_id, MessageThread.landlord_id
+).where(MessageThread.id == bindparam("thread_id"))
+_LISTING_LANDLORD = select(Listing.landlord_id).where(Listing.id == bindparam("listing_id"))
+_LAST_MESSAGE_ID = select(func.max(Message.id)).where(
+    Message.thread_id == bindparam("thread_id")
+)
+_MESSAGE_COLUMNS = (Message.id, Message.sender_id, Message.content, Message.created_at)
+
+
+class UnknownParticipantError(Exception):
+    """Raised when a thread is started with a user that doesn't exist."""
+
+
+class AbstractMessageRepository(ABC):
+    @abstractmethod
+    async def get_thread_participants(self, thread_id: int) -> ThreadParticipants | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_listing_landlord(self, listing_id: int) -> int | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_or_create_thread(
+        self, listing_id: int, tenant_id: int, landlord_id: int
+    ) -> ThreadParticipants:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def create_message(
+        self, thread_id: int, sender_id: int, content: str, notify_channel: str | None = None
+    ) -> MessageRow:
+        """Insert a message; with ``notify_channel``, send ``"thread_id:message_id"``
+        on it as part of the same transaction, so it goes out exactly when the
+        message is committed."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_messages(
+        self,
+        thread_id: int,
+        after_id: int | None = None,
+        since: datetime | None = None,
+        limit: int = 100,
+        primary: bool = False,
+    ) -> list[MessageRow]:
+        """Oldest first, strictly after ``after_id`` and at or after ``since``."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_last_message_id(self, thread_id: int) -> int | None:
+        raise NotImplementedError
+
+
+class MessageRepository(AbstractMessageRepository):
+    def __init__(self, session: LazySession):
+        self.session = session
+
+    @override
+    async def get_thread_participants(self, thread_id: int) -> ThreadParticipants | None:
+        async with self.session.unit_of_work(read_only=True) as session:
+            row = (await session.execute(_PARTICIPANTS_BY_ID, {"thread_id": thread_id})).first()
+        return ThreadParticipants._make(row) if row is not None else None
+
+    @override
+    async def get_listing_landlord(self, listing_id: int) -> int | None:
+        async with self.session.unit_of_work(read_only=True) as session:
+            return (
+                await session.execute(_LISTING_LANDLORD, {"listing_id": listing_id})
+            ).scalar_one_or_none()
+
+    @override
+    async def get_or_create_thread(
+        self, listing_id: int, tenant_id: int, landlord_id: int
+    ) -> ThreadParticipants:
+        statement = (
+            insert(MessageThread)
+            .values(listing_id=listing_id, tenant_id=tenant_id, landlord_id=landlord_id)
+            # A no-op update so RETURNING also yields the existing thread.
+            .on_conflict_do_update(
+                index_elements=[MessageThread.listing_id, MessageThread.tenant_id],
+                set_={"listing_id": listing_id},
+            )
+            .returning(MessageThread.id, MessageThread.tenant_id, MessageThread.landlord_id)
+        )
+        try:
+            async with self.session.unit_of_work() as session:
+                row = (await session.execute(statement)).one()
+                await session.commit()
+        except IntegrityError as exc:
+            # The landlord comes from the listing, so it's the tenant that
+            # doesn't exist (or the listing was deleted meanwhile).
+            raise UnknownParticipantError(tenant_id) from exc
+        return ThreadParticipants._make(row)
+
+    @override
+    async def create_message(
+        self, thread_id: int, sender_id: int, content: str, notify_channel: str | None = None
+    ) -> MessageRow:
+        statement = (
+            insert(Message)
+            .values(thread_id=thread_id, sender_id=sender_id, content=content)
+            .returning(*_MESSAGE_COLUMNS)
+        )
+        async with self.session.unit_of_work() as session:
+            row = (await session.execute(statement)).one()
+            if notify_channel is not None:
+                await session.execute(
+                    select(func.pg_notify(notify_channel, f"{thread_id}:{row.id}"))
+                )
+            await session.commit()
+        return MessageRow._make(row)
+
+    @override
+    async def get_messages(
+        self,
+        thread_id: int,
+        after_id: int | None = None,
+        since: datetime | None = None,
+        limit: int = 100,
+        primary: bool = False,
+    ) -> list[MessageRow]:
+        statement = select(*_MESSAGE_COLUMNS).where(Message.thread_id == thread_id)
+        if after_id is not None:
+            statement = statement.where(Message.id > after_id)
+        if since is not None:
+            statement = statement.where(Message.created_at >= since)
+        statement = statement.order_by(Message.id).limit(limit)
+        async with self.session.unit_of_work(read_only=True, primary=primary) as session:
+            result = await session.execute(statement)
+            return [MessageRow._make(row) for row in result]
+
+    @override
+    async def get_last_message_id(self, thread_id: int) -> int | None:
+        async with self.session.unit_of_work(read_only=True) as session:
+            return (
+                await session.execute(_LAST_MESSAGE_ID, {"thread_id": thread_id})
+            ).scalar_one()
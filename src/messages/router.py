@@ -0,0 +1,97 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, status
+
+from src.core.responses import RawJSONResponse
+from src.messages.dependencies import get_message_service
+from src.messages.gateway import (
+    WS_TRY_AGAIN_LATER,
+    ConnectionHub,
+    GatewayConnection,
+    get_connection_hub,
+    serve_connection,
+)
+from src.messages.schemas import (
+    MessageCreate,
+    MessageCreated,
+    ThreadCreate,
+    ThreadCreated,
+    ThreadMessages,
+)
+from src.messages.serializers import dump_thread_update
+from src.messages.service import MessageService
+from src.users.auth.services.token_service import TokenService, TokenValidationError
+from src.users.dependencies import get_current_user, get_user_service
+from src.users.projections import AuthPrincipal
+from src.users.service import UserService
+
+messages_router = APIRouter(prefix="/messages", tags=["Messages"])
+
+
+@messages_router.post("/threads", response_model=ThreadCreated)
+async def start_thread(
+    thread_data: ThreadCreate,
+    user: AuthPrincipal = Depends(get_current_user),
+    message_service: MessageService = Depends(get_message_service),
+):
+    thread = await message_service.start_thread(
+        user.id, thread_data.listing_id, thread_data.participant_id
+    )
+    return ThreadCreated(thread_id=thread.id)
+
+
+@messages_router.post("", response_model=MessageCreated, status_code=status.HTTP_201_CREATED)
+async def send_message(
+    message_data: MessageCreate,
+    user: AuthPrincipal = Depends(get_current_user),
+    message_service: MessageService = Depends(get_message_service),
+):
+    message = await message_service.send_message(
+        user.id, message_data.thread_id, message_data.content
+    )
+    return MessageCreated(id=message.id)
+
+
+@messages_router.get("/threads/{thread_id}", response_model=ThreadMessages)
+async def poll_thread(
+    thread_id: int,
+    since: datetime | None = None,
+    after: int | None = Query(None, ge=0, description="last_message_id of the previous poll"),
+    wait: float = Query(0.0, ge=0, description="Seconds to hold the request open (needs after)"),
+    user: AuthPrincipal = Depends(get_current_user),
+    message_service: MessageService = Depends(get_message_service),
+):
+    update = await message_service.poll(user.id, thread_id, after, since, wait)
+    return RawJSONResponse(dump_thread_update(update))
+
+
+@messages_router.websocket("/ws")
+async def message_gateway(
+    websocket: WebSocket,
+    token: str | None = None,
+    user_service: UserService = Depends(get_user_service),
+    message_service: MessageService = Depends(get_message_service),
+    hub: ConnectionHub = Depends(get_connection_hub),
+):
+    # Browsers can't set headers on a WebSocket, so ``?token=`` works too.
+    scheme, _, credentials = websocket.headers.get("authorization", "").partition(" ")
+    token = token or (credentials if scheme.lower() == "bearer" else None)
+    try:
+        if not token:
+            raise TokenValidationError("Missing access token")
+        claims = TokenService().decode(token)
+        principal = await user_service.authenticate_claims(claims)
+    except (TokenValidationError, HTTPException):
+        await websocket.close(status.WS_1008_POLICY_VIOLATION)
+        return
+
+    connection = GatewayConnection(websocket, principal, hub)
+    if not hub.register(connection):
+        await websocket.close(WS_TRY_AGAIN_LATER, "Too many connections")
+        return
+    try:
+        await websocket.accept()
+        connection.expire_at(claims["exp"])
+        await serve_connection(connection, hub, message_service)
+    finally:
+        hub.unregister(connection)
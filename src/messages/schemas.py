@@ -0,0 +1,64 @@
+from datetime import datetime
+from typing import Annotated, Literal
+
+from pydantic import BaseModel, Field, TypeAdapter
+
+
+class ThreadCreate(BaseModel):
+    listing_id: int
+    participant_id: int
+
+
+class ThreadCreated(BaseModel):
+    thread_id: int
+
+
+class MessageCreate(BaseModel):
+    thread_id: int
+    content: str = Field(min_length=1, max_length=5000)
+
+
+class MessageCreated(BaseModel):
+    id: int
+
+
+class MessagePublic(BaseModel):
+    id: int
+    sender_id: int
+    content: str
+    created_at: datetime
+
+
+class ThreadMessages(BaseModel):
+    thread_id: int
+    participants: list[int]
+    messages: list[MessagePublic]
+    # Pass back as ``after`` on the next poll.
+    last_message_id: int | None = None
+
+
+class SubscribeFrame(BaseModel):
+    type: Literal["subscribe"]
+    thread_id: int
+    # Last message id the client has; None pushes only what is sent from now on.
+    after: int | None = Field(None, ge=0)
+    ref: str | None = None
+
+
+class UnsubscribeFrame(BaseModel):
+    type: Literal["unsubscribe"]
+    thread_id: int
+    ref: str | None = None
+
+
+class SendFrame(BaseModel):
+    type: Literal["send"]
+    thread_id: int
+    content: str = Field(min_length=1, max_length=5000)
+    ref: str | None = None
+
+
+ClientFrame = Annotated[
+    SubscribeFrame | UnsubscribeFrame | SendFrame, Field(discriminator="type")
+]
+client_frame_adapter: TypeAdapter[ClientFrame] = TypeAdapter(ClientFrame)
@@ -0,0 +1,20 @@
+from pydantic import TypeAdapter
+
+from src.messages.projections import ThreadUpdate
+from src.messages.schemas import MessagePublic, ThreadMessages
+
+thread_messages_adapter = TypeAdapter(ThreadMessages)
+
+
+def dump_thread_update(update: ThreadUpdate) -> bytes:
+    return thread_messages_adapter.dump_json(
+        ThreadMessages.model_construct(
+            thread_id=update.thread.id,
+            participants=[update.thread.tenant_id, update.thread.landlord_id],
+            messages=[
+                MessagePublic.model_construct(**message._asdict())
+                for message in update.messages
+            ],
+            last_message_id=update.last_message_id,
+        )
+    )
@@ -0,0 +1,183 @@
+from datetime import datetime
+
+from fastapi import HTTPException, status
+
+from src.config import get_settings
+from src.messages.cache import ParticipantsCache, get_participants_cache
+from src.messages.fanout import MessageFanout, get_message_fanout
+from src.messages.notifier import ThreadNotifier, get_thread_notifier
+from src.messages.projections import MessageRow, ThreadParticipants, ThreadUpdate
+from src.messages.repository import AbstractMessageRepository, UnknownParticipantError
+
+
+class MessageService:
+    def __init__(
+        self,
+        message_repository: AbstractMessageRepository,
+        notifier: ThreadNotifier | None = None,
+        fanout: MessageFanout | None = None,
+        participants_cache: ParticipantsCache | None = None,
+    ) -> None:
+        self.message_repository = message_repository
+        self._notifier = notifier or get_thread_notifier()
+        self._fanout = fanout or get_message_fanout()
+        self._participants = (
+            participants_cache if participants_cache is not None else get_participants_cache()
+        )
+        self._settings = get_settings().messages
+
+    async def start_thread(
+        self, user_id: int, listing_id: int, participant_id: int
+    ) -> ThreadParticipants:
+        landlord_id = await self.message_repository.get_listing_landlord(listing_id)
+        if landlord_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Listing not found"
+            )
+        if user_id == landlord_id:
+            tenant_id = participant_id
+        elif participant_id == landlord_id:
+            tenant_id = user_id
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="A thread is between the listing's landlord and one tenant",
+            )
+        if tenant_id == landlord_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cannot start a thread with yourself",
+            )
+        try:
+            thread = await self.message_repository.get_or_create_thread(
+                listing_id, tenant_id, landlord_id
+            )
+        except UnknownParticipantError:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Participant not found"
+            ) from None
+        self._participants.set(thread.id, thread)
+        return thread
+
+    async def send_message(self, user_id: int, thread_id: int, content: str) -> MessageRow:
+        await self._get_thread(thread_id, user_id)
+        message = await self.message_repository.create_message(
+            thread_id, user_id, content, notify_channel=self._fanout.notify_channel
+        )
+        await self._fanout.publish(thread_id, message.id)
+        return message
+
+    async def poll(
+        self,
+        user_id: int,
+        thread_id: int,
+        after_id: int | None = None,
+        since: datetime | None = None,
+        wait_secs: float = 0.0,
+    ) -> ThreadUpdate:
+        """Messages of the thread after ``after_id`` (and from ``since``).
+
+        With ``wait_secs`` and ``after_id``, a poll with nothing new parks
+        until a message is published or the wait runs out. Whether there is
+        anything new comes from the in-memory watermark, so idle polls,
+        parked or not, don't query; the session only opens a connection to
+        read actual messages.
+        """
+        thread = await self._get_thread(thread_id, user_id)
+        if after_id is None:
+            messages = await self._fetch(thread_id, None, since)
+            last_id = messages[-1].id if messages else await self._watermark(thread_id)
+            return ThreadUpdate(thread, messages, last_id or None)
+
+        wait_secs = min(wait_secs, self._settings.long_poll_max_secs)
+        if not self._notifier.live:
+            wait_secs = min(wait_secs, self._settings.degraded_wait_secs)
+
+        if await self._has_news(thread_id, after_id):
+            messages = await self._fetch_news(thread_id, after_id, since)
+            if messages or wait_secs <= 0:
+                return self._update(thread, messages, after_id)
+        elif wait_secs <= 0:
+            return ThreadUpdate(thread, [], after_id)
+
+        if not await self._notifier.wait(thread_id, after_id, wait_secs):
+            return ThreadUpdate(thread, [], after_id)
+        return self._update(
+            thread, await self._fetch_news(thread_id, after_id, since), after_id
+        )
+
+    async def subscribe(self, user_id: int, thread_id: int, after_id: int | None) -> int:
+        """Check access to a thread and return the id to push messages after."""
+        await self._get_thread(thread_id, user_id)
+        if after_id is not None:
+            return after_id
+        last_id = await self._watermark(thread_id)
+        if last_id is None:
+            last_id = await self.message_repository.get_last_message_id(thread_id)
+        return last_id or 0
+
+    async def _get_thread(self, thread_id: int, user_id: int) -> ThreadParticipants:
+        thread = self._participants.get(thread_id)
+        if thread is None:
+            thread = await self.message_repository.get_thread_participants(thread_id)
+            if thread is not None:
+                self._participants.set(thread_id, thread)
+        if thread is None or user_id not in (thread.tenant_id, thread.landlord_id):
+            # Same answer for threads that exist but aren't the caller's.
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Thread not found"
+            )
+        return thread
+
+    async def _watermark(self, thread_id: int) -> int | None:
+        watermark = self._notifier.watermark(thread_id)
+        if watermark is None and self._notifier.live:
+            watermark = await self.message_repository.get_last_message_id(thread_id) or 0
+            self._notifier.observe(thread_id, watermark)
+        return watermark
+
+    async def _has_news(self, thread_id: int, after_id: int) -> bool:
+        watermark = await self._watermark(thread_id)
+        # No watermark means the fan-out is down; only the database knows.
+        return watermark is None or watermark > after_id
+
+    async def _fetch_news(
+        self, thread_id: int, after_id: int, since: datetime | None
+    ) -> list[MessageRow]:
+        """Like ``_fetch``, after the watermark said there is something new.
+
+        A notified message was committed on the primary; a replica that
+        hasn't replayed it yet would answer with nothing (or too little), so
+        then the read is repeated on the primary.
+        """
+        messages = await self._fetch(thread_id, after_id, since)
+        watermark = self._notifier.watermark(thread_id)
+        last_id = messages[-1].id if messages else after_id
+        if (
+            watermark is not None
+            and last_id < watermark
+            and len(messages) < self._settings.page_size
+        ):
+            messages = await self._fetch(thread_id, after_id, since, primary=True)
+        return messages
+
+    async def _fetch(
+        self,
+        thread_id: int,
+        after_id: int | None,
+        since: datetime | None,
+        primary: bool = False,
+    ) -> list[MessageRow]:
+        messages = await self.message_repository.get_messages(
+            thread_id, after_id, since, self._settings.page_size, primary=primary
+        )
+        if messages and len(messages) < self._settings.page_size:
+            # Read up to the newest message, so this is the thread's watermark.
+            self._notifier.observe(thread_id, messages[-1].id)
+        return messages
+
+    @staticmethod
+    def _update(
+        thread: ThreadParticipants, messages: list[MessageRow], after_id: int
+    ) -> ThreadUpdate:
+        return ThreadUpdate(thread, messages, messages[-1].id if messages else after_id)
@@ -0,0 +1,142 @@
+import hmac
+from functools import lru_cache
+from ipaddress import IPv4Network, IPv6Network, ip_address, ip_network
+from typing import Iterable
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import PlainTextResponse
+
+from src.config import get_settings
+from src.core.database.pool import pool_stats, pool_status
+from src.core.database.session import database_created, get_database
+from src.core.metrics import Sample, registry, stats_samples
+from src.listings.cache import get_listing_search_cache
+from src.messages.cache import get_participants_cache
+from src.messages.gateway import get_connection_hub
+from src.messages.notifier import get_thread_notifier
+from src.users.auth.dependencies import (
+    get_login_admission,
+    get_registration_admission,
+    get_trusted_proxies,
+)
+from src.users.auth.revocation import get_revocation_list
+from src.users.auth.services.password_service import get_password_executor
+from src.users.auth.services.token_verifier import get_token_verifier
+from src.users.cache import get_user_cache
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+metrics_router = APIRouter()
+
+
+@lru_cache(maxsize=1)
+def get_metrics_networks() -> list[IPv4Network | IPv6Network]:
+    return [ip_network(network) for network in get_settings().metrics.allowed_networks]
+
+
+def require_metrics_access(request: Request) -> None:
+    bearer_token = get_settings().metrics.bearer_token
+    if bearer_token is not None:
+        scheme, _, credentials = request.headers.get("authorization", "").partition(" ")
+        if scheme.lower() == "bearer" and hmac.compare_digest(
+            credentials.encode(), bearer_token.get_secret_value().encode()
+        ):
+            return
+    client_ip = get_trusted_proxies().client_ip(
+        request.client.host if request.client else None,
+        request.headers.get("x-forwarded-for"),
+    )
+    try:
+        address = ip_address(client_ip) if client_ip else None
+    except ValueError:
+        address = None
+    if address is None or not any(address in network for network in get_metrics_networks()):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+
+
+@metrics_router.get(
+    "/metrics", include_in_schema=False, dependencies=[Depends(require_metrics_access)]
+)
+async def metrics() -> PlainTextResponse:
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+def _pool_samples() -> Iterable[Sample]:
+    if not database_created():
+        return
+    database = get_database()
+    engines = {"primary": database.primary}
+    engines.update({f"replica{i}": engine for i, engine in enumerate(database.replicas)})
+    for name, engine in engines.items():
+        labels = {"engine": name}
+        for key, value in pool_status(engine).items():
+            yield Sample(f"db_pool_{key}", "Connection pool state.", labels, value)
+        stats = pool_stats(engine)
+        if stats is not None:
+            yield from stats_samples("db_pool", "Connection pool stats.", stats, labels)
+
+
+def _executor_samples() -> Iterable[Sample]:
+    yield from stats_samples(
+        "password_executor", "bcrypt worker pool stats.", get_password_executor().stats
+    )
+
+
+def _admission_samples() -> Iterable[Sample]:
+    for controller in (get_login_admission(), get_registration_admission()):
+        yield from stats_samples(
+            "admission",
+            "Admission control stats per endpoint.",
+            controller.stats,
+            {"controller": controller.name},
+        )
+
+
+def _cache_samples() -> Iterable[Sample]:
+    user_cache, token_verifier = get_user_cache(), get_token_verifier()
+    search_backend = get_listing_search_cache().backend
+    notifier, participants_cache = get_thread_notifier(), get_participants_cache()
+    caches = {
+        "user": (user_cache.stats, len(user_cache)),
+        "token": (token_verifier.cache_stats, token_verifier.cache_size),
+        "listing_search": (search_backend.stats, len(search_backend)),
+        "message_watermark": (notifier.watermark_stats, notifier.watermark_count),
+        "message_participants": (participants_cache.stats, len(participants_cache)),
+    }
+    for name, (stats, size) in caches.items():
+        labels = {"cache": name}
+        yield from stats_samples("cache", "In-process cache stats.", stats, labels)
+        yield Sample("cache_entries", "Entries currently cached.", labels, size)
+        yield Sample(
+            "cache_hit_ratio", "Hits over lookups since the worker started.", labels, stats.hit_rate
+        )
+    yield Sample(
+        "revocation_list_entries",
+        "Users with revoked token versions known to this worker.",
+        {},
+        len(get_revocation_list()),
+    )
+
+
+def _message_samples() -> Iterable[Sample]:
+    notifier = get_thread_notifier()
+    yield from stats_samples("message_long_poll", "Message long-poll stats.", notifier.stats)
+    yield Sample(
+        "message_fanout_live",
+        "1 while this worker receives message notifications from other workers.",
+        {},
+        int(notifier.live),
+    )
+    yield from stats_samples(
+        "message_gateway", "Message WebSocket gateway stats.", get_connection_hub().stats
+    )
+
+
+for _collector in (
+    _pool_samples,
+    _executor_samples,
+    _admission_samples,
+    _cache_samples,
+    _message_samples,
+):
+    registry.register_collector(_collector)
@@ -0,0 +1,72 @@
+import asyncio
+import os
+import time
+from functools import lru_cache
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from src.config import get_settings
+from src.core.profiling import SamplingProfiler
+from src.users.dependencies import get_current_admin, get_user_service
+from src.users.service import UserService
+
+profiling_router = APIRouter(prefix="/debug", tags=["Debug"], include_in_schema=False)
+
+_capture_lock = asyncio.Lock()
+
+
+@lru_cache(maxsize=1)
+def get_profiler() -> SamplingProfiler:
+    profiling = get_settings().profiling
+    buffer_secs = max(profiling.buffer_secs, profiling.max_duration_secs)
+    return SamplingProfiler(
+        interval_secs=profiling.sample_interval_secs,
+        max_samples=int(buffer_secs / profiling.sample_interval_secs),
+    )
+
+
+async def require_profiling_access(
+    credentials: HTTPAuthorizationCredentials | None = Depends(
+        HTTPBearer(auto_error=False)
+    ),
+    user_service: UserService = Depends(get_user_service),
+) -> None:
+    if get_settings().debug:
+        return
+    if credentials is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated"
+        )
+    await get_current_admin(await user_service.authenticate(credentials))
+
+
+@profiling_router.get(
+    "/profile",
+    response_class=PlainTextResponse,
+    dependencies=[Depends(require_profiling_access)],
+)
+async def capture_profile(seconds: float = Query(10.0, gt=0)) -> PlainTextResponse:
+    """Sample this worker's event loop thread for ``seconds`` and return collapsed stacks."""
+    if _capture_lock.locked():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A profile is already being captured on this worker",
+        )
+    seconds = min(seconds, get_settings().profiling.max_duration_secs)
+    profiler = get_profiler()
+    async with _capture_lock:
+        started = time.monotonic()
+        profiler.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            profiler.stop()
+        collapsed = profiler.collapsed(started)
+
+    filename = f"profile-{os.getpid()}-{int(time.time())}.collapsed"
+    return PlainTextResponse(
+        collapsed,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -2,8 +2,10 @@ from fastapi import APIRouter
 
 router = APIRouter(prefix="/api/v1")
 
-from src.users.auth import router as auth_router
-from src.users.router import router as users_router
+from src.listings.router import listings_router
+from src.messages.router import messages_router
+from src.users.router import users_router
 
-router.include_router(auth_router)
-router.include_router(users_router)
\ No newline at end of file
+router.include_router(users_router)
+router.include_router(listings_router)
+router.include_router(messages_router)
@@ -0,0 +1,82 @@
+"""Pick the bcrypt cost for this host from a per-hash latency budget.
+
+Usage: ``python -m src.users.auth.calibration [--budget-ms 250]``
+
+Prints the highest cost whose hash time fits the budget, to be pinned as
+``SECURITY__PASSWORD_BCRYPT_ROUNDS``. Run it once on the production
+hardware so every worker hashes at the same cost and starts without
+spending seconds measuring.
+"""
+import argparse
+import statistics
+import time
+from dataclasses import dataclass
+
+from src.users.auth.services.password_service import bcrypt_hash
+
+_CALIBRATION_PASSWORD = b"calibration-password"
+
+
+@dataclass
+class CalibrationResult:
+    rounds: int
+    secs_per_hash: float
+    budget_secs: float
+
+    @property
+    def within_budget(self) -> bool:
+        return self.secs_per_hash <= self.budget_secs
+
+
+def _time_hash(rounds: int, samples: int) -> float:
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        bcrypt_hash(_CALIBRATION_PASSWORD, rounds)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def calibrate_bcrypt_rounds(
+    budget_secs: float, min_rounds: int = 4, max_rounds: int = 20, samples: int = 3
+) -> CalibrationResult:
+    """Highest cost in ``[min_rounds, max_rounds]`` whose median hash time fits the budget.
+
+    Each extra round doubles the work, so rounds are only measured while the
+    previous one took at most half the budget; the whole run costs roughly
+    ``2 * samples * budget_secs``. Never goes below ``min_rounds``, even on a
+    host too slow to meet the budget there.
+    """
+    rounds = min_rounds
+    secs = _time_hash(rounds, samples)
+    while rounds < max_rounds and secs * 2 <= budget_secs:
+        next_secs = _time_hash(rounds + 1, samples)
+        if next_secs > budget_secs:
+            break
+        rounds, secs = rounds + 1, next_secs
+    return CalibrationResult(rounds, secs, budget_secs)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Calibrate the bcrypt cost for this host.")
+    parser.add_argument("--budget-ms", type=float, default=250.0)
+    parser.add_argument("--min-rounds", type=int, default=10)
+    parser.add_argument("--max-rounds", type=int, default=16)
+    parser.add_argument("--samples", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    result = calibrate_bcrypt_rounds(
+        args.budget_ms / 1000, args.min_rounds, args.max_rounds, args.samples
+    )
+    print(
+        f"cost {result.rounds}: {result.secs_per_hash * 1000:.1f} ms per hash "
+        f"(budget {args.budget_ms:.0f} ms)"
+    )
+    if not result.within_budget:
+        print(f"warning: even the minimum cost {args.min_rounds} is over budget")
+    print(f"SECURITY__PASSWORD_BCRYPT_ROUNDS={result.rounds}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
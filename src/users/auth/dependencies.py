@@ -1,5 +1,9 @@
+from functools import lru_cache
+
 from fastapi import Depends
 
+from src.config import get_settings
+from src.core.admission import AdmissionController, KeyedTokenBuckets, TrustedProxies
 from src.users.auth.services.login_service import LoginService
 from src.users.auth.services.registration_service import RegistrationService
 from src.users.auth.services.refresh_service import RefreshService
@@ -24,3 +28,40 @@ async def get_refresh_service(
     user_repository: UserRepository = Depends(get_user_repository),
 ) -> RefreshService:
     return RefreshService(user_repository, TokenService())
+
+
+def _build_admission_controller(name: str) -> AdmissionController:
+    security = get_settings().security
+    return AdmissionController(
+        name=name,
+        max_in_flight=security.auth_max_in_flight,
+        max_queue=security.auth_max_queue,
+        queue_timeout_secs=security.auth_queue_timeout_secs,
+        buckets={
+            "ip": KeyedTokenBuckets(
+                security.auth_ip_rate_per_sec,
+                security.auth_ip_burst,
+                security.auth_rate_limit_max_keys,
+            ),
+            "email": KeyedTokenBuckets(
+                security.auth_email_rate_per_sec,
+                security.auth_email_burst,
+                security.auth_rate_limit_max_keys,
+            ),
+        },
+    )
+
+
+@lru_cache(maxsize=1)
+def get_login_admission() -> AdmissionController:
+    return _build_admission_controller("login")
+
+
+@lru_cache(maxsize=1)
+def get_registration_admission() -> AdmissionController:
+    return _build_admission_controller("register")
+
+
+@lru_cache(maxsize=1)
+def get_trusted_proxies() -> TrustedProxies:
+    return TrustedProxies(get_settings().security.trusted_proxies)
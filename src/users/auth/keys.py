@@ -0,0 +1,76 @@
+import hashlib
+import json
+import urllib.request
+from dataclasses import dataclass
+from typing import Any
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from jwt import PyJWKSet
+from jwt.algorithms import get_default_algorithms
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    kid: str
+    algorithm: str
+    private_key: Any
+    public_key: Any
+
+    def public_jwk(self) -> dict[str, Any]:
+        jwk = get_default_algorithms()[self.algorithm].to_jwk(
+            self.public_key, as_dict=True
+        )
+        return {**jwk, "kid": self.kid, "alg": self.algorithm, "use": "sig"}
+
+
+def load_signing_key(kid: str, private_key_pem: str) -> SigningKey:
+    private_key = serialization.load_pem_private_key(
+        private_key_pem.encode(), password=None
+    )
+    if isinstance(private_key, ed25519.Ed25519PrivateKey):
+        algorithm = "EdDSA"
+    elif isinstance(private_key, ec.EllipticCurvePrivateKey) and isinstance(
+        private_key.curve, ec.SECP256R1
+    ):
+        algorithm = "ES256"
+    else:
+        raise ValueError(f"Key {kid!r} must be an Ed25519 or P-256 private key")
+    return SigningKey(kid, algorithm, private_key, private_key.public_key())
+
+
+class KeySet:
+    """The signing keys of this service and their published JWKS document.
+
+    Every key verifies tokens and is published; only ``active_kid`` signs.
+    Rotation is: add the new key, wait for verifiers' JWKS caches to expire,
+    switch ``active_kid``, and drop the old key once its tokens have expired.
+    """
+
+    def __init__(self, keys: list[SigningKey], active_kid: str | None = None) -> None:
+        if not keys:
+            raise ValueError("KeySet needs at least one key")
+        self.keys = {key.kid: key for key in keys}
+        self.active = self.keys[active_kid] if active_kid else keys[0]
+        self.jwks = {"keys": [key.public_jwk() for key in keys]}
+        self.jwks_json = json.dumps(self.jwks, separators=(",", ":")).encode()
+        self.etag = f'"{hashlib.sha256(self.jwks_json).hexdigest()[:32]}"'
+
+    @property
+    def verification_keys(self) -> dict[str, tuple[str, Any]]:
+        return {kid: (key.algorithm, key.public_key) for kid, key in self.keys.items()}
+
+
+def keys_from_jwks(jwks: dict[str, Any]) -> dict[str, tuple[str, Any]]:
+    """Map ``kid`` to ``(algorithm, public key)`` for a JWKS document."""
+    return {
+        jwk.key_id: (jwk.algorithm_name, jwk.key)
+        for jwk in PyJWKSet.from_dict(jwks).keys
+        if jwk.key_id
+    }
+
+
+def fetch_jwks(url: str, timeout_secs: float = 5.0) -> dict[str, Any]:
+    """GET a JWKS document; blocking, for ``TokenVerifier(fetch_jwks=...)``."""
+    with urllib.request.urlopen(url, timeout=timeout_secs) as response:
+        return json.load(response)
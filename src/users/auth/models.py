@@ -18,6 +18,8 @@ class AccessTokenModel(BaseModel):
     exp: int
     iss: str
     jti: str
+    roles: list[str] | None = None
+    ver: int | None = None
 
 
 class RefreshTokenModel(BaseModel):
@@ -26,6 +28,8 @@ class RefreshTokenModel(BaseModel):
     exp: int
     iss: str
     type: str
+    jti: str
+    fam: str
 
 
 class TokenPairModel(BaseModel):
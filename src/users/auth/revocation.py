@@ -0,0 +1,62 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Callable
+
+from src.users.repository import AbstractUserRepository
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationList:
+    """User id -> minimum token version still accepted, kept per worker.
+
+    Access tokens carry the user's ``token_version`` at issue time; bans and
+    deactivations bump it in the database. Each worker pulls the bumps made
+    since its last refresh, so a revoked token stops working here after at
+    most one refresh interval (immediately in the worker that revoked it).
+    """
+
+    def __init__(self, overlap_secs: float = 5.0) -> None:
+        self._min_versions: dict[int, int] = {}
+        self._since = datetime.fromtimestamp(0, timezone.utc)
+        self._overlap = timedelta(seconds=overlap_secs)
+        self.refreshed_at: datetime | None = None
+
+    def is_revoked(self, user_id: int, token_version: int) -> bool:
+        return token_version < self._min_versions.get(user_id, 0)
+
+    def revoke(self, user_id: int, min_version: int) -> None:
+        if min_version > self._min_versions.get(user_id, 0):
+            self._min_versions[user_id] = min_version
+
+    async def refresh(self, user_repository: AbstractUserRepository) -> int:
+        rows = await user_repository.get_token_versions_since(self._since - self._overlap)
+        for user_id, token_version, updated_at in rows:
+            self.revoke(user_id, token_version)
+            if updated_at > self._since:
+                self._since = updated_at
+        self.refreshed_at = datetime.now(timezone.utc)
+        return len(rows)
+
+    def __len__(self) -> int:
+        return len(self._min_versions)
+
+
+@lru_cache(maxsize=1)
+def get_revocation_list() -> RevocationList:
+    return RevocationList()
+
+
+async def refresh_periodically(
+    revocation_list: RevocationList,
+    repository_factory: Callable[[], AbstractUserRepository],
+    interval_secs: float,
+) -> None:
+    while True:
+        try:
+            await revocation_list.refresh(repository_factory())
+        except Exception:
+            logger.exception("Failed to refresh the token revocation list")
+        await asyncio.sleep(interval_secs)
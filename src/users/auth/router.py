@@ -1,29 +1,64 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Request, Response, status
 
-from src.users.auth.dependencies import get_refresh_service, get_registration_service, get_login_service
-from src.users.auth.models import TokenPairModel, LoginModel, RegistrationModel, TokenRefreshRequestModel, \
-    TokenResponseSchema
+from src.config import get_settings
+from src.core.admission import AdmissionController
+from src.core.responses import RawJSONResponse, etag_matches
+from src.users.auth.dependencies import (
+    get_refresh_service,
+    get_registration_service,
+    get_login_service,
+    get_login_admission,
+    get_registration_admission,
+    get_trusted_proxies,
+)
+from src.users.auth.models import TokenPairModel, LoginModel, RegistrationModel, TokenRefreshRequestModel
 from src.users.auth.services.login_service import LoginService
 from src.users.auth.services.refresh_service import RefreshService
 from src.users.auth.services.registration_service import RegistrationService
+from src.users.auth.services.token_verifier import get_key_set
+from src.users.schemas import UserPublic
+from src.users.serializers import token_pair_response, user_public_response
 
 auth_router = APIRouter(prefix="/auth", tags=["Authentication"])
+jwks_router = APIRouter(tags=["Authentication"])
 
+_EMPTY_JWKS = b'{"keys":[]}'
+_EMPTY_JWKS_ETAG = '"empty"'
 
-@auth_router.post("/login", response_model=TokenResponseSchema)
+
+def _client_ip(request: Request) -> str | None:
+    return get_trusted_proxies().client_ip(
+        request.client.host if request.client else None,
+        request.headers.get("x-forwarded-for"),
+    )
+
+
+@auth_router.post("/login", response_model=TokenPairModel)
 async def login(
+    request: Request,
     login_data: LoginModel,
     login_service: LoginService = Depends(get_login_service),
+    admission: AdmissionController = Depends(get_login_admission),
 ):
-    return await login_service.login(login_data)
+    async with admission.admit(ip=_client_ip(request), email=login_data.email.lower()):
+        token_pair = await login_service.login(login_data.email, login_data.password)
+    return token_pair_response(token_pair)
 
 
-@auth_router.post("/register")
+@auth_router.post(
+    "/register", response_model=UserPublic, status_code=status.HTTP_201_CREATED
+)
 async def register(
+    request: Request,
     registration_data: RegistrationModel,
     registration_service: RegistrationService = Depends(get_registration_service),
+    admission: AdmissionController = Depends(get_registration_admission),
 ):
-    return await registration_service.register_user(registration_data)
+    async with admission.admit(
+        ip=_client_ip(request), email=registration_data.email.lower()
+    ):
+        user = await registration_service.register_user(registration_data)
+    return user_public_response(user, status_code=status.HTTP_201_CREATED)
 
 
 
@@ -32,4 +67,20 @@ async def refresh_tokens(
     refresh_data: TokenRefreshRequestModel,
     refresh_service: RefreshService = Depends(get_refresh_service),
 ):
-    return await refresh_service.refresh(refresh_data.refresh_token)
+    return token_pair_response(await refresh_service.refresh(refresh_data.refresh_token))
+
+
+@jwks_router.get("/.well-known/jwks.json")
+async def jwks(request: Request):
+    key_set = get_key_set()
+    body, etag = (
+        (key_set.jwks_json, key_set.etag) if key_set else (_EMPTY_JWKS, _EMPTY_JWKS_ETAG)
+    )
+    max_age = get_settings().security.jwks_max_age_secs
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={max_age}, stale-while-revalidate={max_age}",
+    }
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return RawJSONResponse(body, headers=headers)
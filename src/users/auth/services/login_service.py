@@ -1,7 +1,11 @@
 from fastapi import HTTPException, status
 
 from src.users.auth.models import LoginModel, TokenPairModel
-from src.users.auth.services.password_service import PasswordService
+from src.users.auth.services.password_service import (
+    PasswordRehasher,
+    PasswordService,
+    get_password_rehasher,
+)
 from src.users.auth.services.token_service import TokenService
 from src.users.repository import AbstractUserRepository
 
@@ -11,19 +15,21 @@ class LoginService:
             self,
             user_repository: AbstractUserRepository,
             token_service: TokenService | None = None,
+            password_rehasher: PasswordRehasher | None = None,
     ) -> None:
         self._user_repository = user_repository
         self._token_service = token_service or TokenService()
+        self._password_rehasher = password_rehasher or get_password_rehasher()
 
     async def login(self, email: str, password: str) -> TokenPairModel:
-        user = await self._user_repository.get_user_by_email(email)
+        user = await self._user_repository.get_user_credentials(email)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email",
             )
 
-        if not PasswordService.password_matches_hash(password, user.password_hash):
+        if not await PasswordService.verify_password(password, user.password_hash):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid password",
@@ -36,4 +42,7 @@ class LoginService:
                 detail="Inactive user",
             )
 
+        self._password_rehasher.schedule(
+            user.id, password, user.password_hash, self._user_repository
+        )
         return self._token_service.generate_token(user)
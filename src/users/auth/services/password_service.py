@@ -1,21 +1,167 @@
+import asyncio
+import logging
+import time
+from functools import lru_cache
+
 import bcrypt
+from fastapi import HTTPException, status
 
 from src.config import get_settings
+from src.core import metrics
+from src.core.executor import BoundedExecutor, ExecutorSaturatedError
+from src.users.repository import AbstractUserRepository
+
+logger = logging.getLogger(__name__)
+
+
+def _checkpw(plain_password: bytes, hashed_password: bytes) -> bool:
+    try:
+        return bcrypt.checkpw(plain_password, hashed_password)
+    except ValueError:
+        return False
+
+
+def bcrypt_hash(password: bytes, rounds: int) -> bytes:
+    """Hash synchronously at ``rounds``; module-level so process pools can pickle it."""
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds))
+
+
+def _bcrypt_cost(hashed_password: str) -> int | None:
+    # $2b$12$<salt+hash>
+    parts = hashed_password.split("$", 3)
+    if len(parts) != 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def get_bcrypt_rounds() -> int:
+    """The cost new hashes are made with.
+
+    Pinned in settings for every worker, from ``python -m
+    src.users.auth.calibration`` run once on the target hardware.
+    """
+    return get_settings().security.password_bcrypt_rounds
+
+
+@lru_cache(maxsize=1)
+def get_password_executor() -> BoundedExecutor:
+    security = get_settings().security
+    return BoundedExecutor(
+        kind=security.password_hash_executor,
+        max_workers=security.password_hash_workers,
+        max_pending=security.password_hash_max_pending,
+        name="bcrypt",
+    )
 
 
 class PasswordService:
     @staticmethod
     def password_matches_hash(plain_password: str, hashed_password: str) -> bool:
+        started = time.perf_counter()
+        matches = _checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
+        metrics.record_operation("bcrypt_verify", time.perf_counter() - started)
+        return matches
+
+    @staticmethod
+    def needs_rehash(hashed_password: str) -> bool:
+        cost = _bcrypt_cost(hashed_password)
+        # Only upwards: a hash above the target stays as strong as it is.
+        return cost is not None and cost < get_bcrypt_rounds()
+
+    @staticmethod
+    def get_password_hash(password: str) -> str:
+        started = time.perf_counter()
+        hashed = bcrypt_hash(password.encode(), get_bcrypt_rounds())
+        metrics.record_operation("bcrypt_hash", time.perf_counter() - started)
+        return hashed.decode()
+
+    @staticmethod
+    async def verify_password(plain_password: str, hashed_password: str) -> bool:
+        # Timed around the executor call, so this includes any wait for a
+        # worker; the executor stats on /metrics split out the wait.
+        started = time.perf_counter()
         try:
-            return bcrypt.checkpw(
-                plain_password.encode("utf-8"), hashed_password.encode("utf-8")
+            matches = await get_password_executor().run(
+                _checkpw,
+                plain_password.encode("utf-8"),
+                hashed_password.encode("utf-8"),
             )
-        except ValueError:
-            return False
+        except ExecutorSaturatedError:
+            raise _busy() from None
+        metrics.record_operation("bcrypt_verify", time.perf_counter() - started)
+        return matches
 
     @staticmethod
-    def get_password_hash(password: str) -> str:
-        return bcrypt.hashpw(
-            password.encode(),
-            bcrypt.gensalt(get_settings().security.password_bcrypt_rounds),
-        ).decode()
+    async def hash_password(password: str) -> str:
+        started = time.perf_counter()
+        try:
+            hashed = await get_password_executor().run(
+                bcrypt_hash,
+                password.encode(),
+                get_bcrypt_rounds(),
+            )
+        except ExecutorSaturatedError:
+            raise _busy() from None
+        metrics.record_operation("bcrypt_hash", time.perf_counter() - started)
+        return hashed.decode()
+
+
+class PasswordRehasher:
+    """Re-hashes passwords at the current cost after successful logins.
+
+    Lets the bcrypt cost go up without a migration: each user's hash is
+    upgraded the next time they log in. Runs in the
+    background after the response and gives way to logins: if the bcrypt
+    pool is saturated the rehash is skipped and retried on a later login.
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._in_flight: set[int] = set()
+        self._tasks: set[asyncio.Task] = set()
+
+    def schedule(
+        self,
+        user_id: int,
+        plain_password: str,
+        hashed_password: str,
+        user_repository: AbstractUserRepository,
+    ) -> None:
+        if (
+            not self.enabled
+            or user_id in self._in_flight
+            or not PasswordService.needs_rehash(hashed_password)
+        ):
+            return
+        self._in_flight.add(user_id)
+        task = asyncio.create_task(self._rehash(user_id, plain_password, user_repository))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _rehash(
+        self, user_id: int, plain_password: str, user_repository: AbstractUserRepository
+    ) -> None:
+        try:
+            hashed = await get_password_executor().run(
+                bcrypt_hash, plain_password.encode(), get_bcrypt_rounds()
+            )
+            await user_repository.update_user(user_id, {"password_hash": hashed.decode()})
+        except ExecutorSaturatedError:
+            pass
+        except Exception:
+            logger.exception("Failed to rehash the password of user %s", user_id)
+        finally:
+            self._in_flight.discard(user_id)
+
+
+@lru_cache(maxsize=1)
+def get_password_rehasher() -> PasswordRehasher:
+    return PasswordRehasher(get_settings().security.password_rehash_on_login)
+
+
+def _busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server busy, retry later",
+        headers={"Retry-After": "1"},
+    )
@@ -1,48 +1,64 @@
+import time
+
 from fastapi import HTTPException, status
 
+from src.config import get_settings
 from src.users.auth.models import TokenPairModel
 from src.users.auth.services.token_service import TokenService, TokenValidationError
+from src.users.auth.token_store import UsedTokenStore, get_used_token_store
 from src.users.repository import AbstractUserRepository
 
 
+def _invalid_refresh_token() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+    )
+
+
 class RefreshService:
     def __init__(
         self,
         user_repository: AbstractUserRepository,
         token_service: TokenService | None = None,
+        used_token_store: UsedTokenStore | None = None,
     ) -> None:
         self._user_repository = user_repository
         self._token_service = token_service or TokenService()
+        self._used_token_store = used_token_store or get_used_token_store()
 
     async def refresh(self, refresh_token: str) -> TokenPairModel:
         try:
             payload = self._token_service.decode(refresh_token)
         except TokenValidationError:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid refresh token",
-            ) from None
+            raise _invalid_refresh_token() from None
 
         subject = payload.get("sub")
-        if subject is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid refresh token",
-            )
+        jti = payload.get("jti")
+        family = payload.get("fam")
+        if payload.get("type") != "refresh" or not subject or not jti or not family:
+            raise _invalid_refresh_token()
 
         try:
             user_id = int(subject)
         except (TypeError, ValueError) as err:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid refresh token",
-            ) from err
+            raise _invalid_refresh_token() from err
 
-        user = await self._user_repository.get_user_by_id(user_id)
-        if not user or not user.is_active:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid refresh token",
+        if await self._used_token_store.is_family_revoked(family):
+            raise _invalid_refresh_token()
+
+        # Each refresh token may be exchanged once. Seeing it again means it
+        # leaked, so the whole family is revoked for as long as any token
+        # issued from it could still be valid.
+        if await self._used_token_store.mark_used(jti, payload["exp"]):
+            family_exp = (
+                int(time.time()) + get_settings().security.refresh_token_expire_secs
             )
+            await self._used_token_store.revoke_family(family, family_exp)
+            raise _invalid_refresh_token()
+
+        user = await self._user_repository.get_auth_principal(user_id)
+        if not user or not user.is_active:
+            raise _invalid_refresh_token()
 
-        return self._token_service.generate_token(user)
+        return self._token_service.generate_token(user, family=family)
@@ -2,26 +2,28 @@ from fastapi import HTTPException, status
 
 from src.users.auth.models import RegistrationModel
 from src.users.auth.services.password_service import PasswordService
-from src.users.repository import AbstractUserRepository
+from src.users.models import User
+from src.users.repository import AbstractUserRepository, UserAlreadyExistsError
 
 
 class RegistrationService:
     def __init__(self, user_repository: AbstractUserRepository) -> None:
         self._user_repository = user_repository
 
-    async def register_user(self, user_data: RegistrationModel) -> None:
-        existing_user = await self._user_repository.get_user_by_email(user_data.email)
-        if existing_user:
+    async def register_user(self, user_data: RegistrationModel) -> User:
+        password_hash = await PasswordService.hash_password(user_data.password)
+        try:
+            user = await self._user_repository.create_user(
+                dict(
+                    email=user_data.email,
+                    password_hash=password_hash,
+                    full_name=user_data.full_name,
+                )
+            )
+        except UserAlreadyExistsError:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="Email already registered",
-            )
-        user = await self.user_repository.create_user(
-            dict(
-                email=user_data.email,
-                password_hash=PasswordService.get_password_hash(user_data.password),
-                full_name=user_data.full_name,
-            )
-        )
+            ) from None
 
-        return user.serialise()
+        return user
@@ -2,22 +2,27 @@ import time
 from typing import Any
 from uuid import uuid4
 
-import jwt
-
 from src.users.auth.models import AccessTokenModel, RefreshTokenModel, TokenPairModel
 from src.config import get_settings
-from src.users.models import User
-
-
-class TokenValidationError(Exception):
-    """Raised when a token fails validation."""
+from src.users.auth.services.token_verifier import (
+    TokenValidationError,
+    TokenVerifier,
+    get_token_verifier,
+)
+from src.users.models import User, UserRole
+from src.users.projections import AuthPrincipal, UserCredentials
 
 
 class TokenService:
-    def __init__(self) -> None:
+    def __init__(self, verifier: TokenVerifier | None = None) -> None:
         self._settings = get_settings()
+        self._verifier = verifier or get_token_verifier()
 
-    def generate_token(self, user: User) -> TokenPairModel:
+    def generate_token(
+        self,
+        user: User | UserCredentials | AuthPrincipal,
+        family: str | None = None,
+    ) -> TokenPairModel:
         now = int(time.time())
         access_token = AccessTokenModel(
             sub=str(user.id),
@@ -26,22 +31,23 @@ class TokenService:
             iss=self._settings.security.jwt_issuer,
             jti=str(uuid4())[:8],
         )
+        if self._settings.security.stateless_access_tokens:
+            access_token.roles = [UserRole(role).value for role in user.roles]
+            access_token.ver = user.token_version
         refresh_token = RefreshTokenModel(
             sub=str(user.id),
             iat=now,
             exp=now + self._settings.security.refresh_token_expire_secs,
             iss=self._settings.security.jwt_issuer,
             type="refresh",
+            jti=uuid4().hex,
+            fam=family or uuid4().hex,
         )
-        encoded_access_token = jwt.encode(
-            access_token.model_dump(mode="json"),
-            self._settings.security.jwt_secret_key.get_secret_value(),
-            algorithm="HS256",
+        encoded_access_token = self._verifier.encode(
+            access_token.model_dump(mode="json", exclude_none=True)
         )
-        encoded_refresh_token = jwt.encode(
-            refresh_token.model_dump(mode="json"),
-            self._settings.security.jwt_secret_key.get_secret_value(),
-            algorithm="HS256",
+        encoded_refresh_token = self._verifier.encode(
+            refresh_token.model_dump(mode="json")
         )
         return TokenPairModel(
             access_token=encoded_access_token,
@@ -57,14 +63,4 @@ class TokenService:
         return True
 
     def decode(self, token: str) -> dict[str, Any]:
-        try:
-            return jwt.decode(
-                token,
-                self._settings.security.jwt_secret_key.get_secret_value(),
-                algorithms=["HS256"],
-                issuer=self._settings.security.jwt_issuer,
-            )
-        except jwt.ExpiredSignatureError as exc:  # pragma: no cover - library-specific error
-            raise TokenValidationError("Token expired") from exc
-        except jwt.InvalidTokenError as exc:
-            raise TokenValidationError("Invalid token") from exc
+        return self._verifier.decode(token)
@@ -0,0 +1,217 @@
+import asyncio
+import hashlib
+import logging
+import time
+from functools import lru_cache
+from typing import Any, Callable
+
+import jwt
+
+from src.config import get_settings
+from src.core import metrics
+from src.core.cache import TTLCache
+from src.users.auth.keys import KeySet, keys_from_jwks, load_signing_key
+
+logger = logging.getLogger(__name__)
+
+
+class TokenValidationError(Exception):
+    """Raised when a token fails validation."""
+
+
+class TokenVerifier:
+    """Verifies JWTs with key material resolved once per process.
+
+    Verification keys are looked up by the token's ``kid`` header, each
+    pinned to its own algorithm; ``key``/``kid`` sign new tokens and may be
+    None for a verify-only instance built from a JWKS document. Given
+    ``fetch_jwks``, an unknown ``kid`` reloads the keys from it, at most once
+    per ``refetch_min_interval_secs``, so a key added upstream is picked up
+    without a restart and forged kids can't turn into a fetch each. On the
+    event loop the blocking fetch runs in a thread and the token that set it
+    off is refused rather than waiting for it. Successfully
+    verified tokens are remembered by digest until their own ``exp``, so a
+    client re-sending the same bearer token skips signature verification and
+    claim parsing. Returned payloads are shared between callers and must not
+    be mutated.
+    """
+
+    def __init__(
+        self,
+        key: Any,
+        issuer: str,
+        algorithm: str = "HS256",
+        cache_max_size: int = 10_000,
+        kid: str | None = None,
+        verification_keys: dict[str, tuple[str, Any]] | None = None,
+        fetch_jwks: Callable[[], dict[str, Any]] | None = None,
+        refetch_min_interval_secs: float = 60.0,
+    ) -> None:
+        self.key = key
+        self.kid = kid
+        self.issuer = issuer
+        self.algorithm = algorithm
+        self._headers = {"kid": kid} if kid else None
+        self._verification_keys = (
+            verification_keys
+            if verification_keys is not None
+            else {kid or "": (algorithm, key)}
+        )
+        self._fetch_jwks = fetch_jwks
+        self.refetch_min_interval_secs = refetch_min_interval_secs
+        self._next_refetch = 0.0
+        self._refetch: asyncio.Task | None = None
+        self._cache: TTLCache[bytes, dict[str, Any]] = TTLCache(
+            max_size=cache_max_size, ttl_secs=0
+        )
+
+    @classmethod
+    def from_key_set(
+        cls, key_set: KeySet, issuer: str, cache_max_size: int = 10_000
+    ) -> "TokenVerifier":
+        return cls(
+            key_set.active.private_key,
+            issuer,
+            algorithm=key_set.active.algorithm,
+            cache_max_size=cache_max_size,
+            kid=key_set.active.kid,
+            verification_keys=key_set.verification_keys,
+        )
+
+    @classmethod
+    def from_jwks(
+        cls,
+        jwks: dict[str, Any],
+        issuer: str,
+        cache_max_size: int = 10_000,
+        fetch_jwks: Callable[[], dict[str, Any]] | None = None,
+        refetch_min_interval_secs: float = 60.0,
+    ) -> "TokenVerifier":
+        return cls(
+            None,
+            issuer,
+            cache_max_size=cache_max_size,
+            verification_keys=keys_from_jwks(jwks),
+            fetch_jwks=fetch_jwks,
+            refetch_min_interval_secs=refetch_min_interval_secs,
+        )
+
+    @property
+    def cache_stats(self):
+        return self._cache.stats
+
+    @property
+    def cache_size(self) -> int:
+        return len(self._cache)
+
+    def encode(self, claims: dict[str, Any]) -> str:
+        if self.key is None:
+            raise RuntimeError("This verifier has no signing key")
+        started = time.perf_counter()
+        token = jwt.encode(
+            claims, self.key, algorithm=self.algorithm, headers=self._headers
+        )
+        metrics.record_operation("jwt_encode", time.perf_counter() - started)
+        return token
+
+    def decode(self, token: str) -> dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            return self._decode(token)
+        finally:
+            metrics.record_operation("jwt_decode", time.perf_counter() - started)
+
+    def _decode(self, token: str) -> dict[str, Any]:
+        digest = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        payload = self._cache.get(digest)
+        if payload is not None:
+            if payload["exp"] > time.time():
+                return payload
+            self._cache.invalidate(digest)
+            raise TokenValidationError("Token expired")
+
+        try:
+            kid = jwt.get_unverified_header(token).get("kid") or ""
+        except jwt.InvalidTokenError as exc:
+            raise TokenValidationError("Invalid token") from exc
+        if kid not in self._verification_keys:
+            self._refetch_keys()
+            if kid not in self._verification_keys:
+                raise TokenValidationError("Unknown signing key")
+        algorithm, key = self._verification_keys[kid]
+
+        try:
+            payload = jwt.decode(
+                token,
+                key,
+                algorithms=[algorithm],
+                issuer=self.issuer,
+                options={"require": ["exp"]},
+            )
+        except jwt.ExpiredSignatureError as exc:  # pragma: no cover - library-specific error
+            raise TokenValidationError("Token expired") from exc
+        except jwt.InvalidTokenError as exc:
+            raise TokenValidationError("Invalid token") from exc
+
+        self._cache.set(digest, payload, ttl_secs=payload["exp"] - time.time())
+        return payload
+
+    def _refetch_keys(self) -> None:
+        now = time.monotonic()
+        if self._fetch_jwks is None or now < self._next_refetch:
+            return
+        self._next_refetch = now + self.refetch_min_interval_secs
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Not serving requests; nothing else waits on this thread.
+            try:
+                self._verification_keys = self._load_keys()
+            except Exception:
+                logger.exception("Failed to refetch the JWKS")
+            return
+        self._refetch = loop.create_task(asyncio.to_thread(self._load_keys))
+        self._refetch.add_done_callback(self._refetched)
+
+    def _load_keys(self) -> dict[str, tuple[str, Any]]:
+        return keys_from_jwks(self._fetch_jwks())
+
+    def _refetched(self, task: asyncio.Task) -> None:
+        self._refetch = None
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            logger.error("Failed to refetch the JWKS", exc_info=task.exception())
+            return
+        self._verification_keys = task.result()
+
+
+@lru_cache(maxsize=1)
+def get_key_set() -> KeySet | None:
+    security = get_settings().security
+    if not security.jwt_signing_keys:
+        return None
+    return KeySet(
+        [
+            load_signing_key(kid, pem.get_secret_value())
+            for kid, pem in security.jwt_signing_keys.items()
+        ],
+        active_kid=security.jwt_active_kid,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_token_verifier() -> TokenVerifier:
+    settings = get_settings()
+    key_set = get_key_set()
+    if key_set is not None:
+        return TokenVerifier.from_key_set(
+            key_set,
+            settings.security.jwt_issuer,
+            cache_max_size=settings.cache.token_max_size,
+        )
+    return TokenVerifier(
+        key=settings.security.jwt_secret_key.get_secret_value(),
+        issuer=settings.security.jwt_issuer,
+        cache_max_size=settings.cache.token_max_size,
+    )
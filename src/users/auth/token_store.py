@@ -0,0 +1,213 @@
+import hashlib
+import math
+import struct
+import time
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
+from typing_extensions import override
+
+from src.config import get_settings
+
+
+class UsedTokenStore(ABC):
+    """Remembers spent refresh tokens and revoked token families until they expire.
+
+    The interface is async so a shared backend (e.g. Redis) can replace the
+    in-process implementations without touching callers.
+    """
+
+    @abstractmethod
+    async def mark_used(self, jti: str, exp: int) -> bool:
+        """Record ``jti`` as spent; return True if it had already been spent."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def revoke_family(self, family: str, exp: int) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def is_family_revoked(self, family: str) -> bool:
+        raise NotImplementedError
+
+
+class _ExpiringSet:
+    def __init__(self) -> None:
+        self._expiries: dict[str, float] = {}
+        self._next_sweep = 0.0
+
+    def add(self, key: str, exp: float) -> bool:
+        now = time.time()
+        self._sweep(now)
+        seen = self._expiries.get(key, 0) > now
+        self._expiries[key] = exp
+        return seen
+
+    def __contains__(self, key: str) -> bool:
+        return self._expiries.get(key, 0) > time.time()
+
+    def __len__(self) -> int:
+        return len(self._expiries)
+
+    def _sweep(self, now: float) -> None:
+        if now < self._next_sweep:
+            return
+        self._expiries = {k: v for k, v in self._expiries.items() if v > now}
+        self._next_sweep = now + 60
+
+
+class InMemoryUsedTokenStore(UsedTokenStore):
+    """Exact store; memory grows with the number of live spent tokens."""
+
+    def __init__(self) -> None:
+        self._used = _ExpiringSet()
+        self._families = _ExpiringSet()
+
+    @override
+    async def mark_used(self, jti: str, exp: int) -> bool:
+        return self._used.add(jti, exp)
+
+    @override
+    async def revoke_family(self, family: str, exp: int) -> None:
+        self._families.add(family, exp)
+
+    @override
+    async def is_family_revoked(self, family: str) -> bool:
+        return family in self._families
+
+
+def _key_hashes(key: str, count: int) -> tuple[int, ...]:
+    """``count`` independent 64-bit hashes of ``key``.
+
+    Double hashing (h1 + i*h2) would fix a key's positions by two numbers
+    below the filter size: too few patterns for the small filters a bucket
+    starts with to reach their false-positive rate.
+    """
+    digest = hashlib.shake_128(key.encode()).digest(8 * count)
+    return struct.unpack(f"<{count}Q", digest)
+
+
+class BloomFilter:
+    """Filters take a key's hashes (at least ``hash_count`` of them) rather
+    than the key, so a bucket hashes each key once for all its filters."""
+
+    __slots__ = ("capacity", "size_bits", "hash_count", "count", "_bits")
+
+    def __init__(self, capacity: int, false_positive_rate: float) -> None:
+        self.capacity = capacity
+        self.size_bits = max(
+            8, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2)
+        )
+        self.hash_count = max(1, round(self.size_bits / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size_bits + 7) // 8)
+
+    def add(self, hashes: tuple[int, ...]) -> bool:
+        """Insert a key; return True if it was (probably) present already."""
+        bits = self._bits
+        size = self.size_bits
+        present = True
+        for h in hashes[: self.hash_count]:
+            position = h % size
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not bits[byte] & mask:
+                present = False
+                bits[byte] |= mask
+        if not present:
+            self.count += 1
+        return present
+
+    def might_contain(self, hashes: tuple[int, ...]) -> bool:
+        bits = self._bits
+        size = self.size_bits
+        for h in hashes[: self.hash_count]:
+            position = h % size
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._bits)
+
+
+class BloomUsedTokenStore(UsedTokenStore):
+    """Bounded-memory store built from Bloom filters bucketed by token expiry.
+
+    A spent token lands in the bucket for its own ``exp``, so a lookup probes
+    one bucket and whole buckets are dropped once every token in them has
+    expired. Each bucket is a scalable Bloom filter: it starts with one
+    filter for ``initial_capacity`` tokens and, when that fills up, adds one
+    twice as large with half the false-positive rate, so a quiet hour costs
+    a few KiB and the false-positive rate (a valid token wrongly treated as
+    reused) stays under ``false_positive_rate`` however many tokens arrive.
+    Revoked families are rare and kept exactly.
+    """
+
+    def __init__(
+        self,
+        bucket_secs: int = 3600,
+        initial_capacity: int = 1024,
+        false_positive_rate: float = 1e-6,
+    ) -> None:
+        self.bucket_secs = bucket_secs
+        self.initial_capacity = initial_capacity
+        self.false_positive_rate = false_positive_rate
+        self._buckets: dict[int, list[BloomFilter]] = {}
+        self._families = _ExpiringSet()
+        self._current_bucket = 0
+
+    @override
+    async def mark_used(self, jti: str, exp: int) -> bool:
+        self._drop_expired_buckets()
+        filters = self._buckets.setdefault(exp // self.bucket_secs, [])
+        if not filters or filters[-1].count >= filters[-1].capacity:
+            filters.append(self._stage(len(filters)))
+        # Later stages have the lower rates, hence the most hash functions.
+        hashes = _key_hashes(jti, filters[-1].hash_count)
+        if any(bloom.might_contain(hashes) for bloom in filters):
+            return True
+        filters[-1].add(hashes)
+        return False
+
+    @override
+    async def revoke_family(self, family: str, exp: int) -> None:
+        self._families.add(family, exp)
+
+    @override
+    async def is_family_revoked(self, family: str) -> bool:
+        return family in self._families
+
+    @property
+    def nbytes(self) -> int:
+        return sum(bloom.nbytes for filters in self._buckets.values() for bloom in filters)
+
+    @property
+    def count(self) -> int:
+        return sum(bloom.count for filters in self._buckets.values() for bloom in filters)
+
+    def _stage(self, index: int) -> BloomFilter:
+        # Rates of false_positive_rate / 2, / 4, ... sum to under false_positive_rate.
+        return BloomFilter(
+            self.initial_capacity << index, self.false_positive_rate / 2 ** (index + 1)
+        )
+
+    def _drop_expired_buckets(self) -> None:
+        current = int(time.time()) // self.bucket_secs
+        if current == self._current_bucket:
+            return
+        self._current_bucket = current
+        for bucket in [b for b in self._buckets if b < current]:
+            del self._buckets[bucket]
+
+
+@lru_cache(maxsize=1)
+def get_used_token_store() -> UsedTokenStore:
+    security = get_settings().security
+    if security.refresh_reuse_backend == "memory":
+        return InMemoryUsedTokenStore()
+    return BloomUsedTokenStore(
+        bucket_secs=security.refresh_reuse_bucket_secs,
+        initial_capacity=security.refresh_reuse_initial_capacity,
+        false_positive_rate=security.refresh_reuse_false_positive_rate,
+    )
@@ -0,0 +1,16 @@
+from functools import lru_cache
+
+from src.config import get_settings
+from src.core.cache import TTLCache
+from src.users.projections import AuthPrincipal
+
+UserCache = TTLCache[int, AuthPrincipal]
+
+
+@lru_cache(maxsize=1)
+def get_user_cache() -> UserCache:
+    cache_settings = get_settings().cache
+    return TTLCache(
+        max_size=cache_settings.user_max_size,
+        ttl_secs=cache_settings.user_ttl_secs,
+    )
@@ -1,10 +1,12 @@
-from fastapi import Depends
+from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
+from src.users.loader import UserLoader
+from src.users.models import UserRole
 from src.users.repository import UserRepository
 from src.users.service import UserService
 from src.core.dependencies import SessionDep
-from src.users.models import User
+from src.users.projections import AuthPrincipal
 
 
 async def get_user_repository(
@@ -19,8 +21,28 @@ async def get_user_service(
     return UserService(user_repository)
 
 
+async def get_user_loader(
+    user_repository: UserRepository = Depends(get_user_repository),
+) -> UserLoader:
+    return UserLoader(user_repository)
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(HTTPBearer()),
     user_service: UserService = Depends(get_user_service),
-) -> User:
+) -> AuthPrincipal:
     return await user_service.authenticate(credentials)
+
+
+async def get_current_admin(
+    user: AuthPrincipal = Depends(get_current_user),
+) -> AuthPrincipal:
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user"
+        )
+    if UserRole.ADMIN not in user.roles:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Admin role required"
+        )
+    return user
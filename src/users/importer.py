@@ -0,0 +1,215 @@
+"""Bulk import of user accounts from CSV or NDJSON.
+
+Usage: ``python -m src.users.importer accounts.csv [--batch-size 1000]``
+
+Each row needs an ``email`` and either a plain ``password`` (hashed here in
+a process pool) or a ready ``password_hash``; ``full_name``, ``roles``
+(``|``-separated in CSV, a list in NDJSON) and ``is_active`` are optional.
+Rows that are invalid or whose email already exists are reported and
+skipped; the rest of the batch is still loaded.
+"""
+import argparse
+import asyncio
+import csv
+import json
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from email_validator import EmailNotValidError, validate_email
+
+from src.users.auth.services.password_service import bcrypt_hash, get_bcrypt_rounds
+from src.users.models import UserRole
+from src.users.repository import AbstractUserRepository
+
+
+@dataclass
+class ImportIssue:
+    line: int
+    email: str | None
+    reason: str
+
+
+@dataclass
+class ImportReport:
+    read: int = 0
+    inserted: int = 0
+    issues: list[ImportIssue] = field(default_factory=list)
+    elapsed_secs: float = 0.0
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.read / self.elapsed_secs if self.elapsed_secs else 0.0
+
+
+def read_rows(path: Path, fmt: str | None = None) -> Iterator[tuple[int, dict | None]]:
+    """Yield ``(line, row)`` pairs; ``row`` is None when the line can't be parsed."""
+    fmt = fmt or ("ndjson" if path.suffix in (".ndjson", ".jsonl") else "csv")
+    with path.open(newline="", encoding="utf-8") as file:
+        if fmt == "csv":
+            yield from enumerate(csv.DictReader(file), start=2)
+            return
+        for line, raw in enumerate(file, start=1):
+            if not raw.strip():
+                continue
+            try:
+                yield line, json.loads(raw)
+            except json.JSONDecodeError:
+                yield line, None
+
+
+def _prepare_row(line: int, row: dict | None) -> dict | ImportIssue:
+    if not isinstance(row, dict):
+        return ImportIssue(line, None, "unparseable row")
+
+    email = (row.get("email") or "").strip()
+    try:
+        email = validate_email(email, check_deliverability=False).normalized
+    except EmailNotValidError:
+        return ImportIssue(line, email or None, "invalid email")
+
+    roles = row.get("roles") or [UserRole.CUSTOMER.value]
+    if isinstance(roles, str):
+        roles = roles.split("|")
+    try:
+        roles = [UserRole(role.strip()) for role in roles]
+    except ValueError:
+        return ImportIssue(line, email, "unknown role")
+
+    is_active = row.get("is_active", True)
+    if isinstance(is_active, str):
+        is_active = is_active.strip().lower() not in ("0", "false", "no", "")
+
+    password_hash = row.get("password_hash")
+    password = row.get("password")
+    if not password_hash and not password:
+        return ImportIssue(line, email, "missing password")
+
+    return {
+        "email": email,
+        "password_hash": password_hash or None,
+        "password": password,
+        "full_name": row.get("full_name") or None,
+        "is_active": is_active,
+        "roles": roles,
+    }
+
+
+async def _hash_batch(
+    batch: list[dict], executor: Executor | None, rounds: int
+) -> list[dict]:
+    loop = asyncio.get_running_loop()
+    pending = [row for row in batch if not row["password_hash"]]
+    hashes = await asyncio.gather(
+        *(
+            loop.run_in_executor(executor, bcrypt_hash, row["password"].encode(), rounds)
+            for row in pending
+        )
+    )
+    for row, hashed in zip(pending, hashes):
+        row["password_hash"] = hashed.decode()
+    for row in batch:
+        del row["password"]
+    return batch
+
+
+def _batches(
+    rows: Iterable[tuple[int, dict | None]], batch_size: int, report: ImportReport
+) -> Iterator[tuple[list[dict], dict[str, int]]]:
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, batch_size)):
+        batch: list[dict] = []
+        lines: dict[str, int] = {}
+        for line, raw in chunk:
+            report.read += 1
+            prepared = _prepare_row(line, raw)
+            if isinstance(prepared, ImportIssue):
+                report.issues.append(prepared)
+            elif prepared["email"] in lines:
+                report.issues.append(
+                    ImportIssue(line, prepared["email"], "duplicate email in input")
+                )
+            else:
+                lines[prepared["email"]] = line
+                batch.append(prepared)
+        yield batch, lines
+
+
+async def import_users(
+    repository: AbstractUserRepository,
+    rows: Iterable[tuple[int, dict | None]],
+    batch_size: int = 1000,
+    executor: Executor | None = None,
+    rounds: int | None = None,
+) -> ImportReport:
+    """Hash and insert ``rows`` batch by batch.
+
+    Hashing of the next batch overlaps with the insert of the current one.
+    """
+    rounds = rounds or get_bcrypt_rounds()
+    report = ImportReport()
+    started = time.perf_counter()
+
+    async def insert(batch: list[dict], lines: dict[str, int]) -> None:
+        inserted = await repository.bulk_create_users(batch)
+        report.inserted += len(inserted)
+        for email, line in lines.items():
+            if email not in inserted:
+                report.issues.append(ImportIssue(line, email, "email already registered"))
+
+    previous: asyncio.Task | None = None
+    for batch, lines in _batches(rows, batch_size, report):
+        hashed = await _hash_batch(batch, executor, rounds)
+        if previous is not None:
+            await previous
+        previous = asyncio.create_task(insert(hashed, lines))
+    if previous is not None:
+        await previous
+
+    report.issues.sort(key=lambda issue: issue.line)
+    report.elapsed_secs = time.perf_counter() - started
+    return report
+
+
+async def _run(args: argparse.Namespace) -> ImportReport:
+    from src.core.database.session import LazySession, dispose_database
+    from src.users.repository import UserRepository
+
+    session = LazySession()
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            return await import_users(
+                UserRepository(session),
+                read_rows(args.path, args.format),
+                batch_size=args.batch_size,
+                executor=executor,
+            )
+    finally:
+        await session.close()
+        await dispose_database()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk import user accounts.")
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--format", choices=["csv", "ndjson"])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(_run(args))
+    for issue in report.issues:
+        print(f"{issue.line}\t{issue.email or '-'}\t{issue.reason}", file=sys.stderr)
+    print(
+        f"read={report.read} inserted={report.inserted} issues={len(report.issues)} "
+        f"elapsed={report.elapsed_secs:.2f}s rows/s={report.rows_per_sec:,.0f}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
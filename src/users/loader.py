@@ -0,0 +1,27 @@
+from src.core.loader import BatchLoader
+from src.users.models import User
+from src.users.repository import AbstractUserRepository
+
+
+class UserLoader:
+    """Per-request user lookups, batched into one query per event-loop tick."""
+
+    def __init__(self, user_repository: AbstractUserRepository) -> None:
+        self.by_id: BatchLoader[int, User] = BatchLoader(
+            user_repository.get_users_by_ids
+        )
+        self.by_email: BatchLoader[str, User] = BatchLoader(
+            user_repository.get_users_by_emails
+        )
+
+    async def get_user_by_id(self, user_id: int) -> User | None:
+        return await self.by_id.load(user_id)
+
+    async def get_users_by_ids(self, user_ids: list[int]) -> list[User | None]:
+        return await self.by_id.load_many(user_ids)
+
+    async def get_user_by_email(self, email: str) -> User | None:
+        return await self.by_email.load(email)
+
+    async def get_users_by_emails(self, emails: list[str]) -> list[User | None]:
+        return await self.by_email.load_many(emails)
@@ -0,0 +1,133 @@
+from datetime import datetime, timezone
+from itertools import count
+from typing import Iterable
+
+from typing_extensions import override
+
+from src.users.models import User, UserRole
+from src.users.projections import AuthPrincipal, UserCredentials, UserProfile
+from src.users.repository import AbstractUserRepository, UserAlreadyExistsError
+
+
+class InMemoryUserRepository(AbstractUserRepository):
+    """Dict-backed repository for tests, benchmarks and local runs without Postgres.
+
+    One instance is meant to be shared across requests, like a database.
+    """
+
+    def __init__(self) -> None:
+        self._users: dict[int, User] = {}
+        self._ids_by_email: dict[str, int] = {}
+        self._ids = count(1)
+
+    @override
+    async def get_user_by_id(self, user_id: int) -> User | None:
+        return self._users.get(user_id)
+
+    @override
+    async def get_user_by_email(self, email: str) -> User | None:
+        user_id = self._ids_by_email.get(email)
+        return self._users.get(user_id) if user_id is not None else None
+
+    @override
+    async def get_auth_principal(self, user_id: int) -> AuthPrincipal | None:
+        user = self._users.get(user_id)
+        if user is None:
+            return None
+        return AuthPrincipal(user.id, user.is_active, user.roles, user.token_version)
+
+    @override
+    async def get_user_credentials(self, email: str) -> UserCredentials | None:
+        user = await self.get_user_by_email(email)
+        if user is None:
+            return None
+        return UserCredentials(
+            user.id, user.password_hash, user.is_active, user.roles, user.token_version
+        )
+
+    @override
+    async def get_user_profile(self, user_id: int) -> UserProfile | None:
+        user = self._users.get(user_id)
+        if user is None:
+            return None
+        return UserProfile(
+            user.id,
+            user.email,
+            user.full_name,
+            user.is_active,
+            user.roles,
+            user.created_at,
+            user.updated_at,
+        )
+
+    @override
+    async def get_users_by_ids(self, user_ids: Iterable[int]) -> dict[int, User]:
+        return {i: self._users[i] for i in set(user_ids) if i in self._users}
+
+    @override
+    async def get_users_by_emails(self, emails: Iterable[str]) -> dict[str, User]:
+        return {
+            email: self._users[self._ids_by_email[email]]
+            for email in set(emails)
+            if email in self._ids_by_email
+        }
+
+    @override
+    async def create_user(self, user_data) -> User:
+        if user_data["email"] in self._ids_by_email:
+            raise UserAlreadyExistsError(user_data["email"])
+        return self._insert(user_data)
+
+    @override
+    async def update_user(self, user_id: int, user_data) -> User | None:
+        user = self._users.get(user_id)
+        if user is None:
+            return None
+        for field, value in user_data.items():
+            setattr(user, field, value)
+        user.updated_at = datetime.now(timezone.utc)
+        return user
+
+    @override
+    async def bump_token_version(self, user_id: int) -> int | None:
+        user = self._users.get(user_id)
+        if user is None:
+            return None
+        user.token_version += 1
+        user.updated_at = datetime.now(timezone.utc)
+        return user.token_version
+
+    @override
+    async def get_token_versions_since(
+        self, since: datetime
+    ) -> list[tuple[int, int, datetime]]:
+        return [
+            (user.id, user.token_version, user.updated_at)
+            for user in self._users.values()
+            if user.token_version > 0 and user.updated_at >= since
+        ]
+
+    @override
+    async def bulk_create_users(self, users_data: list[dict]) -> set[str]:
+        inserted = set()
+        for user_data in users_data:
+            if user_data["email"] not in self._ids_by_email:
+                inserted.add(self._insert(user_data).email)
+        return inserted
+
+    def _insert(self, user_data) -> User:
+        now = datetime.now(timezone.utc)
+        user = User(
+            **{
+                "is_active": True,
+                "roles": [UserRole.CUSTOMER],
+                "token_version": 0,
+                **user_data,
+            },
+            id=next(self._ids),
+            created_at=now,
+            updated_at=now,
+        )
+        self._users[user.id] = user
+        self._ids_by_email[user.email] = user.id
+        return user
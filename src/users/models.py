@@ -4,7 +4,7 @@ import enum
 from src.core.database import BaseModel
 
 
-from sqlalchemy import String, Boolean, Enum as SAEnum
+from sqlalchemy import String, Boolean, Integer, Enum as SAEnum
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -29,6 +29,9 @@ class User(BaseModel):
         nullable=False,
         default=lambda: [UserRole.CUSTOMER],
     )
+    token_version: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
 
 
     def __repr__(self) -> str:
@@ -40,7 +43,6 @@ class User(BaseModel):
             "email": self.email,
             "full_name": self.full_name,
             "is_active": self.is_active,
-            "is_superuser": self.is_superuser,
             "roles": [r.value for r in self.roles] if self.roles is not None else None,
             "created_at": self.created_at,
             "updated_at": self.updated_at,
@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import NamedTuple
+
+from src.users.models import UserRole
+
+
+class AuthPrincipal(NamedTuple):
+    id: int
+    is_active: bool
+    roles: list[UserRole]
+    token_version: int
+
+
+class UserCredentials(NamedTuple):
+    id: int
+    password_hash: str
+    is_active: bool
+    roles: list[UserRole]
+    token_version: int
+
+
+class UserProfile(NamedTuple):
+    id: int
+    email: str
+    full_name: str | None
+    is_active: bool
+    roles: list[UserRole]
+    created_at: datetime
+    updated_at: datetime
@@ -1,11 +1,49 @@
 from abc import ABC, abstractmethod
+from typing import Iterable
 
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+
+from sqlalchemy import Integer, String, any_, bindparam, func, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 from sqlalchemy.util import await_only
 from typing_extensions import override
 
+from src.core.database.session import LazySession
 from src.users.models import User
+from src.users.projections import AuthPrincipal, UserCredentials, UserProfile
+
+# Hot lookups are built once at import; SQLAlchemy then reuses their compiled
+# form from its statement cache instead of rebuilding the query per call.
+_USER_BY_ID = select(User).where(User.id == bindparam("user_id"))
+_USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+_USERS_BY_IDS = select(User).where(
+    User.id == any_(bindparam("user_ids", type_=ARRAY(Integer)))
+)
+_USERS_BY_EMAILS = select(User).where(
+    User.email == any_(bindparam("emails", type_=ARRAY(String)))
+)
+_AUTH_PRINCIPAL_BY_ID = select(
+    User.id, User.is_active, User.roles, User.token_version
+).where(User.id == bindparam("user_id"))
+_CREDENTIALS_BY_EMAIL = select(
+    User.id, User.password_hash, User.is_active, User.roles, User.token_version
+).where(User.email == bindparam("email"))
+_TOKEN_VERSIONS_SINCE = select(User.id, User.token_version, User.updated_at).where(
+    User.token_version > 0, User.updated_at >= bindparam("since")
+)
+_PROFILE_BY_ID = select(
+    User.id,
+    User.email,
+    User.full_name,
+    User.is_active,
+    User.roles,
+    User.created_at,
+    User.updated_at,
+).where(User.id == bindparam("user_id"))
+
+
+class UserAlreadyExistsError(Exception):
+    """Raised when creating a user whose email is already registered."""
 
 
 class AbstractUserRepository(ABC):
@@ -17,29 +55,167 @@ class AbstractUserRepository(ABC):
     async def get_user_by_email(self, email: str) -> User | None:
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_auth_principal(self, user_id: int) -> AuthPrincipal | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_user_credentials(self, email: str) -> UserCredentials | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_user_profile(self, user_id: int) -> UserProfile | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_users_by_ids(self, user_ids: Iterable[int]) -> dict[int, User]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_users_by_emails(self, emails: Iterable[str]) -> dict[str, User]:
+        raise NotImplementedError
+
     @abstractmethod
     async def create_user(self, user_data) -> User:
         raise NotImplementedError
 
+    @abstractmethod
+    async def update_user(self, user_id: int, user_data) -> User | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def bump_token_version(self, user_id: int) -> int | None:
+        """Invalidate the user's outstanding access tokens; return the new version."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_token_versions_since(
+        self, since: datetime
+    ) -> list[tuple[int, int, datetime]]:
+        """Return ``(id, token_version, updated_at)`` for users revoked since ``since``."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def bulk_create_users(self, users_data: list[dict]) -> set[str]:
+        """Insert many users at once; return the emails that were inserted."""
+        raise NotImplementedError
+
 
 class UserRepository(AbstractUserRepository):
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: LazySession):
         self.session = session
 
     @override
     async def get_user_by_id(self, user_id: int) -> User | None:
-        result = await self.session.execute(select(User).where(User.id == user_id))
-        return result.scalar_one_or_none()
+        async with self.session.unit_of_work(read_only=True) as session:
+            result = await session.execute(_USER_BY_ID, {"user_id": user_id})
+            return result.scalar_one_or_none()
 
     @override
     async def get_user_by_email(self, email: str) -> User | None:
-        result = await self.session.execute(select(User).where(User.email == email))
-        return result.scalar_one_or_none()
+        async with self.session.unit_of_work(read_only=True) as session:
+            result = await session.execute(_USER_BY_EMAIL, {"email": email})
+            return result.scalar_one_or_none()
+
+    @override
+    async def get_auth_principal(self, user_id: int) -> AuthPrincipal | None:
+        async with self.session.unit_of_work(read_only=True) as session:
+            result = await session.execute(_AUTH_PRINCIPAL_BY_ID, {"user_id": user_id})
+            row = result.one_or_none()
+        return AuthPrincipal._make(row) if row is not None else None
+
+    @override
+    async def get_user_credentials(self, email: str) -> UserCredentials | None:
+        async with self.session.unit_of_work(read_only=True) as session:
+            result = await session.execute(_CREDENTIALS_BY_EMAIL, {"email": email})
+            row = result.one_or_none()
+        return UserCredentials._make(row) if row is not None else None
+
+    @override
+    async def get_user_profile(self, user_id: int) -> UserProfile | None:
+        async with self.session.unit_of_work(read_only=True) as session:
+            result = await session.execute(_PROFILE_BY_ID, {"user_id": user_id})
+            row = result.one_or_none()
+        return UserProfile._make(row) if row is not None else None
+
+    @override
+    async def get_users_by_ids(self, user_ids: Iterable[int]) -> dict[int, User]:
+        user_ids = list(set(user_ids))
+        if not user_ids:
+            return {}
+        async with self.session.unit_of_work(read_only=True) as session:
+            users = await session.scalars(_USERS_BY_IDS, {"user_ids": user_ids})
+            return {user.id: user for user in users}
+
+    @override
+    async def get_users_by_emails(self, emails: Iterable[str]) -> dict[str, User]:
+        emails = list(set(emails))
+        if not emails:
+            return {}
+        async with self.session.unit_of_work(read_only=True) as session:
+            users = await session.scalars(_USERS_BY_EMAILS, {"emails": emails})
+            return {user.email: user for user in users}
 
     @override
     async def create_user(self, user_data) -> User:
-        new_user = User(**user_data)
-        self.session.add(new_user)
-        await self.session.commit()
-        await self.session.refresh(new_user)
+        statement = (
+            insert(User)
+            .values(**user_data)
+            .on_conflict_do_nothing(index_elements=[User.email])
+            .returning(User)
+        )
+        async with self.session.unit_of_work() as session:
+            new_user = (await session.scalars(statement)).one_or_none()
+            await session.commit()
+        if new_user is None:
+            raise UserAlreadyExistsError(user_data["email"])
         return new_user
+
+    @override
+    async def update_user(self, user_id: int, user_data) -> User | None:
+        async with self.session.unit_of_work() as session:
+            result = await session.execute(
+                update(User)
+                .where(User.id == user_id)
+                .values(**user_data, updated_at=func.now())
+                .returning(User)
+            )
+            user = result.scalar_one_or_none()
+            await session.commit()
+        return user
+
+    @override
+    async def bulk_create_users(self, users_data: list[dict]) -> set[str]:
+        if not users_data:
+            return set()
+        statement = (
+            insert(User)
+            .values(users_data)
+            .on_conflict_do_nothing(index_elements=[User.email])
+            .returning(User.email)
+        )
+        async with self.session.unit_of_work() as session:
+            inserted = set((await session.scalars(statement)).all())
+            await session.commit()
+        return inserted
+
+    @override
+    async def bump_token_version(self, user_id: int) -> int | None:
+        statement = (
+            update(User)
+            .where(User.id == user_id)
+            .values(token_version=User.token_version + 1, updated_at=func.now())
+            .returning(User.token_version)
+        )
+        async with self.session.unit_of_work() as session:
+            version = (await session.execute(statement)).scalar_one_or_none()
+            await session.commit()
+        return version
+
+    @override
+    async def get_token_versions_since(
+        self, since: datetime
+    ) -> list[tuple[int, int, datetime]]:
+        async with self.session.unit_of_work(read_only=True) as session:
+            result = await session.execute(_TOKEN_VERSIONS_SINCE, {"since": since})
+            return [tuple(row) for row in result]
@@ -1,7 +1,16 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
-from src.users.dependencies import get_current_user, get_user_service
-from src.users.models import User
+from src.core.responses import RawJSONResponse
+from src.users.dependencies import (
+    get_current_admin,
+    get_current_user,
+    get_user_loader,
+    get_user_service,
+)
+from src.users.loader import UserLoader
+from src.users.projections import AuthPrincipal
+from src.users.schemas import UserPublic
+from src.users.serializers import dump_user_public_list, user_public_response
 
 from src.users.auth.router import auth_router
 from src.users.service import UserService
@@ -10,9 +19,20 @@ users_router = APIRouter(prefix="/users", tags=["User","Authentication"])
 
 users_router.include_router(auth_router)
 
-@users_router.get("/me")
+@users_router.get("/me", response_model=UserPublic)
 async def read_current_user(
-    user: User = Depends(get_current_user),
+    user: AuthPrincipal = Depends(get_current_user),
     user_service: UserService = Depends(get_user_service),
 ):
-    return await user_service.get_user_profile(user.id)
+    return user_public_response(await user_service.get_user_profile(user.id))
+
+
+@users_router.get("", response_model=list[UserPublic])
+async def read_users(
+    ids: list[int] = Query(..., min_length=1, max_length=100),
+    admin: AuthPrincipal = Depends(get_current_admin),
+    user_loader: UserLoader = Depends(get_user_loader),
+):
+    """Users by id, in the order asked; unknown ids are left out. One query."""
+    users = await user_loader.get_users_by_ids(ids)
+    return RawJSONResponse(dump_user_public_list([user for user in users if user is not None]))
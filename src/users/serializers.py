@@ -0,0 +1,48 @@
+from pydantic import TypeAdapter
+
+from src.core.responses import RawJSONResponse
+from src.users.auth.models import TokenPairModel
+from src.users.models import User
+from src.users.projections import UserProfile
+from src.users.schemas import UserPublic
+
+user_public_adapter = TypeAdapter(UserPublic)
+user_public_list_adapter = TypeAdapter(list[UserPublic])
+token_pair_adapter = TypeAdapter(TokenPairModel)
+
+_USER_PUBLIC_FIELDS = tuple(UserPublic.model_fields)
+
+
+def dump_user_public(user: User | UserProfile) -> bytes:
+    # Rows from our own database are trusted, so skip re-validation (EmailStr
+    # checks alone cost several times the encoding) and only serialize.
+    return user_public_adapter.dump_json(
+        UserPublic.model_construct(
+            **{field: getattr(user, field) for field in _USER_PUBLIC_FIELDS}
+        )
+    )
+
+
+def dump_user_public_list(users: list[User]) -> bytes:
+    return user_public_list_adapter.dump_json(
+        [
+            UserPublic.model_construct(
+                **{field: getattr(user, field) for field in _USER_PUBLIC_FIELDS}
+            )
+            for user in users
+        ]
+    )
+
+
+def dump_token_pair(token_pair: TokenPairModel) -> bytes:
+    return token_pair_adapter.dump_json(token_pair)
+
+
+def user_public_response(
+    user: User | UserProfile, status_code: int = 200
+) -> RawJSONResponse:
+    return RawJSONResponse(dump_user_public(user), status_code=status_code)
+
+
+def token_pair_response(token_pair: TokenPairModel) -> RawJSONResponse:
+    return RawJSONResponse(dump_token_pair(token_pair))
@@ -1,16 +1,25 @@
 from abc import ABC, abstractmethod
 
-import jwt
 from fastapi import HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials
 from typing_extensions import override
 
 from src.users.auth.models import RegistrationModel, TokenPairModel
-from src.users.auth.services.password_service import PasswordService
-from src.users.auth.services.token_service import TokenService
 from src.config import get_settings
-from src.users.models import User
-from src.users.repository import AbstractUserRepository
+from src.users.auth.revocation import RevocationList, get_revocation_list
+from src.users.auth.services.password_service import (
+    PasswordRehasher,
+    PasswordService,
+    get_password_rehasher,
+)
+from src.users.auth.services.token_service import TokenService, TokenValidationError
+from src.users.cache import UserCache, get_user_cache
+from src.users.models import User, UserRole
+from src.users.projections import AuthPrincipal, UserProfile
+from src.users.repository import AbstractUserRepository, UserAlreadyExistsError
+
+# Changing any of these invalidates the user's outstanding access tokens.
+_TOKEN_CLAIM_FIELDS = ("roles", "is_active")
 
 
 class AbstractUserService(ABC):
@@ -18,7 +27,7 @@ class AbstractUserService(ABC):
     def __init__(self, user_repository: AbstractUserRepository): ...
 
     @abstractmethod
-    async def register_user(self, user_data) -> dict: ...
+    async def register_user(self, user_data) -> User: ...
 
     @abstractmethod
     async def login_user(self, email: str, password: str) -> TokenPairModel: ...
@@ -26,30 +35,56 @@ class AbstractUserService(ABC):
     @abstractmethod
     async def authenticate(
         self, credentials: HTTPAuthorizationCredentials
-    ) -> User: ...
+    ) -> AuthPrincipal: ...
 
     @abstractmethod
-    async def get_user_profile(self, user_id: int) -> dict: ...
+    async def authenticate_claims(self, payload: dict) -> AuthPrincipal: ...
+
+    @abstractmethod
+    async def get_user_profile(self, user_id: int) -> UserProfile: ...
+
+    @abstractmethod
+    async def update_user(self, user_id: int, user_data) -> User: ...
+
+    @abstractmethod
+    async def set_user_active(self, user_id: int, is_active: bool) -> User: ...
+
+    @abstractmethod
+    async def revoke_tokens(self, user_id: int) -> None: ...
 
 
 class UserService(AbstractUserService):
-    def __init__(self, user_repository: AbstractUserRepository):
+    def __init__(
+        self,
+        user_repository: AbstractUserRepository,
+        user_cache: UserCache | None = None,
+        revocation_list: RevocationList | None = None,
+        password_rehasher: PasswordRehasher | None = None,
+    ):
         self.user_repository = user_repository
         self._token_service = TokenService()
+        self._password_rehasher = password_rehasher or get_password_rehasher()
+        self._user_cache = user_cache if user_cache is not None else get_user_cache()
+        self._revocation_list = (
+            revocation_list if revocation_list is not None else get_revocation_list()
+        )
+        self._stateless = get_settings().security.stateless_access_tokens
 
     @override
-    async def authenticate(self, credentials: HTTPAuthorizationCredentials) -> User:
+    async def authenticate(
+        self, credentials: HTTPAuthorizationCredentials
+    ) -> AuthPrincipal:
         try:
-            payload = jwt.decode(
-                credentials.credentials,
-                get_settings().security.jwt_secret_key.get_secret_value(),
-                algorithms=["HS256"],
-                issuer=get_settings().security.jwt_issuer,
-            )
-        except jwt.InvalidTokenError:
+            payload = self._token_service.decode(credentials.credentials)
+        except TokenValidationError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token"
             )
+        return await self.authenticate_claims(payload)
+
+    @override
+    async def authenticate_claims(self, payload: dict) -> AuthPrincipal:
+        """The principal for an already verified access token's claims."""
         user_id = payload.get("sub")
         if not user_id:
             raise HTTPException(
@@ -68,43 +103,54 @@ class UserService(AbstractUserService):
                 detail="Refresh tokens cannot access this resource",
             )
 
-        user = await self.user_repository.get_user_by_id(user_id_int)
-        if not user:
+        if self._stateless and "ver" in payload:
+            return self._principal_from_claims(user_id_int, payload)
+
+        principal = self._user_cache.get(user_id_int)
+        if principal is not None:
+            return principal
+
+        # Taken before the read: a write invalidating the cache while we
+        # read must not be undone by caching the row we got before it.
+        generation = self._user_cache.generation
+        principal = await self.user_repository.get_auth_principal(user_id_int)
+        if not principal:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
             )
 
-        return user
+        self._user_cache.set(user_id_int, principal, generation=generation)
+        return principal
 
     @override
-    async def register_user(self, user_data: RegistrationModel) -> dict:
-        existing_user = await self.user_repository.get_user_by_email(user_data.email)
-        if existing_user:
+    async def register_user(self, user_data: RegistrationModel) -> User:
+        password_hash = await PasswordService.hash_password(user_data.password)
+        try:
+            user = await self.user_repository.create_user(
+                dict(
+                    email=user_data.email,
+                    password_hash=password_hash,
+                    full_name=user_data.full_name,
+                )
+            )
+        except UserAlreadyExistsError:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="Email already registered",
-            )
-
-        user = await self.user_repository.create_user(
-            dict(
-                email=user_data.email,
-                password_hash=PasswordService.get_password_hash(user_data.password),
-                full_name=user_data.full_name,
-            )
-        )
+            ) from None
 
-        return user.serialise()
+        return user
 
     @override
     async def login_user(self, email: str, password: str) -> TokenPairModel:
-        user = await self.user_repository.get_user_by_email(email)
+        user = await self.user_repository.get_user_credentials(email)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password",
             )
 
-        if not PasswordService.password_matches_hash(password, user.password_hash):
+        if not await PasswordService.verify_password(password, user.password_hash):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password",
@@ -116,17 +162,64 @@ class UserService(AbstractUserService):
                 detail="Inactive user",
             )
 
+        self._password_rehasher.schedule(
+            user.id, password, user.password_hash, self.user_repository
+        )
         return self._token_service.generate_token(user)
 
     @override
-    async def get_user_profile(self, user_id: int) -> dict:
-        user = await self.user_repository.get_user_by_id(user_id)
+    async def get_user_profile(self, user_id: int) -> UserProfile:
+        user = await self.user_repository.get_user_profile(user_id)
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found",
+            )
+
+        return user
+
+    @override
+    async def update_user(self, user_id: int, user_data) -> User:
+        user = await self.user_repository.update_user(user_id, user_data)
+        self._user_cache.invalidate(user_id)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found",
             )
 
-        return user.serialise()
+        if any(field in user_data for field in _TOKEN_CLAIM_FIELDS):
+            # Stateless access tokens carry the roles they were issued with,
+            # and only active users get them; tokens from before must go.
+            await self.revoke_tokens(user_id)
+        return user
+
+    @override
+    async def set_user_active(self, user_id: int, is_active: bool) -> User:
+        return await self.update_user(user_id, {"is_active": is_active})
+
+    @override
+    async def revoke_tokens(self, user_id: int) -> None:
+        version = await self.user_repository.bump_token_version(user_id)
+        self._user_cache.invalidate(user_id)
+        if version is not None:
+            self._revocation_list.revoke(user_id, version)
+
+    def _principal_from_claims(self, user_id: int, payload: dict) -> AuthPrincipal:
+        try:
+            version = int(payload["ver"])
+            roles = [UserRole(role) for role in payload.get("roles", [])]
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload"
+            ) from None
 
+        if self._revocation_list.is_revoked(user_id, version):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revoked"
+            )
 
+        # Tokens are only issued to active users and deactivation revokes them.
+        return AuthPrincipal(
+            id=user_id, is_active=True, roles=roles, token_version=version
+        )
@@ -0,0 +1,30 @@
+import os
+
+import pytest
+
+_DEFAULTS = {
+    "SECURITY__JWT_ISSUER": "rent-mark-tests",
+    "SECURITY__JWT_SECRET_KEY": "test-secret-key-test-secret-key-test-secret",
+    "SECURITY__JWT_ACCESS_TOKEN_EXPIRE_SECS": "900",
+    "SECURITY__REFRESH_TOKEN_EXPIRE_SECS": "86400",
+    "SECURITY__PASSWORD_BCRYPT_ROUNDS": "4",
+    "SECURITY__ALLOWED_HOSTS": '["*"]',
+    "SECURITY__BACKEND_CORS_ORIGINS": "[]",
+    "DATABASE__HOSTNAME": "localhost",
+    "DATABASE__USERNAME": "tests",
+    "DATABASE__PASSWORD": "tests",
+    "DATABASE__PORT": "5432",
+    "DATABASE__DB": "tests",
+}
+
+for _name, _value in _DEFAULTS.items():
+    os.environ.setdefault(_name, _value)
+
+
+@pytest.fixture(autouse=True)
+def _empty_user_cache():
+    # In-memory repositories number users from 1 in every test, so principals
+    # cached by an earlier test would stand in for this test's users.
+    from src.users.cache import get_user_cache
+
+    get_user_cache().clear()
@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from src.core.admission import AdmissionController, KeyedTokenBuckets, TrustedProxies
+
+
+def test_forwarded_for_is_only_read_from_trusted_proxies():
+    proxies = TrustedProxies(["127.0.0.0/8", "172.16.0.0/12"])
+
+    assert proxies.client_ip("172.18.0.5", "203.0.113.9") == "203.0.113.9"
+    # A spoofed hop left of the one our proxy appended is ignored.
+    assert proxies.client_ip("172.18.0.5", "198.51.100.1, 203.0.113.9") == "203.0.113.9"
+    assert proxies.client_ip("172.18.0.5", "203.0.113.9, 172.18.0.7") == "203.0.113.9"
+    assert proxies.client_ip("203.0.113.50", "198.51.100.1") == "203.0.113.50"
+    assert proxies.client_ip("172.18.0.5", None) == "172.18.0.5"
+
+
+def test_rejected_request_takes_no_token_from_other_buckets():
+    admission = AdmissionController(
+        "login",
+        max_in_flight=10,
+        max_queue=0,
+        queue_timeout_secs=0,
+        buckets={
+            "ip": KeyedTokenBuckets(rate=0, capacity=3, max_keys=10),
+            "email": KeyedTokenBuckets(rate=0, capacity=1, max_keys=10),
+        },
+    )
+
+    async def attempt():
+        async with admission.admit(ip="203.0.113.9", email="a@example.com"):
+            pass
+
+    asyncio.run(attempt())
+    with pytest.raises(HTTPException) as rejected:
+        asyncio.run(attempt())
+
+    assert rejected.value.status_code == 429
+    assert admission.buckets["ip"].bucket("203.0.113.9").tokens == 2
+
+
+def test_request_shed_for_a_full_queue_keeps_its_token():
+    admission = AdmissionController(
+        "login",
+        max_in_flight=1,
+        max_queue=0,
+        queue_timeout_secs=0,
+        buckets={"ip": KeyedTokenBuckets(rate=0, capacity=2, max_keys=10)},
+    )
+
+    async def scenario():
+        async with admission.admit(ip="203.0.113.9"):
+            for _ in range(3):
+                with pytest.raises(HTTPException) as shed:
+                    async with admission.admit(ip="203.0.113.9"):
+                        pass
+                assert shed.value.status_code == 503
+        async with admission.admit(ip="203.0.113.9"):
+            pass
+
+    asyncio.run(scenario())
+    assert admission.stats.shed_queue_full == 3
+    assert admission.stats.shed_rate_limited == 0
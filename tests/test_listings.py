@@ -0,0 +1,114 @@
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import httpx
+from sqlalchemy.dialects.postgresql.asyncpg import PGDialect_asyncpg
+
+from src.core.cache import InProcessCacheBackend
+from src.listings.cache import ListingSearchCache
+from src.listings.dependencies import get_listing_service
+from src.listings.memory_repository import InMemoryListingRepository
+from src.listings.models import ListingStatus, ListingType
+from src.listings.projections import ListingFilters
+from src.listings.repository import ListingRepository
+from src.listings.service import ListingService
+from src.main import create_app
+
+
+def _listing(city: str, status: ListingStatus = ListingStatus.PUBLISHED) -> dict:
+    return {
+        "landlord_id": 1,
+        "title": "Studio meublé",
+        "city": city,
+        "rent_eur": 650,
+        "type": ListingType.STUDIO,
+        "status": status,
+    }
+
+
+def _service() -> tuple[ListingService, ListingSearchCache]:
+    cache = ListingSearchCache(InProcessCacheBackend(max_size=100, ttl_secs=60), ttl_secs=60)
+    return ListingService(InMemoryListingRepository(), search_cache=cache), cache
+
+
+def test_listing_writes_invalidate_the_cities_they_touch():
+    async def scenario():
+        service, cache = _service()
+
+        async def key(city):
+            return await cache.key(ListingFilters(city=city), None, 20, None, False)
+
+        lyon, paris = await key("Lyon"), await key("Paris")
+        draft = await service.create_listing(_listing("Lyon", ListingStatus.DRAFT))
+        assert await key("Lyon") == lyon
+
+        await service.update_listing(draft.id, {"status": ListingStatus.PUBLISHED})
+        assert await key("Lyon") != lyon
+        lyon = await key("Lyon")
+
+        await service.update_listing(draft.id, {"city": "Paris"})
+        assert await key("Lyon") != lyon
+        assert await key("Paris") != paris
+        paris = await key("Paris")
+
+        await service.delete_listing(draft.id)
+        assert await key("Paris") != paris
+
+    asyncio.run(scenario())
+
+
+def test_search_answers_304_to_a_weak_etag_in_a_list():
+    service, cache = _service()
+    app = create_app()
+    app.dependency_overrides[get_listing_service] = lambda: service
+
+    async def scenario():
+        await service.create_listing(_listing("Lyon"))
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            first = await client.get("/api/v1/listings", params={"city": "Lyon"})
+            etag = first.headers["etag"]
+            again = await client.get(
+                "/api/v1/listings",
+                params={"city": "Lyon"},
+                headers={"If-None-Match": f'"other", W/{etag}'},
+            )
+        return first, again
+
+    first, again = asyncio.run(scenario())
+    assert first.status_code == 200
+    assert [listing["city"] for listing in first.json()["results"]] == ["Lyon"]
+    assert again.status_code == 304
+    assert again.headers["etag"] == first.headers["etag"]
+
+
+class ExplainRecorder:
+    """Stands in for both the lazy session and the connection under it."""
+
+    def __init__(self) -> None:
+        self.bind = SimpleNamespace(dialect=PGDialect_asyncpg())
+        self.statements: list[str] = []
+
+    @asynccontextmanager
+    async def unit_of_work(self, read_only: bool = False, primary: bool = False):
+        yield self
+
+    async def connection(self):
+        return self
+
+    async def exec_driver_sql(self, statement: str):
+        self.statements.append(statement)
+        return SimpleNamespace(scalar_one=lambda: [{"Plan": {"Plan Rows": 42}}])
+
+
+def test_estimate_sends_filters_with_colons_to_the_driver_as_literals():
+    recorder = ExplainRecorder()
+    repository = ListingRepository(recorder)
+    filters = ListingFilters(city="Paris :18e", query="studio :meuble")
+
+    assert asyncio.run(repository.estimate_listings(filters)) == 42
+    [statement] = recorder.statements
+    assert statement.startswith("EXPLAIN (FORMAT JSON) SELECT")
+    assert "'Paris :18e'" in statement
+    assert ":meuble" in statement
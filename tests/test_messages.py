@@ -0,0 +1,126 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from src.core.cache import TTLCache
+from src.messages.fanout import LoopbackFanout
+from src.messages.gateway import ConnectionHub, GatewayConnection
+from src.messages.notifier import ThreadNotifier
+from src.messages.projections import MessageRow, ThreadParticipants
+from src.messages.repository import AbstractMessageRepository, UnknownParticipantError
+from src.messages.service import MessageService
+from src.users.projections import AuthPrincipal
+
+THREAD = ThreadParticipants(id=1, tenant_id=10, landlord_id=20)
+
+
+class LaggingReplicaRepository(AbstractMessageRepository):
+    """One thread whose replica has only replayed messages up to ``replica_upto``."""
+
+    def __init__(self) -> None:
+        self.messages: list[MessageRow] = []
+        self.replica_upto = 0
+        self.primary_reads = 0
+
+    async def get_thread_participants(self, thread_id):
+        return THREAD if thread_id == THREAD.id else None
+
+    async def get_listing_landlord(self, listing_id):
+        return THREAD.landlord_id
+
+    async def get_or_create_thread(self, listing_id, tenant_id, landlord_id):
+        if tenant_id != THREAD.tenant_id:
+            raise UnknownParticipantError(tenant_id)
+        return THREAD
+
+    async def create_message(self, thread_id, sender_id, content, notify_channel=None):
+        message = MessageRow(
+            len(self.messages) + 1, sender_id, content, datetime.now(timezone.utc)
+        )
+        self.messages.append(message)
+        return message
+
+    async def get_messages(self, thread_id, after_id=None, since=None, limit=100, primary=False):
+        self.primary_reads += primary
+        visible = self.messages if primary else self.messages[: self.replica_upto]
+        return [m for m in visible if after_id is None or m.id > after_id][:limit]
+
+    async def get_last_message_id(self, thread_id):
+        return self.messages[-1].id if self.messages else None
+
+
+def _service(repository: AbstractMessageRepository) -> MessageService:
+    notifier = ThreadNotifier(max_threads=100, ttl_secs=60)
+    fanout = LoopbackFanout()
+    fanout.subscribe(notifier)
+    return MessageService(
+        repository,
+        notifier=notifier,
+        fanout=fanout,
+        participants_cache=TTLCache(max_size=100, ttl_secs=60),
+    )
+
+
+def test_long_poll_reads_a_notified_message_the_replica_lacks_from_the_primary():
+    async def scenario():
+        repository = LaggingReplicaRepository()
+        service = _service(repository)
+        waiting = asyncio.create_task(service.poll(THREAD.tenant_id, THREAD.id, 0, None, 5))
+        await asyncio.sleep(0)
+        await service.send_message(THREAD.landlord_id, THREAD.id, "Bonjour")
+        return await waiting, repository
+
+    update, repository = asyncio.run(scenario())
+    assert [m.content for m in update.messages] == ["Bonjour"]
+    assert update.last_message_id == 1
+    assert repository.primary_reads == 1
+
+
+def test_starting_a_thread_with_an_unknown_user_is_a_404():
+    async def scenario():
+        await _service(LaggingReplicaRepository()).start_thread(THREAD.landlord_id, 5, 999)
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(scenario())
+    assert error.value.status_code == 404
+
+
+class RecordingWebSocket:
+    def __init__(self) -> None:
+        self.frames: list[str] = []
+
+    async def send_text(self, text: str) -> None:
+        self.frames.append(text)
+
+
+def test_hub_pushes_a_published_message_the_replica_lacks():
+    async def scenario():
+        repository = LaggingReplicaRepository()
+        hub = ConnectionHub(
+            lambda: repository,
+            max_connections=10,
+            max_threads_per_connection=10,
+            send_queue_size=10,
+            send_timeout_secs=1,
+            batch_window_secs=0,
+            page_size=100,
+        )
+        websocket = RecordingWebSocket()
+        connection = GatewayConnection(
+            websocket, AuthPrincipal(THREAD.tenant_id, True, [], 0), hub
+        )
+        hub.register(connection)
+        hub.subscribe(connection, THREAD.id, 0)
+        await asyncio.sleep(0.01)
+
+        message = await repository.create_message(THREAD.id, THREAD.landlord_id, "Bonjour")
+        hub.publish(THREAD.id, message.id)
+        await asyncio.sleep(0.01)
+        return connection, websocket, hub
+
+    connection, websocket, hub = asyncio.run(scenario())
+    assert connection.cursors[THREAD.id] == 1
+    assert len(websocket.frames) == 1 and "Bonjour" in websocket.frames[0]
+    assert hub.stats.primary_fetches == 1
@@ -0,0 +1,17 @@
+from src.core.admission import AdmissionStats
+from src.core.metrics import MetricsRegistry, stats_samples
+
+
+def test_stats_export_running_counts_as_counters_and_levels_as_gauges():
+    registry = MetricsRegistry()
+    stats = AdmissionStats(admitted=7, shed_queue_full=2, in_flight=3)
+    registry.register_collector(
+        lambda: stats_samples("admission", "Admission stats.", stats, {"controller": "login"})
+    )
+
+    lines = registry.render().splitlines()
+    assert "# TYPE admission_admitted_total counter" in lines
+    assert 'admission_admitted_total{controller="login"} 7' in lines
+    assert "# TYPE admission_shed_queue_full_total counter" in lines
+    assert "# TYPE admission_in_flight gauge" in lines
+    assert 'admission_in_flight{controller="login"} 3' in lines
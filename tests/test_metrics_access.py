@@ -0,0 +1,29 @@
+import asyncio
+
+import httpx
+from pydantic import SecretStr
+
+from src.config import get_settings
+from src.main import create_app
+
+
+def _get_metrics(client_host: str, headers: dict[str, str]) -> int:
+    app = create_app()
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app, client=(client_host, 40000))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return (await client.get("/metrics", headers=headers)).status_code
+
+    return asyncio.run(scenario())
+
+
+def test_metrics_are_served_to_internal_scrapers_only(monkeypatch):
+    monkeypatch.setattr(get_settings().metrics, "bearer_token", SecretStr("scrape-token"))
+
+    assert _get_metrics("10.0.0.5", {}) == 200
+    assert _get_metrics("203.0.113.9", {}) == 403
+    # Relayed by the proxy on the private network for a public client.
+    assert _get_metrics("10.0.0.2", {"X-Forwarded-For": "203.0.113.9"}) == 403
+    assert _get_metrics("203.0.113.9", {"Authorization": "Bearer scrape-token"}) == 200
+    assert _get_metrics("203.0.113.9", {"Authorization": "Bearer wrong"}) == 403
@@ -0,0 +1,11 @@
+from src.config import get_settings
+from src.users.auth.services.password_service import PasswordService, bcrypt_hash
+
+
+def test_only_hashes_below_the_target_cost_are_rehashed(monkeypatch):
+    monkeypatch.setattr(get_settings().security, "password_bcrypt_rounds", 5)
+
+    assert PasswordService.needs_rehash(bcrypt_hash(b"password", 4).decode())
+    assert not PasswordService.needs_rehash(bcrypt_hash(b"password", 5).decode())
+    assert not PasswordService.needs_rehash(bcrypt_hash(b"password", 6).decode())
+    assert not PasswordService.needs_rehash("not-a-bcrypt-hash")
@@ -0,0 +1,41 @@
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.util import greenlet_spawn
+
+from src.core.database.pool import InstrumentedQueuePool
+
+
+def _pool(creator) -> InstrumentedQueuePool:
+    return InstrumentedQueuePool(creator, pool_size=1, max_overflow=0, timeout=0.01)
+
+
+def test_only_pool_exhaustion_counts_as_checkout_timeout():
+    pool = _pool(Mock)
+
+    async def exhaust():
+        held = await greenlet_spawn(pool.connect)
+        try:
+            with pytest.raises(exc.TimeoutError):
+                await greenlet_spawn(pool.connect)
+        finally:
+            await greenlet_spawn(held.close)
+
+    asyncio.run(exhaust())
+
+    assert pool.stats.checkout_timeouts == 1
+    assert pool.stats.checkout_errors == 0
+
+
+def test_connect_failure_is_a_checkout_error():
+    def refuse():
+        raise ConnectionRefusedError("database is down")
+
+    pool = _pool(refuse)
+    with pytest.raises(ConnectionRefusedError):
+        asyncio.run(greenlet_spawn(pool.connect))
+
+    assert pool.stats.checkout_timeouts == 0
+    assert pool.stats.checkout_errors == 1
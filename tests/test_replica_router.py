@@ -0,0 +1,62 @@
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+
+from src.core.database.session import ReplicaRouter, end_read_fence, start_read_fence
+from src.core.middleware import ReadYourWritesMiddleware
+
+PRIMARY, REPLICA = object(), object()
+
+
+def _router() -> ReplicaRouter:
+    return ReplicaRouter(PRIMARY, [REPLICA], read_your_writes_secs=2.0)
+
+
+def test_write_pins_only_the_writers_reads():
+    router = _router()
+
+    async def writer():
+        start_read_fence()
+        router.record_write()
+        return router.factory_for(read_only=True)
+
+    async def reader():
+        token = start_read_fence()
+        try:
+            return router.factory_for(read_only=True)
+        finally:
+            end_read_fence(token)
+
+    async def scenario():
+        return await asyncio.gather(writer(), reader())
+
+    assert asyncio.run(scenario()) == [PRIMARY, REPLICA]
+
+
+def test_cookie_carries_the_pin_to_the_next_request():
+    router = _router()
+    app = FastAPI()
+
+    @app.post("/write")
+    async def write():
+        router.record_write()
+
+    @app.get("/read")
+    async def read():
+        return {"primary": router.factory_for(read_only=True) is PRIMARY}
+
+    app.add_middleware(ReadYourWritesMiddleware, read_your_writes_secs=2.0)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as writer:
+            await writer.post("/write")
+            own = (await writer.get("/read")).json()
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as other:
+            others = (await other.get("/read")).json()
+        return own, others
+
+    own, others = asyncio.run(scenario())
+    assert own == {"primary": True}
+    assert others == {"primary": False}
@@ -0,0 +1,14 @@
+from src.core.responses import etag_matches
+
+
+def test_if_none_match_uses_weak_comparison_over_a_list():
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('W/"abc"', '"abc"')
+    assert etag_matches('"abc"', 'W/"abc"')
+    assert etag_matches('"x", W/"abc" ,"y"', '"abc"')
+    assert etag_matches(" * ", '"abc"')
+    assert etag_matches('"a,b", "abc"', '"abc"')
+    assert not etag_matches('"a,b"', '"abc"')
+    assert not etag_matches('"abcd"', '"abc"')
+    assert not etag_matches("", '"abc"')
+    assert not etag_matches(None, '"abc"')
@@ -0,0 +1,17 @@
+import os
+import subprocess
+import sys
+
+PROBE = """
+import sys
+import src.main
+print(" ".join(sorted({"bcrypt", "jwt", "cryptography"} & set(sys.modules))))
+"""
+
+
+def test_importing_the_app_module_defers_bcrypt_jwt_and_cryptography():
+    # A fresh interpreter: this one has long since imported them.
+    completed = subprocess.run(
+        [sys.executable, "-c", PROBE], capture_output=True, text=True, check=True, env=os.environ
+    )
+    assert completed.stdout.strip() == ""
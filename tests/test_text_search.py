@@ -0,0 +1,55 @@
+from src.listings.text_search import fold, stem
+
+# to_tsvector('french', fold(word)) on PostgreSQL 16.
+SNOWBALL = {
+    "appartements": "appart",
+    "appartement": "appart",
+    "chambres": "chambr",
+    "cuisines": "cuisin",
+    "balcons": "balcon",
+    "calme": "calm",
+    "rénové": "renov",
+    "rénovation": "renov",
+    "colocations": "coloc",
+    "lumineuse": "lumin",
+    "lumineuses": "lumin",
+    "meublé": "meubl",
+    "meublés": "meubl",
+    "meuble": "meubl",
+    "équipé": "equip",
+    "proximité": "proximit",
+    "agréablement": "agreabl",
+    "grandes": "grand",
+    "18ème": "18e",
+    # Known differences, see ``stem``: (this module, Snowball).
+    "meublée": "meuble",
+    "équipée": "equipe",
+    "rénovée": "renove",
+    "lumineux": "lumin",
+    "étudiant": "etudi",
+    "étudiants": "etudi",
+    "terrasse": "terr",
+    "traversant": "travers",
+    "spacieux": "spacieux",
+    "spacieuse": "spacieux",
+    "haussmannienne": "haussmannien",
+}
+KNOWN_DIFFERENCES = {
+    "meublée": "meubl",
+    "équipée": "equip",
+    "rénovée": "renov",
+    "lumineux": "lumineu",
+    "étudiant": "etudiant",
+    "étudiants": "etudiant",
+    "terrasse": "terrass",
+    "traversant": "traversant",
+    "spacieux": "spacieu",
+    "spacieuse": "spaci",
+    "haussmannienne": "haussmannienn",
+}
+
+
+def test_stem_matches_snowball_outside_the_documented_differences():
+    for word, snowball in SNOWBALL.items():
+        expected = KNOWN_DIFFERENCES.get(word, snowball)
+        assert stem(fold(word)) == expected, word
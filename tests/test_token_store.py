@@ -0,0 +1,37 @@
+import asyncio
+import time
+import uuid
+
+from src.users.auth.token_store import BloomUsedTokenStore
+
+
+def test_reuse_is_detected_after_a_bucket_adds_a_filter():
+    async def scenario():
+        store = BloomUsedTokenStore(initial_capacity=2)
+        exp = int(time.time()) + 3600
+        assert not await store.mark_used("a", exp)
+        assert not await store.mark_used("b", exp)
+        assert await store.mark_used("a", exp)
+        assert not await store.mark_used("c", exp)
+        assert await store.mark_used("a", exp)
+        assert await store.mark_used("b", exp)
+        assert await store.mark_used("c", exp)
+
+    asyncio.run(scenario())
+
+
+def test_bucket_starts_small_and_grows_with_its_tokens():
+    async def scenario():
+        store = BloomUsedTokenStore(initial_capacity=16)
+        exp = int(time.time()) + 3600
+        await store.mark_used("first", exp)
+        small = store.nbytes
+        jtis = [uuid.uuid4().hex for _ in range(1000)]
+        for jti in jtis:
+            assert not await store.mark_used(jti, exp)
+        assert store.nbytes > small
+        assert store.count == 1001
+        for jti in jtis:
+            assert await store.mark_used(jti, exp)
+
+    asyncio.run(scenario())
@@ -0,0 +1,85 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519
+
+from src.users.auth.keys import KeySet, load_signing_key
+from src.users.auth.services.token_verifier import TokenValidationError, TokenVerifier
+
+ISSUER = "rent-mark-tests"
+
+
+def _key_set(kid: str) -> KeySet:
+    pem = ed25519.Ed25519PrivateKey.generate().private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    return KeySet([load_signing_key(kid, pem.decode())])
+
+
+def _token(key_set: KeySet) -> str:
+    signer = TokenVerifier.from_key_set(key_set, ISSUER)
+    return signer.encode({"sub": "1", "iss": ISSUER, "exp": int(time.time()) + 60})
+
+
+def test_unknown_kid_refetches_the_jwks_at_most_once_per_interval(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: clock[0])
+    old, new = _key_set("old"), _key_set("new")
+    published = old.jwks
+    fetches = []
+
+    def fetch_jwks():
+        fetches.append(published)
+        return published
+
+    verifier = TokenVerifier.from_jwks(
+        old.jwks, ISSUER, fetch_jwks=fetch_jwks, refetch_min_interval_secs=60
+    )
+    assert verifier.decode(_token(old))["sub"] == "1"
+    assert fetches == []
+
+    with pytest.raises(TokenValidationError):
+        verifier.decode(_token(new))
+    with pytest.raises(TokenValidationError):
+        verifier.decode(_token(new))
+    assert len(fetches) == 1
+
+    published = new.jwks
+    clock[0] += 61
+    assert verifier.decode(_token(new))["sub"] == "1"
+    assert len(fetches) == 2
+
+
+def test_refetch_on_the_event_loop_runs_in_a_thread_without_holding_the_request():
+    old, new = _key_set("old"), _key_set("new")
+    release = threading.Event()
+    fetches = []
+
+    def fetch_jwks():
+        fetches.append(threading.get_ident())
+        release.wait(5)
+        return new.jwks
+
+    verifier = TokenVerifier.from_jwks(
+        old.jwks, ISSUER, fetch_jwks=fetch_jwks, refetch_min_interval_secs=60
+    )
+
+    async def scenario():
+        with pytest.raises(TokenValidationError):
+            verifier.decode(_token(new))
+        # Forged kids while the fetch is out don't start another one.
+        with pytest.raises(TokenValidationError):
+            verifier.decode(_token(_key_set("forged")))
+        release.set()
+        await verifier._refetch
+        await asyncio.sleep(0)
+        return verifier.decode(_token(new))
+
+    assert asyncio.run(scenario())["sub"] == "1"
+    assert len(fetches) == 1
+    assert fetches[0] != threading.get_ident()
@@ -0,0 +1,47 @@
+import asyncio
+
+from fastapi.security import HTTPAuthorizationCredentials
+
+from src.core.cache import TTLCache
+from src.users.auth.services.token_service import TokenService
+from src.users.memory_repository import InMemoryUserRepository
+from src.users.projections import AuthPrincipal
+from src.users.service import UserService
+
+
+class SlowReadRepository(InMemoryUserRepository):
+    """Holds every principal read until ``release`` is set."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.reading = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def get_auth_principal(self, user_id: int) -> AuthPrincipal | None:
+        principal = await super().get_auth_principal(user_id)
+        self.reading.set()
+        await self.release.wait()
+        return principal
+
+
+def test_write_during_authentication_read_is_not_overwritten_by_stale_principal():
+    async def scenario():
+        repository = SlowReadRepository()
+        user = await repository.create_user(
+            {"email": "a@example.com", "password_hash": "x", "full_name": None}
+        )
+        cache: TTLCache[int, AuthPrincipal] = TTLCache(max_size=10, ttl_secs=60)
+        service = UserService(repository, user_cache=cache)
+        token = TokenService().generate_token(user).access_token
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+        authenticating = asyncio.create_task(service.authenticate(credentials))
+        await repository.reading.wait()
+        await service.update_user(user.id, {"is_active": False})
+        repository.release.set()
+        stale = await authenticating
+
+        assert stale.is_active
+        assert user.id not in cache
+
+    asyncio.run(scenario())
@@ -0,0 +1,29 @@
+import asyncio
+
+from src.users.importer import import_users
+from src.users.memory_repository import InMemoryUserRepository
+
+
+def test_import_reports_registered_emails_and_loads_the_rest():
+    async def scenario():
+        repository = InMemoryUserRepository()
+        await repository.create_user({"email": "taken@example.com", "password_hash": "x"})
+        rows = [
+            (2, {"email": "new@example.com", "password_hash": "h1"}),
+            (3, {"email": "taken@example.com", "password_hash": "h2"}),
+            (4, {"email": "other@example.com", "password_hash": "h3"}),
+        ]
+        report = await import_users(repository, rows, batch_size=2)
+        users = await repository.get_users_by_emails(
+            ["new@example.com", "taken@example.com", "other@example.com"]
+        )
+        return report, users
+
+    report, users = asyncio.run(scenario())
+    assert report.read == 3
+    assert report.inserted == 2
+    assert [(i.line, i.email, i.reason) for i in report.issues] == [
+        (3, "taken@example.com", "email already registered")
+    ]
+    assert users["taken@example.com"].password_hash == "x"
+    assert users["other@example.com"].password_hash == "h3"
@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from src.config import get_settings
+from src.core.cache import TTLCache
+from src.users.auth.models import RegistrationModel
+from src.users.auth.revocation import RevocationList
+from src.users.auth.services.registration_service import RegistrationService
+from src.users.auth.services.token_service import TokenService
+from src.users.memory_repository import InMemoryUserRepository
+from src.users.models import UserRole
+from src.users.service import UserService
+
+
+def _service(repository: InMemoryUserRepository) -> UserService:
+    return UserService(
+        repository,
+        user_cache=TTLCache(max_size=10, ttl_secs=60),
+        revocation_list=RevocationList(),
+    )
+
+
+def test_demoted_admin_loses_stateless_tokens_issued_before(monkeypatch):
+    monkeypatch.setattr(get_settings().security, "stateless_access_tokens", True)
+
+    async def scenario():
+        repository = InMemoryUserRepository()
+        service = _service(repository)
+        admin = await repository.create_user(
+            {"email": "admin@example.com", "password_hash": "x", "roles": [UserRole.ADMIN]}
+        )
+        token = TokenService().generate_token(admin).access_token
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+        assert (await service.authenticate(credentials)).roles == [UserRole.ADMIN]
+
+        await service.update_user(admin.id, {"roles": []})
+        await service.authenticate(credentials)
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(scenario())
+    assert error.value.status_code == 401
+    assert error.value.detail == "Token revoked"
+
+
+@pytest.mark.parametrize("register", [
+    lambda repository: _service(repository).register_user,
+    lambda repository: RegistrationService(repository).register_user,
+])
+def test_registering_a_taken_email_is_a_409(register):
+    repository = InMemoryUserRepository()
+    registration = RegistrationModel(email="a@example.com", password="correct horse")
+
+    async def scenario():
+        user = await register(repository)(registration)
+        assert user.id == 1
+        await register(repository)(registration)
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(scenario())
+    assert error.value.status_code == 409
+    assert error.value.detail == "Email already registered"
@@ -0,0 +1,66 @@
+import asyncio
+
+import httpx
+
+from src.main import create_app
+from src.users.auth.services.token_service import TokenService
+from src.users.dependencies import get_user_repository
+from src.users.memory_repository import InMemoryUserRepository
+from src.users.models import UserRole
+
+
+def test_admin_reads_users_by_id_in_one_batch():
+    repository = InMemoryUserRepository()
+    batches = []
+    get_users_by_ids = repository.get_users_by_ids
+
+    async def counting_get_users_by_ids(user_ids):
+        batches.append(list(user_ids))
+        return await get_users_by_ids(user_ids)
+
+    repository.get_users_by_ids = counting_get_users_by_ids
+    app = create_app()
+    app.dependency_overrides[get_user_repository] = lambda: repository
+
+    async def scenario():
+        admin = await repository.create_user(
+            {"email": "admin@example.com", "password_hash": "x", "roles": [UserRole.ADMIN]}
+        )
+        other = await repository.create_user({"email": "b@example.com", "password_hash": "x"})
+        token = TokenService().generate_token(admin).access_token
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get(
+                "/api/v1/users",
+                params={"ids": [other.id, 999, admin.id]},
+                headers={"Authorization": f"Bearer {token}"},
+            )
+
+    response = asyncio.run(scenario())
+    assert response.status_code == 200
+    assert [user["email"] for user in response.json()] == ["b@example.com", "admin@example.com"]
+    assert len(batches) == 1
+
+
+def test_inactive_admin_is_refused():
+    repository = InMemoryUserRepository()
+    app = create_app()
+    app.dependency_overrides[get_user_repository] = lambda: repository
+
+    async def scenario():
+        admin = await repository.create_user(
+            {"email": "admin@example.com", "password_hash": "x", "roles": [UserRole.ADMIN]}
+        )
+        token = TokenService().generate_token(admin).access_token
+        await repository.update_user(admin.id, {"is_active": False})
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get(
+                "/api/v1/users",
+                params={"ids": [admin.id]},
+                headers={"Authorization": f"Bearer {token}"},
+            )
+
+    response = asyncio.run(scenario())
+    assert response.status_code == 403
+    assert response.json()["detail"] == "Inactive user"